@@ -0,0 +1,216 @@
+"""
+🌟 Polaris System Detection API - Response Compression
+"""
+
+import gzip
+import time
+from typing import Any, Dict, Optional, Tuple, Type
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.config.settings import settings
+from app.core.collector_executor import collector_executor
+from app.core.instrumentation import instrumentation
+
+# Optional zstd support
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+
+def get_supported_encodings() -> Tuple[str, ...]:
+    """Get supported content encodings in server preference order"""
+    return ("zstd", "gzip") if HAS_ZSTD else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a content encoding from an Accept-Encoding header
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        str: Chosen encoding, or None for an uncompressed response
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            weights[token] = quality
+
+    best = None
+    best_quality = 0.0
+    for encoding in get_supported_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with the given encoding"""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.compression_zstd_level).compress(body)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+class EncodedBody:
+    """A serialized response body and its compressed variants"""
+
+    __slots__ = ("source", "timestamp", "body", "variants")
+
+    def __init__(self, source: Any, timestamp: float, body: bytes):
+        self.source = source
+        self.timestamp = timestamp
+        self.body = body
+        self.variants: Dict[str, bytes] = {}
+
+
+class CompressedResponseCache:
+    """
+    Serialize and compress large detection payloads once per data change
+
+    The serialized JSON and each compressed variant are kept per section
+    until the section's cached result object is replaced, so repeat
+    requests cost neither serialization nor compression.
+    """
+
+    def __init__(self):
+        self._bodies: Dict[str, EncodedBody] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _section_stats(self, section: str) -> Dict[str, float]:
+        """Get the counters for a section"""
+        stats = self.stats.get(section)
+        if stats is None:
+            stats = self.stats[section] = {
+                "requests": 0,
+                "body_cache_hits": 0,
+                "uncompressed_bytes": 0,
+                "wire_bytes": 0,
+                "serialize_cpu_seconds": 0.0,
+                "compress_cpu_seconds": 0.0,
+                "compressions": 0,
+            }
+        return stats
+
+    async def respond(
+        self,
+        request: Request,
+        section: str,
+        payload: Dict[str, Any],
+        source: Any,
+        model: Type[BaseModel],
+    ) -> Response:
+        """
+        Build a (possibly compressed) JSON response for a detection payload
+
+        Args:
+            request: Incoming request, used for Accept-Encoding negotiation
+            section: Section name the payload belongs to
+            payload: Response payload
+            source: Cached result object the payload was built from; the
+                encoded bodies are reused while it stays the same object
+            model: Response model used to validate and serialize the payload
+        """
+        stats = self._section_stats(section)
+        stats["requests"] += 1
+
+        encoding = None
+        if settings.compression_enabled:
+            encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+
+        encoded = self._bodies.get(section)
+        if encoded is not None and encoded.source is source and encoded.timestamp == payload["detection_timestamp"]:
+            stats["body_cache_hits"] += 1
+        else:
+            # Validation, serialization and compression all run in one
+            # executor call, off the event loop
+            body, serialize_elapsed, compressed, compress_elapsed = await collector_executor.run(
+                "serialize", self._timed_encode, section, model, payload, encoding
+            )
+            stats["serialize_cpu_seconds"] += serialize_elapsed
+            encoded = self._bodies[section] = EncodedBody(source, payload["detection_timestamp"], body)
+            if compressed is not None:
+                encoded.variants[encoding] = compressed
+                stats["compress_cpu_seconds"] += compress_elapsed
+                stats["compressions"] += 1
+
+        if len(encoded.body) < settings.compression_min_size:
+            encoding = None
+
+        content = encoded.body
+        if encoding is not None:
+            content = encoded.variants.get(encoding)
+            if content is None:
+                content, elapsed = await collector_executor.run(
+                    "compress", self._timed_compress, section, encoded.body, encoding
+                )
+                encoded.variants[encoding] = content
+                stats["compress_cpu_seconds"] += elapsed
+                stats["compressions"] += 1
+
+        stats["uncompressed_bytes"] += len(encoded.body)
+        stats["wire_bytes"] += len(content)
+
+        headers = {
+            "Vary": "Accept-Encoding",
+            "X-Polaris-Uncompressed-Length": str(len(encoded.body)),
+        }
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+
+        return Response(content=content, media_type="application/json", headers=headers)
+
+    @staticmethod
+    def _timed_encode(
+        section: str, model: Type[BaseModel], payload: Dict[str, Any], encoding: Optional[str]
+    ) -> Tuple[bytes, float, Optional[bytes], float]:
+        """
+        Validate and serialize a payload, then compress it if it is large enough
+
+        Returns:
+            tuple: (body, serialize CPU seconds, compressed body or None, compress CPU seconds)
+        """
+        started = time.thread_time()
+        with instrumentation.timer(f"serialize.{section}"):
+            body = model.model_validate(payload).model_dump_json().encode("utf-8")
+        serialize_elapsed = time.thread_time() - started
+        if encoding is None or len(body) < settings.compression_min_size:
+            return body, serialize_elapsed, None, 0.0
+        compressed, compress_elapsed = CompressedResponseCache._timed_compress(section, body, encoding)
+        return body, serialize_elapsed, compressed, compress_elapsed
+
+    @staticmethod
+    def _timed_compress(section: str, body: bytes, encoding: str) -> Tuple[bytes, float]:
+        """Compress a body and measure the CPU time spent"""
+        started = time.thread_time()
+        with instrumentation.timer(f"compress.{section}"):
+            content = compress_body(body, encoding)
+        return content, time.thread_time() - started
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-section bytes and CPU counters"""
+        return {
+            "encodings": list(get_supported_encodings()),
+            "sections": {section: dict(stats) for section, stats in self.stats.items()},
+        }
+
+
+# Global compressed response cache instance
+compressed_response_cache = CompressedResponseCache()
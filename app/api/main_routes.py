@@ -4,21 +4,18 @@
 
 import asyncio
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.config.settings import settings
-from app.core.polaris_manager import PolarisManager
+from app.core.polaris_manager import PolarisManager, get_polaris_manager_async
 from app.models.system_models import HealthResponse, PolarisRootResponse
 
 # Create router for main application routes
 router = APIRouter(tags=["main"])
 
-# Initialize Polaris manager
-polaris_manager = PolarisManager()
-
 
 @router.get("/", response_model=PolarisRootResponse)
-async def polaris_root():
+async def polaris_root(polaris_manager: PolarisManager = Depends(get_polaris_manager_async)):
     """🌟 Polaris System Detection API - Root endpoint"""
     system_summary = polaris_manager.get_system_summary()
     
@@ -30,7 +27,12 @@ async def polaris_root():
         "/polaris/disk": "💿 Disk detection only",
         "/polaris/network": "🌐 Network detection only",
         "/polaris/environment": "🐍 Python/PyTorch environment",
-        "/polaris/realtime": "⚡ Real-time monitoring"
+        "/polaris/realtime": "⚡ Real-time monitoring",
+        "/polaris/cgroups": "📦 Per-cgroup resource usage",
+        "/polaris/topology": "🧭 NUMA and device affinity topology",
+        "/polaris/capability": "🏋️ Hardware capability microbenchmarks",
+        "/polaris/history": "🕰️ Metric history",
+        "/polaris/changes": "🔔 Inventory change feed (long-poll)"
     }
     
     # Add legacy compatibility endpoints if enabled
@@ -0,0 +1,59 @@
+"""
+🌟 Polaris System Detection API - Middleware
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.instrumentation import Instrumentation, format_server_timing
+from app.core.instrumentation import instrumentation as global_instrumentation
+from app.core.instrumentation import request_timings
+
+
+class InstrumentationMiddleware:
+    """
+    Record per-route latency and add a Server-Timing header to every response
+
+    The header lists the time spent in the application plus every
+    instrumented collector call made while serving the request, so a cached
+    response shows only ``app`` while a fresh one shows what it collected.
+    """
+
+    def __init__(self, app: ASGIApp, instrumentation: Optional[Instrumentation] = None):
+        self.app = app
+        self.instrumentation = instrumentation or global_instrumentation
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.instrumentation.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        timings: List[Tuple[str, int]] = []
+        token = request_timings.set(timings)
+        started = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", format_server_timing(timings, time.perf_counter_ns() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+            # Record by route template so /polaris/gpu?max_age_ms=0 and
+            # /polaris/gpu share a histogram; unmatched paths share one
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            self.instrumentation.record(
+                f"route {scope['method']} {path}",
+                time.perf_counter_ns() - started,
+                status_code >= 500,
+            )
@@ -3,71 +3,256 @@
 """
 
 import asyncio
+import json
+import os
+from typing import List, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 
+from app.api.compression import compressed_response_cache
 from app.config.settings import settings
-from app.core.polaris_manager import PolarisManager
-from app.models.system_models import (CPUDetectionResponse,
+from app.core.collector_executor import collector_executor
+from app.core.gpu_worker import IsolatedGPUBackend
+from app.core.instrumentation import instrumentation
+from app.core.polaris_manager import PolarisManager, get_polaris_manager_async
+from app.core.result_cache import result_cache
+from app.models.system_models import (CapabilityResponse, CgroupsResponse,
+                                      ChangesResponse,
+                                      CPUDetectionResponse,
                                       DiskDetectionResponse,
                                       EnvironmentDetectionResponse,
                                       GPUDetectionResponse, HealthResponse,
+                                      HistoryResponse,
                                       MemoryDetectionResponse,
                                       NetworkDetectionResponse,
                                       PolarisRootResponse,
-                                      RealtimeMonitoringResponse,
-                                      SystemDetectionResponse)
+                                      RealtimeMonitoringResponse, SeriesResponse,
+                                      SystemDetectionResponse,
+                                      TopologyDetectionResponse)
+from app.utils.startup_profiler import startup_profiler
 
 # Create router
 router = APIRouter(prefix=settings.api_prefix, tags=["polaris-detection"])
 
-# Initialize Polaris manager
-polaris_manager = PolarisManager()
+# Shared Polaris manager, built lazily on first use
+MANAGER = Depends(get_polaris_manager_async)
+
+# Freshness control shared by all detection endpoints
+MAX_AGE_QUERY = Query(
+    None,
+    ge=0,
+    description="Oldest acceptable cached result in milliseconds (default: per-section TTL)",
+)
 
 
 @router.get("/detect", response_model=SystemDetectionResponse)
-async def polaris_system_detection():
+async def polaris_system_detection(
+    max_age_ms: Optional[int] = MAX_AGE_QUERY,
+    polaris_manager: PolarisManager = MANAGER,
+):
     """🌟 Polaris primary detection endpoint - Complete system information"""
-    return await polaris_manager.get_complete_system_info()
+    return await polaris_manager.get_complete_system_info(max_age_ms)
 
 
 @router.get("/gpu", response_model=GPUDetectionResponse)
-async def polaris_gpu_detection():
+async def polaris_gpu_detection(
+    max_age_ms: Optional[int] = MAX_AGE_QUERY,
+    polaris_manager: PolarisManager = MANAGER,
+):
     """🎮 Polaris GPU detection - Detailed GPU information only"""
-    return await polaris_manager.get_gpu_detection()
+    return await polaris_manager.get_gpu_detection(max_age_ms)
 
 
 @router.get("/cpu", response_model=CPUDetectionResponse)
-async def polaris_cpu_detection():
+async def polaris_cpu_detection(
+    max_age_ms: Optional[int] = MAX_AGE_QUERY,
+    polaris_manager: PolarisManager = MANAGER,
+):
     """🖥️ Polaris CPU detection - Detailed CPU information"""
-    return polaris_manager.get_cpu_detection()
+    return await polaris_manager.get_cpu_detection(max_age_ms)
 
 
 @router.get("/memory", response_model=MemoryDetectionResponse)
-async def polaris_memory_detection():
+async def polaris_memory_detection(
+    max_age_ms: Optional[int] = MAX_AGE_QUERY,
+    polaris_manager: PolarisManager = MANAGER,
+):
     """💾 Polaris Memory detection - Detailed memory information"""
-    return polaris_manager.get_memory_detection()
+    return await polaris_manager.get_memory_detection(max_age_ms)
 
 
 @router.get("/disk", response_model=DiskDetectionResponse)
-async def polaris_disk_detection():
+async def polaris_disk_detection(
+    max_age_ms: Optional[int] = MAX_AGE_QUERY,
+    polaris_manager: PolarisManager = MANAGER,
+):
     """💿 Polaris Disk detection - Detailed disk information"""
-    return await polaris_manager.get_disk_detection()
+    return await polaris_manager.get_disk_detection(max_age_ms)
 
 
 @router.get("/network", response_model=NetworkDetectionResponse)
-async def polaris_network_detection():
+async def polaris_network_detection(
+    request: Request,
+    max_age_ms: Optional[int] = MAX_AGE_QUERY,
+    polaris_manager: PolarisManager = MANAGER,
+):
     """🌐 Polaris Network detection - Network interface information"""
-    return polaris_manager.get_network_detection()
+    detection = await polaris_manager.get_network_detection(max_age_ms)
+    return await compressed_response_cache.respond(
+        request, "network", detection,
+        detection["polaris_network_detection"], NetworkDetectionResponse,
+    )
 
 
 @router.get("/environment", response_model=EnvironmentDetectionResponse)
-async def polaris_environment_detection():
+async def polaris_environment_detection(
+    request: Request,
+    max_age_ms: Optional[int] = MAX_AGE_QUERY,
+    polaris_manager: PolarisManager = MANAGER,
+):
     """🐍 Polaris Environment detection - Python and PyTorch environment"""
-    return polaris_manager.get_environment_detection()
+    detection = await polaris_manager.get_environment_detection(max_age_ms)
+    return await compressed_response_cache.respond(
+        request, "environment", detection,
+        detection["polaris_environment_detection"], EnvironmentDetectionResponse,
+    )
 
 
 @router.get("/realtime", response_model=RealtimeMonitoringResponse)
-async def polaris_realtime_monitoring():
+async def polaris_realtime_monitoring(
+    max_age_ms: Optional[int] = MAX_AGE_QUERY,
+    polaris_manager: PolarisManager = MANAGER,
+):
     """⚡ Polaris Real-time monitoring - Lightweight performance metrics"""
-    return polaris_manager.get_realtime_monitoring() 
\ No newline at end of file
+    return await polaris_manager.get_realtime_monitoring(max_age_ms) 
+
+
+@router.get("/realtime/stream")
+async def polaris_realtime_stream(
+    request: Request,
+    interval_ms: int = Query(1000, ge=100, le=60000, description="Time between events in milliseconds"),
+    polaris_manager: PolarisManager = MANAGER,
+):
+    """📡 Polaris Real-time stream - Real-time monitoring as server-sent events"""
+    interval = interval_ms / 1000.0
+    
+    async def events():
+        while not await request.is_disconnected():
+            # The subscription lapses on its own if this stream goes away
+            polaris_manager.subscribe_snapshot(interval * 2 + 1.0)
+            metrics = await polaris_manager.get_realtime_monitoring(interval_ms)
+            yield f"data: {json.dumps(metrics)}\n\n"
+            await asyncio.sleep(interval)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/topology", response_model=TopologyDetectionResponse)
+async def polaris_topology_detection(
+    max_age_ms: Optional[int] = MAX_AGE_QUERY,
+    polaris_manager: PolarisManager = MANAGER,
+):
+    """🧭 Polaris Topology detection - NUMA nodes and the CPUs local to each GPU and NIC"""
+    return await polaris_manager.get_topology_detection(max_age_ms)
+
+
+@router.get("/history", response_model=HistoryResponse)
+async def polaris_history(
+    metrics: List[str] = Query(["cpu.percent", "memory.percent"], description="Metrics such as gpu.0.utilization"),
+    start: Optional[float] = Query(None, description="Range start as Unix seconds (default: an hour before end)"),
+    end: Optional[float] = Query(None, description="Range end as Unix seconds (default: now)"),
+    tier: Optional[str] = Query(None, pattern="^(1s|1m|1h)$", description="Rollup tier (default: picked from the range)"),
+    polaris_manager: PolarisManager = MANAGER,
+):
+    """🕰️ Polaris History - Recorded metrics with min/max/avg per bucket"""
+    return await polaris_manager.get_history(metrics, start, end, tier)
+
+
+@router.get("/history/series", response_model=SeriesResponse)
+async def polaris_history_series(
+    metrics: List[str] = Query(["cpu.percent", "memory.percent"], description="Metrics such as gpu.0.utilization"),
+    points: int = Query(800, ge=3, le=10000, description="Largest number of points per series"),
+    start: Optional[float] = Query(None, description="Range start as Unix seconds (default: an hour before end)"),
+    end: Optional[float] = Query(None, description="Range end as Unix seconds (default: now)"),
+    polaris_manager: PolarisManager = MANAGER,
+):
+    """📉 Polaris History series - Metric history downsampled with LTTB for charts"""
+    return await polaris_manager.get_history_series(metrics, points, start, end)
+
+
+@router.get("/history/metrics", response_model=List[str])
+async def polaris_history_metrics(polaris_manager: PolarisManager = MANAGER):
+    """🕰️ Polaris History metrics - Names of the recorded metrics"""
+    return await polaris_manager.get_history_metrics()
+
+
+@router.get("/changes", response_model=ChangesResponse)
+async def polaris_changes(
+    since: int = Query(0, ge=0, description="Last sequence number seen (0: everything retained)"),
+    epoch: Optional[str] = Query(None, description="Epoch of the last response; a different one means reset"),
+    wait: float = Query(30.0, ge=0, description="Seconds to wait for an event when there is none yet"),
+    polaris_manager: PolarisManager = MANAGER,
+):
+    """🔔 Polaris Changes - GPU, NIC, mount and package changes after a sequence number (long-poll)"""
+    return await polaris_manager.get_changes(since, epoch, wait)
+
+
+@router.get("/capability", response_model=CapabilityResponse)
+async def polaris_capability(
+    refresh: bool = Query(False, description="Start a new benchmark run (plain requests never start one)"),
+    wait: bool = Query(False, description="Wait for a running benchmark instead of returning the cached result"),
+    polaris_manager: PolarisManager = MANAGER,
+):
+    """🏋️ Polaris Capability - GEMM, memory bandwidth and single-core speed against the CPU model's baseline"""
+    return await polaris_manager.get_capability(refresh, wait)
+
+
+@router.get("/cgroups", response_model=CgroupsResponse)
+async def polaris_cgroups(
+    sort: str = Query("cpu", pattern="^(cpu|memory|io|path)$", description="Order by cpu, memory, io or path"),
+    limit: Optional[int] = Query(None, ge=1, description="Largest number of cgroups to return"),
+    max_age_ms: Optional[int] = MAX_AGE_QUERY,
+    polaris_manager: PolarisManager = MANAGER,
+):
+    """📦 Polaris cgroups - Resource usage of every cgroup on the node"""
+    return await polaris_manager.get_cgroup_breakdown(sort, limit, max_age_ms)
+
+
+@router.get("/_internal/memory", include_in_schema=False)
+async def polaris_internal_memory(
+    since: Optional[int] = Query(None, ge=1, description="Snapshot to compare with (default: the oldest kept)"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$", description="Allocation site granularity"),
+    limit: int = Query(25, ge=1, le=1000, description="Largest number of allocation sites to list"),
+    polaris_manager: PolarisManager = MANAGER,
+):
+    """🧠 Polaris internal memory - New tracemalloc snapshot diffed by allocation site (POLARIS_MEMORY_PROFILING_ENABLED)"""
+    return await polaris_manager.get_memory_profile(since, group_by, limit)
+
+
+@router.get("/_internal/stats", include_in_schema=False)
+async def polaris_internal_stats(polaris_manager: PolarisManager = MANAGER):
+    """📊 Polaris internal stats - Collector and route latency, cache and executor counters"""
+    snapshot = polaris_manager.snapshot
+    gpu_backend = polaris_manager.gpu_detector.backend
+    return {
+        "pid": os.getpid(),
+        "instrumentation": instrumentation.get_stats(),
+        "collector_executor": collector_executor.get_stats(),
+        "result_cache": result_cache.get_stats(),
+        "compression": compressed_response_cache.get_stats(),
+        "shared_snapshot": snapshot.get_stats() if snapshot is not None else None,
+        "inventory": polaris_manager.system_detector.inventory.get_stats(),
+        "cgroup_walker": polaris_manager.cgroup_walker.get_stats() if polaris_manager.cgroup_walker else None,
+        "gpu_worker": gpu_backend.get_stats() if isinstance(gpu_backend, IsolatedGPUBackend) else None,
+        "sampling": polaris_manager.get_sampling_stats(),
+        "history": polaris_manager.history.get_stats() if polaris_manager.history is not None else None,
+        "change_feed": polaris_manager.change_feed.get_stats(),
+        "exporter": polaris_manager.exporter.get_stats() if polaris_manager.exporter is not None else None,
+        "agent": polaris_manager.get_agent_stats(),
+        "memory": {
+            "growth": polaris_manager.memory_monitor.get_stats(),
+            "profiler": polaris_manager.memory_profiler.get_stats(),
+        },
+        "startup_phases": startup_profiler.get_report()["phases"],
+    }
@@ -6,21 +6,19 @@ import json
 import subprocess
 import sys
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.config.settings import settings
-from app.core.polaris_manager import PolarisManager
+from app.core.collector_executor import collector_executor
+from app.core.polaris_manager import PolarisManager, get_polaris_manager_async
 from app.models.system_models import TransformerLabCompatibleResponse
 
 # Create router for legacy compatibility
 router = APIRouter(prefix=settings.legacy_prefix, tags=["legacy-compatible"])
 
-# Initialize Polaris manager
-polaris_manager = PolarisManager()
-
 
 @router.get("/info", response_model=TransformerLabCompatibleResponse)
-async def get_computer_information():
+async def get_computer_information(polaris_manager: PolarisManager = Depends(get_polaris_manager_async)):
     """
     Legacy system information endpoint
     Provides system information in a standardized format
@@ -28,16 +26,29 @@ async def get_computer_information():
     return await polaris_manager.get_transformer_lab_compatible_info()
 
 
+def _collect_python_libraries():
+    """Collect installed Python packages (blocking)"""
+    packages = subprocess.check_output(
+        sys.executable + " -m pip list --format=json", 
+        shell=True
+    )
+    return json.loads(packages.decode("utf-8"))
+
+
+def _collect_pytorch_env() -> str:
+    """Collect PyTorch environment information (blocking)"""
+    output = subprocess.check_output(
+        sys.executable + " -m torch.utils.collect_env", 
+        shell=True
+    )
+    return output.decode("utf-8")
+
+
 @router.get("/python_libraries")
 async def get_python_library_versions():
     """Get installed Python packages in JSON format"""
     try:
-        packages = subprocess.check_output(
-            sys.executable + " -m pip list --format=json", 
-            shell=True
-        )
-        packages = packages.decode("utf-8")
-        return json.loads(packages)
+        return await collector_executor.run("environment", _collect_python_libraries)
     except Exception as e:
         return {"error": f"Failed to get Python packages: {e}"}
 
@@ -46,10 +57,6 @@ async def get_python_library_versions():
 async def get_pytorch_collect_env():
     """Get PyTorch environment information"""
     try:
-        output = subprocess.check_output(
-            sys.executable + " -m torch.utils.collect_env", 
-            shell=True
-        )
-        return output.decode("utf-8")
+        return await collector_executor.run("environment", _collect_pytorch_env)
     except Exception as e:
-        return f"Error getting PyTorch environment: {e}" 
\ No newline at end of file
+        return f"Error getting PyTorch environment: {e}"
@@ -0,0 +1,151 @@
+"""
+🌟 Polaris System Detection API - Python Client
+
+Keep-alive client for consumers running on the same host as Polaris. A
+single client keeps a small pool of persistent connections, over the Unix
+domain socket when one is configured and loopback TCP otherwise.
+
+    from app.client import PolarisClient
+
+    with PolarisClient(uds="/run/polaris.sock") as polaris:
+        metrics = polaris.realtime()
+        print(metrics.cpu_percent, [gpu.utilization for gpu in metrics.gpu_status])
+"""
+
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.config.settings import settings
+from app.models.system_models import RealtimeMetrics
+
+# Host header used for Unix socket requests (there is no real host)
+UDS_BASE_URL = "http://polaris"
+
+
+def _resolve_target(base_url: Optional[str], uds: Optional[str]):
+    """Pick the base URL and Unix socket path, defaulting to the local server settings"""
+    if uds is None and base_url is None:
+        uds = settings.uds_path
+    if uds is not None:
+        return base_url or UDS_BASE_URL, uds
+    return base_url or f"http://127.0.0.1:{settings.port}", None
+
+
+def decode_realtime(payload: Dict[str, Any]) -> RealtimeMetrics:
+    """Decode a /polaris/realtime response body"""
+    return RealtimeMetrics(
+        **payload["polaris_realtime_monitoring"],
+        detection_timestamp=payload["detection_timestamp"],
+    )
+
+
+class PolarisClient:
+    """Synchronous Polaris client with persistent pooled connections"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        uds: Optional[str] = None,
+        timeout: float = 10.0,
+        max_connections: int = 4,
+    ):
+        """
+        Args:
+            base_url: Server URL (default: local server, or http://polaris over the socket)
+            uds: Unix domain socket path (default: POLARIS_UDS_PATH when no base_url is given)
+            timeout: Request timeout in seconds
+            max_connections: Size of the keep-alive connection pool
+        """
+        self.base_url, self.uds = _resolve_target(base_url, uds)
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            transport=httpx.HTTPTransport(uds=self.uds, limits=limits, retries=1),
+            timeout=timeout,
+        )
+
+    def get(self, path: str, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
+        """GET a JSON endpoint"""
+        params = {"max_age_ms": max_age_ms} if max_age_ms is not None else None
+        response = self._client.get(path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def health(self) -> Dict[str, Any]:
+        """Get the health status"""
+        return self.get("/health")
+
+    def detect(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Get complete system information"""
+        return self.get(f"{settings.api_prefix}/detect", max_age_ms)
+
+    def realtime(self, max_age_ms: Optional[int] = None) -> RealtimeMetrics:
+        """Get decoded realtime metrics"""
+        return decode_realtime(self.get(f"{settings.api_prefix}/realtime", max_age_ms))
+
+    def server_info(self) -> Dict[str, Any]:
+        """Get Transformer Lab compatible server info (legacy routes must be enabled)"""
+        return self.get(f"{settings.legacy_prefix}/info")
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        self._client.close()
+
+    def __enter__(self) -> "PolarisClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AsyncPolarisClient:
+    """Asynchronous Polaris client with persistent pooled connections"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        uds: Optional[str] = None,
+        timeout: float = 10.0,
+        max_connections: int = 4,
+    ):
+        self.base_url, self.uds = _resolve_target(base_url, uds)
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=httpx.AsyncHTTPTransport(uds=self.uds, limits=limits, retries=1),
+            timeout=timeout,
+        )
+
+    async def get(self, path: str, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
+        """GET a JSON endpoint"""
+        params = {"max_age_ms": max_age_ms} if max_age_ms is not None else None
+        response = await self._client.get(path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def health(self) -> Dict[str, Any]:
+        """Get the health status"""
+        return await self.get("/health")
+
+    async def detect(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Get complete system information"""
+        return await self.get(f"{settings.api_prefix}/detect", max_age_ms)
+
+    async def realtime(self, max_age_ms: Optional[int] = None) -> RealtimeMetrics:
+        """Get decoded realtime metrics"""
+        return decode_realtime(await self.get(f"{settings.api_prefix}/realtime", max_age_ms))
+
+    async def server_info(self) -> Dict[str, Any]:
+        """Get Transformer Lab compatible server info (legacy routes must be enabled)"""
+        return await self.get(f"{settings.legacy_prefix}/info")
+
+    async def close(self) -> None:
+        """Close pooled connections"""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncPolarisClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
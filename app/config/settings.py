@@ -3,7 +3,7 @@
 """
 
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -43,12 +43,155 @@ class PolarisSettings(BaseSettings):
     enable_mac_specific: bool = True
     enable_realtime_monitoring: bool = True
     
+    # Container Metrics (cgroup v2 limits and usage, PSI stall times)
+    enable_container_metrics: bool = True
+    cgroup_root: str = "/sys/fs/cgroup"
+    proc_root: str = "/proc"
+    cgroup_full_scan_interval: float = 30.0
+    
+    # Storage Probe (opt-in: sequential and random IO timed on these mount
+    # points in bursts of storage_probe_burst_size bytes, with sleeps in
+    # between to average storage_probe_max_rate bytes per second)
+    storage_probe_paths: List[str] = []
+    storage_probe_file_size: int = 64 * 1024 ** 2
+    storage_probe_block_size: int = 1024 ** 2
+    storage_probe_random_ops: int = 512
+    storage_probe_max_rate: float = 50 * 1024 ** 2
+    storage_probe_burst_size: int = 8 * 1024 ** 2
+    storage_probe_interval: float = 3600.0
+    
+    # Topology (NUMA nodes and the CPUs local to each GPU and NIC)
+    sys_root: str = "/sys"
+    
+    # Capability Microbenchmarks (numpy GEMM, memory bandwidth and single-core
+    # speed, run on demand in a separate process and compared per CPU model)
+    capability_cache_path: str = "~/.cache/polaris/capability.json"
+    capability_baseline_path: str = "~/.cache/polaris/capability_baselines.json"
+    capability_max_age: float = 86400.0
+    capability_tolerance: float = 0.2
+    capability_timeout: float = 120.0
+    capability_gemm_size: int = 1024
+    capability_stream_elements: int = 8_000_000
+    capability_repeats: int = 5
+    
+    # GPU Backend (auto, nvidia, amd, amd_sysfs, simulated, none)
+    gpu_backend: str = "auto"
+    amd_sysfs_root: str = "/sys/class/drm"
+    simulated_gpu_count: int = 8
+    simulated_gpu_latency: float = 0.0
+    simulated_gpu_error_rate: float = 0.0
+    simulated_gpu_seed: int = 0
+    simulated_gpu_hang_rate: float = 0.0
+    simulated_gpu_hang_seconds: float = 60.0
+    
+    # GPU Worker (vendor library calls run in a supervised child process with
+    # per-call deadlines; a hung worker is killed and restarted with backoff)
+    gpu_worker_enabled: bool = True
+    gpu_call_timeout: float = 2.0
+    gpu_worker_start_timeout: float = 30.0
+    gpu_worker_restart_backoff: float = 1.0
+    gpu_worker_max_backoff: float = 60.0
+    
     # Monitoring Intervals (seconds)
     cpu_check_interval: float = 1.0
     memory_check_interval: float = 1.0
     disk_check_interval: float = 5.0
     gpu_check_interval: float = 2.0
+    network_check_interval: float = 5.0
+    environment_check_interval: float = 300.0
+    
+    # Static Inventory (mount and interface lists are re-read after a
+    # mountinfo or rtnetlink change signal, and at least this often)
+    inventory_refresh_interval: float = 300.0
+    inventory_unwatched_max_age: float = 10.0
     
+    # Result Cache (per-section TTLs follow the monitoring intervals above)
+    result_cache_enabled: bool = True
+    result_cache_ttl: float = 1.0
+    result_cache_stale_while_revalidate: float = 5.0
+
+    # Response Compression (large payloads such as environment and network)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_zstd_level: int = 3
+
+    # Startup (build detectors in the background at startup instead of on first request)
+    warm_up_on_startup: bool = True
+
+    # Unix domain socket listener for co-located consumers (served alongside TCP)
+    uds_path: Optional[str] = None
+    
+    # Workers and Shared Snapshot (with several uvicorn workers, one sampler
+    # process probes the host and workers read its shared memory snapshot)
+    workers: int = 1
+    shared_snapshot_enabled: bool = True
+    shared_snapshot_name: Optional[str] = None
+    sampler_interval: float = 1.0
+    
+    # Adaptive sampling (the sampler speeds up while a stream is subscribed or
+    # a section is requested at least sampler_busy_rate times a second, and
+    # backs off to a heartbeat when nothing has been requested for a while)
+    adaptive_sampling_enabled: bool = True
+    sampler_fast_interval: float = 0.25
+    sampler_busy_rate: float = 2.0
+    sampler_heartbeat_interval: float = 30.0
+    sampler_idle_after: float = 60.0
+    
+    # Metric History (host samples kept in SQLite with 1s / 1m / 1h rollups;
+    # samples are queued in memory and written in batches by a background
+    # thread; retention and history_max_bytes bound the disk it uses)
+    history_enabled: bool = True
+    history_path: str = "~/.cache/polaris/history.db"
+    history_interval: float = 1.0
+    history_flush_interval: float = 5.0
+    history_retention_1s: float = 86400.0
+    history_retention_1m: float = 30 * 86400.0
+    history_retention_1h: float = 365 * 86400.0
+    history_max_bytes: int = 256 * 1024 ** 2
+    history_max_pending: int = 3600
+    history_max_points: int = 2000
+    history_series_max_points: int = 100000
+    
+    # Metric Export (host samples pushed as StatsD gauges over UDP and/or as
+    # OTLP/HTTP JSON; queued in memory and sent in batches by a background thread)
+    statsd_address: Optional[str] = None
+    statsd_prefix: str = "polaris"
+    otlp_endpoint: Optional[str] = None
+    exporter_queue_size: int = 1000
+    exporter_mtu: int = 1432
+    exporter_flush_interval: float = 1.0
+    exporter_timeout: float = 5.0
+    
+    # Inventory Change Feed (GPUs, NICs and mounts are diffed every
+    # changes_interval seconds, installed packages every changes_packages_interval)
+    changes_enabled: bool = True
+    changes_interval: float = 10.0
+    changes_packages_interval: float = 300.0
+    changes_max_events: int = 1000
+    changes_max_wait: float = 60.0
+    
+    # Agent Memory (RSS and object counts are recorded every memory_sample_interval
+    # seconds and checked for steady growth per hour over memory_growth_window;
+    # tracemalloc snapshots are opt-in since tracing slows every allocation)
+    memory_sample_interval: float = 10.0
+    memory_growth_window: float = 3600.0
+    memory_growth_max_rss_slope: float = 16 * 1024 ** 2
+    memory_growth_max_objects_slope: float = 20000.0
+    memory_profiling_enabled: bool = False
+    memory_profiling_frames: int = 1
+    memory_profiling_max_snapshots: int = 8
+    
+    # Instrumentation (per-collector and per-route latency histograms)
+    instrumentation_enabled: bool = True
+    
+    # Collector Execution (blocking collectors run in a bounded thread pool)
+    collector_max_workers: int = 8
+    collector_timeout: float = 10.0
+    collector_concurrency: int = 2
+    collector_timeouts: Dict[str, float] = {"environment": 120.0}
+    collector_concurrency_limits: Dict[str, int] = {"environment": 1}
+
     # Environment Detection
     conda_environment: Optional[str] = os.environ.get("CONDA_DEFAULT_ENV")
     conda_prefix: Optional[str] = os.environ.get("CONDA_PREFIX")
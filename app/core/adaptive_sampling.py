@@ -0,0 +1,108 @@
+"""
+🌟 Polaris System Detection API - Adaptive Sampling Policy
+"""
+
+from typing import Dict, Optional, Tuple
+
+from app.config.settings import settings
+
+# Sampling modes, from slowest to fastest
+IDLE, ACTIVE, BUSY, SUBSCRIBED = range(4)
+MODE_NAMES = ("idle", "active", "busy", "subscribed")
+
+
+class AdaptiveSamplingPolicy:
+    """
+    Pick a sampling interval per section from its recent demand
+
+    - subscribed: a stream subscriber is attached -> fast interval
+    - busy: requested at least ``busy_rate`` times a second -> fast interval
+    - active: requested within ``idle_after`` seconds -> the section's check interval
+    - idle: not requested for ``idle_after`` seconds -> heartbeat interval
+
+    Demand is reported as a monotonically increasing request counter per
+    section and folded into a smoothed request rate, so clients polling a
+    section often get fresh data without holding a stream open.
+    """
+
+    def __init__(
+        self,
+        fast_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        idle_after: Optional[float] = None,
+        busy_rate: Optional[float] = None,
+        active_intervals: Optional[Dict[str, float]] = None,
+        enabled: Optional[bool] = None,
+        fixed_interval: Optional[float] = None,
+    ):
+        self.fast_interval = fast_interval or settings.sampler_fast_interval
+        self.heartbeat_interval = heartbeat_interval or settings.sampler_heartbeat_interval
+        self.idle_after = idle_after or settings.sampler_idle_after
+        self.busy_rate = busy_rate or settings.sampler_busy_rate
+        self.active_intervals = dict(active_intervals if active_intervals is not None else {
+            "cpu": settings.cpu_check_interval,
+            "memory": settings.memory_check_interval,
+            "disk": settings.disk_check_interval,
+            "gpu": settings.gpu_check_interval,
+            "container": settings.cpu_check_interval,
+        })
+        self.enabled = settings.adaptive_sampling_enabled if enabled is None else enabled
+        self.fixed_interval = fixed_interval or settings.sampler_interval
+        self.started: Optional[float] = None
+        self.rates: Dict[str, float] = {}
+        self._last_counts: Dict[str, Tuple[int, float]] = {}
+
+    def update_rate(self, section: str, demand_count: int, now: float) -> float:
+        """Fold the latest demand counter into the section's request rate"""
+        previous = self._last_counts.get(section)
+        self._last_counts[section] = (demand_count, now)
+        if previous is None:
+            return self.rates.setdefault(section, 0.0)
+
+        previous_count, previous_time = previous
+        elapsed = now - previous_time
+        if elapsed <= 0:
+            return self.rates.get(section, 0.0)
+
+        # Exponentially weighted, with most of the weight on the last few seconds
+        instant = max(demand_count - previous_count, 0) / elapsed
+        weight = min(elapsed / 5.0, 1.0)
+        rate = self.rates.get(section, 0.0) * (1 - weight) + instant * weight
+        self.rates[section] = rate
+        return rate
+
+    def evaluate(
+        self,
+        section: str,
+        now: float,
+        last_demand: float,
+        demand_count: int,
+        subscribers_until: float,
+    ) -> Tuple[float, int]:
+        """
+        Get the sampling interval and mode of a section
+
+        Args:
+            section: Section name (cpu, memory, disk, gpu, container)
+            now: Current wall clock time
+            last_demand: Time the section was last requested (0 = never)
+            demand_count: Total requests of the section so far
+            subscribers_until: Time until which a stream subscriber is attached
+
+        Returns:
+            tuple: (interval in seconds, mode)
+        """
+        if self.started is None:
+            self.started = now
+        rate = self.update_rate(section, demand_count, now)
+
+        if not self.enabled:
+            return self.fixed_interval, ACTIVE
+        if subscribers_until > now:
+            return self.fast_interval, SUBSCRIBED
+        if rate >= self.busy_rate:
+            return self.fast_interval, BUSY
+        # Stay active for a while after startup so the first requests find fresh data
+        if now - max(last_demand, self.started) <= self.idle_after:
+            return self.active_intervals.get(section, self.fixed_interval), ACTIVE
+        return self.heartbeat_interval, IDLE
@@ -0,0 +1,310 @@
+"""
+🌟 Polaris System Detection API - Hardware Capability Microbenchmarks
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from app.config.settings import settings
+from app.utils.system_utils import get_cpu_model
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Measured metrics, and whether a larger value is better
+CAPABILITY_METRICS = {
+    "gemm_gflops": True,
+    "stream_copy_gbps": True,
+    "stream_triad_gbps": True,
+    "single_core_loop_ns": False,
+}
+
+# Iterations of the pure-Python loop timed for single-core speed
+LOOP_ITERATIONS = 1_000_000
+
+
+def _scalar_loop(iterations: int = LOOP_ITERATIONS) -> int:
+    """Fixed single-threaded integer workload"""
+    total = 0
+    for i in range(iterations):
+        total += i * i % 7
+    return total
+
+
+def run_capability_suite(gemm_size: int, stream_elements: int, repeats: int) -> Dict[str, Any]:
+    """
+    Run the microbenchmarks in this process (best of ``repeats`` each)
+
+    Args:
+        gemm_size: Side of the float32 matrices multiplied for GEMM GFLOP/s
+        stream_elements: float64 elements per array for memory bandwidth
+        repeats: Timed runs per benchmark
+
+    Returns:
+        dict: ``metrics`` (see CAPABILITY_METRICS), ``duration`` and ``numpy`` version
+    """
+    import numpy as np
+
+    started = time.perf_counter()
+
+    def best(run) -> float:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    rng = np.random.default_rng(0)
+    a = rng.random((gemm_size, gemm_size), dtype=np.float32)
+    b = rng.random((gemm_size, gemm_size), dtype=np.float32)
+    # Warm up the BLAS thread pool
+    a @ b
+    gemm = best(lambda: a @ b)
+    del a, b
+
+    x = np.ones(stream_elements)
+    y = np.ones(stream_elements)
+    z = np.empty(stream_elements)
+    # Fault in the destination pages before timing
+    np.copyto(z, x)
+
+    def triad():
+        np.multiply(y, 3.0, out=z)
+        np.add(z, x, out=z)
+
+    copy = best(lambda: np.copyto(z, x))
+    triad_time = best(triad)
+    del x, y, z
+
+    loop = best(_scalar_loop)
+    return {
+        "metrics": {
+            "gemm_gflops": round(2 * gemm_size ** 3 / gemm / 1e9, 2),
+            # Bytes actually moved: copy reads and writes one array each, the
+            # two-pass numpy triad reads three arrays and writes two
+            "stream_copy_gbps": round(2 * 8 * stream_elements / copy / 1e9, 2),
+            "stream_triad_gbps": round(5 * 8 * stream_elements / triad_time / 1e9, 2),
+            "single_core_loop_ns": round(loop / LOOP_ITERATIONS * 1e9, 2),
+        },
+        "duration": round(time.perf_counter() - started, 3),
+        "numpy": np.__version__,
+    }
+
+
+def _run_suite_worker(connection, gemm_size: int, stream_elements: int, repeats: int) -> None:
+    """Run the suite in the benchmark process and send back the result"""
+    try:
+        connection.send(("ok", run_capability_suite(gemm_size, stream_elements, repeats)))
+    except Exception as e:
+        connection.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class CapabilityProbe:
+    """
+    On-demand hardware capability microbenchmarks with cached results
+
+    The suite (GEMM GFLOP/s, STREAM-style copy and triad bandwidth, a
+    single-core loop) runs in a separate process so it never blocks the
+    server, and only when explicitly requested. Results are cached in a JSON
+    file shared by all workers, reported as stale after ``max_age`` seconds,
+    and compared against the baseline recorded for the same CPU model so
+    degraded or throttled nodes stand out.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        baseline_path: Optional[str] = None,
+        max_age: Optional[float] = None,
+        tolerance: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.cache_path = os.path.expanduser(cache_path or settings.capability_cache_path)
+        self.baseline_path = os.path.expanduser(baseline_path or settings.capability_baseline_path)
+        self.max_age = settings.capability_max_age if max_age is None else max_age
+        self.tolerance = settings.capability_tolerance if tolerance is None else tolerance
+        self.timeout = timeout or settings.capability_timeout
+        self.sku = get_cpu_model()
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._file_lock = threading.Lock()
+
+    @staticmethod
+    def _load_json(path: str) -> Optional[Dict[str, Any]]:
+        """Read a JSON file, or None if it is missing or invalid"""
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load_result(self) -> Optional[Dict[str, Any]]:
+        """Get the cached result of this CPU model, if any"""
+        result = self._load_json(self.cache_path)
+        if result is None or result.get("sku") != self.sku:
+            return None
+        return result
+
+    def load_baseline(self) -> Optional[Dict[str, float]]:
+        """Get the baseline metrics recorded for this CPU model"""
+        return (self._load_json(self.baseline_path) or {}).get(self.sku)
+
+    def record_baseline(self, metrics: Dict[str, float]) -> None:
+        """Store metrics as the baseline of this CPU model"""
+        with self._file_lock:
+            baselines = self._load_json(self.baseline_path) or {}
+            baselines[self.sku] = metrics
+            self._write_json(self.baseline_path, baselines)
+
+    @staticmethod
+    def _write_json(path: str, data: Dict[str, Any]) -> None:
+        """Replace a JSON file atomically so readers never see a partial file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+
+    def compare(self, metrics: Dict[str, float], baseline: Optional[Dict[str, float]]) -> Dict[str, Any]:
+        """
+        Compare metrics with a baseline
+
+        Returns:
+            dict: ``ratios`` (1.0 = baseline speed, below 1.0 = slower) and
+            ``slow_metrics`` (more than ``tolerance`` below the baseline)
+        """
+        ratios = {}
+        for metric, higher_is_better in CAPABILITY_METRICS.items():
+            expected, measured = (baseline or {}).get(metric), metrics.get(metric)
+            if not expected or not measured:
+                continue
+            ratios[metric] = round(measured / expected if higher_is_better else expected / measured, 3)
+        return {
+            "ratios": ratios,
+            "slow_metrics": sorted(metric for metric, ratio in ratios.items() if ratio < 1.0 - self.tolerance),
+        }
+
+    @contextmanager
+    def _run_lock(self) -> Iterator[None]:
+        """Hold the cross-process lock that keeps workers from benchmarking at the same time"""
+        if fcntl is None:
+            yield
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f"{self.cache_path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def measure(self) -> Dict[str, Any]:
+        """Run the suite in a separate process and cache the result (blocking)"""
+        requested = time.time()
+        with self._run_lock():
+            # Another worker may have just finished a run
+            result = self.load_result()
+            if result is not None and result["measured_at"] >= requested:
+                return result
+            return self._measure_locked()
+
+    def _measure_locked(self) -> Dict[str, Any]:
+        """Run the suite in the benchmark process"""
+        context = multiprocessing.get_context("spawn")
+        connection, child_connection = context.Pipe()
+        process = context.Process(
+            target=_run_suite_worker,
+            args=(child_connection, settings.capability_gemm_size, settings.capability_stream_elements,
+                  settings.capability_repeats),
+            name="polaris-capability",
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        try:
+            if not connection.poll(self.timeout):
+                raise TimeoutError(f"Capability benchmarks did not finish within {self.timeout:.0f}s")
+            status, value = connection.recv()
+        except EOFError:
+            raise RuntimeError("Capability benchmark process exited") from None
+        finally:
+            connection.close()
+            process.join(1.0)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+        if status != "ok":
+            raise RuntimeError(value)
+        result = {"sku": self.sku, "measured_at": time.time(), "cpu_count": os.cpu_count(), **value}
+        with self._file_lock:
+            self._write_json(self.cache_path, result)
+        return result
+
+    async def _measure(self) -> None:
+        """Run the suite off the event loop, keeping the error for the next request"""
+        try:
+            await asyncio.to_thread(self.measure)
+            self.error = None
+        except Exception as e:
+            print(f"⚠️ Error running capability benchmarks: {e}")
+            self.error = str(e)
+
+    async def get_capability(self, refresh: bool = False, wait: bool = False) -> Dict[str, Any]:
+        """
+        Get the cached capability result; a run only starts when ``refresh`` is set
+
+        Args:
+            refresh: Start a new run in the background (unless one is running)
+            wait: Wait for a running benchmark instead of returning the cached result right away
+
+        Returns:
+            dict: The result and baseline comparison, with ``status`` one of
+            ``ready``, ``stale`` (older than ``max_age``), ``running``,
+            ``never_measured`` or ``failed``
+        """
+        running = self._task is not None and not self._task.done()
+        if refresh and not running:
+            self._task = asyncio.create_task(self._measure())
+            running = True
+        if wait and running:
+            await asyncio.shield(self._task)
+            running = False
+        result = self.load_result()
+
+        baseline = self.load_baseline()
+        metrics = result["metrics"] if result is not None else {}
+        comparison = self.compare(metrics, baseline)
+        if running:
+            status = "running"
+        elif result is None:
+            status = "failed" if self.error else "never_measured"
+        elif time.time() - result["measured_at"] > self.max_age:
+            status = "stale"
+        else:
+            status = "ready"
+        return {
+            "status": status,
+            "sku": self.sku,
+            "measured_at": result["measured_at"] if result is not None else None,
+            "age": round(time.time() - result["measured_at"], 3) if result is not None else None,
+            "duration": result["duration"] if result is not None else None,
+            "metrics": metrics,
+            "baseline": baseline,
+            **comparison,
+            "slow": bool(comparison["slow_metrics"]),
+            "error": self.error,
+        }
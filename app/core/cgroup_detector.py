@@ -0,0 +1,236 @@
+"""
+🌟 Polaris System Detection API - cgroup v2 and PSI Detection Module
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.instrumentation import instrumented
+
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+PRESSURE_KEYS = tuple(f"{resource}_{kind}" for resource in PRESSURE_RESOURCES for kind in ("some", "full"))
+
+
+def parse_cpu_list(value: str) -> int:
+    """Count the CPUs in a cpuset list such as ``0-3,6``"""
+    count = 0
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        count += int(end) - int(start) + 1 if end else 1
+    return count
+
+
+def parse_flat_keyed(text: str) -> Dict[str, int]:
+    """Parse a flat keyed file (``key value`` per line) such as cpu.stat"""
+    values = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(" ")
+        if value.strip().lstrip("-").isdigit():
+            values[key] = int(value)
+    return values
+
+
+def parse_io_stat(text: str) -> Dict[str, int]:
+    """Sum the per-device counters of io.stat (``8:0 rbytes=.. wbytes=..``)"""
+    totals = {"rbytes": 0, "wbytes": 0, "rios": 0, "wios": 0}
+    for line in text.splitlines():
+        for field in line.split()[1:]:
+            key, _, value = field.partition("=")
+            if key in totals:
+                totals[key] += int(value)
+    return totals
+
+
+def parse_pressure(text: str) -> Dict[str, int]:
+    """Get the cumulative ``some`` and ``full`` stall times (µs) of a PSI file"""
+    totals = {}
+    for line in text.splitlines():
+        kind, *fields = line.split()
+        for field in fields:
+            if field.startswith("total="):
+                totals[kind] = int(field[6:])
+    return totals
+
+
+class CgroupDetector:
+    """
+    Container limits and usage from cgroup v2, stall times from PSI
+
+    psutil reports the host, so inside a container the effective CPU and
+    memory capacity come from this process' cgroup (``cpu.max``,
+    ``cpuset.cpus.effective``, ``memory.max``). Usage and stall rates are
+    computed from counter deltas between two samples, so every caller
+    that samples regularly (the request path or the shared sampler) gets
+    rates over its own interval.
+    """
+
+    def __init__(self, cgroup_root: Optional[str] = None, proc_root: Optional[str] = None):
+        self.cgroup_root = cgroup_root or settings.cgroup_root
+        self.proc_root = proc_root or settings.proc_root
+        self.is_v2 = os.path.exists(os.path.join(self.cgroup_root, "cgroup.controllers"))
+        self.cgroup, self.path = self._find_own_cgroup()
+        self._lock = threading.Lock()
+        # Prime the counters so the first sample already has a delta
+        self._previous = self.read_counters()
+
+    def _find_own_cgroup(self) -> Tuple[Optional[str], Optional[str]]:
+        """Get this process' cgroup name and directory (cgroup v2 only)"""
+        if not self.is_v2:
+            return None, None
+        name = "/"
+        for line in (self._read(os.path.join(self.proc_root, "self", "cgroup")) or "").splitlines():
+            if line.startswith("0::"):
+                name = line[3:].strip() or "/"
+        path = os.path.join(self.cgroup_root, name.lstrip("/"))
+        # Without a cgroup namespace the name may not exist in this mount
+        if not os.path.isdir(path):
+            path = self.cgroup_root
+        return name, path
+
+    @staticmethod
+    def _read(path: str) -> Optional[str]:
+        """Read a small text file, or None if it is missing"""
+        try:
+            with open(path) as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _read_cgroup(self, name: str) -> Optional[str]:
+        """Read a file of this process' cgroup"""
+        if self.path is None:
+            return None
+        return self._read(os.path.join(self.path, name))
+
+    def get_limits(self) -> Dict[str, Any]:
+        """
+        Get the effective CPU and memory capacity
+
+        Returns:
+            dict: ``cgroup``, ``cpu_limit`` (CPUs, from the quota and the
+            cpuset) and ``memory_limit`` (bytes, None when unlimited)
+        """
+        if hasattr(os, "sched_getaffinity"):
+            cpu_limit = float(len(os.sched_getaffinity(0)))
+        else:
+            cpu_limit = float(os.cpu_count() or 1)
+
+        cpu_max = (self._read_cgroup("cpu.max") or "max").split()
+        if cpu_max[0] != "max" and len(cpu_max) == 2:
+            cpu_limit = min(cpu_limit, int(cpu_max[0]) / int(cpu_max[1]))
+        cpuset = (self._read_cgroup("cpuset.cpus.effective") or "").strip()
+        if cpuset:
+            cpu_limit = min(cpu_limit, float(parse_cpu_list(cpuset)))
+
+        memory_max = (self._read_cgroup("memory.max") or "max").strip()
+        return {
+            "cgroup": self.cgroup,
+            "cpu_limit": round(cpu_limit, 3),
+            "memory_limit": None if memory_max == "max" else int(memory_max),
+        }
+
+    def read_counters(self) -> Dict[str, Any]:
+        """Read the cumulative usage and stall counters"""
+        counters: Dict[str, Any] = {"time": time.monotonic()}
+
+        cpu_stat = self._read_cgroup("cpu.stat")
+        if cpu_stat is not None:
+            counters["cpu"] = parse_flat_keyed(cpu_stat)
+        io_stat = self._read_cgroup("io.stat")
+        if io_stat is not None:
+            counters["io"] = parse_io_stat(io_stat)
+        memory_current = self._read_cgroup("memory.current")
+        if memory_current is not None:
+            counters["memory_current"] = int(memory_current)
+
+        # The cgroup's own pressure when available, the host's otherwise
+        pressure = {}
+        for resource in PRESSURE_RESOURCES:
+            text = self._read_cgroup(f"{resource}.pressure")
+            if text is None:
+                text = self._read(os.path.join(self.proc_root, "pressure", resource))
+            if text is not None:
+                pressure[resource] = parse_pressure(text)
+        counters["pressure"] = pressure
+        return counters
+
+    @staticmethod
+    def compute_rates(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn two counter readings into rates over the time between them
+
+        Returns:
+            dict: ``cpu_usage`` (CPUs), ``cpu_throttled_percent``,
+            ``io_read_bytes_per_sec``, ``io_write_bytes_per_sec`` and
+            ``pressure`` (percent of time stalled, per resource and kind);
+            values are None when the counters are not available
+        """
+        elapsed = current["time"] - previous["time"]
+        rates: Dict[str, Any] = {
+            "cpu_usage": None,
+            "cpu_throttled_percent": None,
+            "io_read_bytes_per_sec": None,
+            "io_write_bytes_per_sec": None,
+            "pressure": {},
+        }
+        if elapsed <= 0:
+            return rates
+        elapsed_usec = elapsed * 1e6
+
+        def delta(old: Dict[str, int], new: Dict[str, int], key: str) -> Optional[int]:
+            if key not in old or key not in new:
+                return None
+            # Counters restart when a cgroup is recreated
+            return max(new[key] - old[key], 0)
+
+        if "cpu" in previous and "cpu" in current:
+            usage = delta(previous["cpu"], current["cpu"], "usage_usec")
+            if usage is not None:
+                rates["cpu_usage"] = round(usage / elapsed_usec, 3)
+            periods = delta(previous["cpu"], current["cpu"], "nr_periods")
+            throttled = delta(previous["cpu"], current["cpu"], "nr_throttled")
+            if periods and throttled is not None:
+                rates["cpu_throttled_percent"] = round(100.0 * throttled / periods, 2)
+            elif periods is not None:
+                rates["cpu_throttled_percent"] = 0.0
+
+        if "io" in previous and "io" in current:
+            rates["io_read_bytes_per_sec"] = round(delta(previous["io"], current["io"], "rbytes") / elapsed, 1)
+            rates["io_write_bytes_per_sec"] = round(delta(previous["io"], current["io"], "wbytes") / elapsed, 1)
+
+        for resource, totals in current["pressure"].items():
+            old = previous["pressure"].get(resource, {})
+            for kind in totals:
+                stalled = delta(old, totals, kind)
+                if stalled is not None:
+                    rates["pressure"][f"{resource}_{kind}"] = round(min(100.0 * stalled / elapsed_usec, 100.0), 2)
+        return rates
+
+    @instrumented("cgroup_detector.get_container_metrics")
+    def get_container_metrics(self) -> Dict[str, Any]:
+        """Get effective capacity, usage and stall percentages since the previous call"""
+        current = self.read_counters()
+        with self._lock:
+            previous, self._previous = self._previous, current
+
+        limits = self.get_limits()
+        rates = self.compute_rates(previous, current)
+        memory_used = current.get("memory_current")
+        memory_limit = limits["memory_limit"]
+        cpu_usage = rates["cpu_usage"]
+
+        return {
+            **limits,
+            "memory_used": memory_used,
+            "memory_percent": (
+                round(100.0 * memory_used / memory_limit, 2) if memory_used is not None and memory_limit else None
+            ),
+            "cpu_percent": round(100.0 * cpu_usage / limits["cpu_limit"], 2) if cpu_usage is not None else None,
+            **rates,
+        }
@@ -0,0 +1,163 @@
+"""
+🌟 Polaris System Detection API - cgroup Tree Walker
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.cgroup_detector import parse_io_stat
+from app.core.instrumentation import instrumented
+
+
+def _read(path: str) -> Optional[bytes]:
+    """Read a small cgroup file, or None if it is missing"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, 65536)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+class _CgroupNode:
+    """Cached structure and last counters of one cgroup directory"""
+
+    __slots__ = ("key", "children", "sampled", "cpu_usec", "read_bytes", "write_bytes")
+
+    def __init__(self):
+        self.key: Optional[Tuple[int, int]] = None
+        self.children: List[str] = []
+        self.sampled = 0.0
+        self.cpu_usec: Optional[int] = None
+        self.read_bytes: Optional[int] = None
+        self.write_bytes: Optional[int] = None
+
+
+class CgroupTreeWalker:
+    """
+    Per-cgroup CPU, memory and IO usage across the whole cgroup v2 hierarchy
+
+    Each walk stats every directory but only lists the ones whose
+    modification time or link count (kernfs keeps a directory's link count
+    at 2 + its subdirectories) changed since the previous walk, plus a full
+    re-listing every ``full_scan_interval`` seconds. Counters are read on
+    every walk, and rates are the deltas since the previous walk.
+
+    Only the re-listing is skipped: a walk still costs a stat and up to
+    three counter reads per cgroup, so it grows linearly with the number of
+    cgroups and is only about 1.4x faster than listing every directory
+    (about 60ms against 86ms for 3051 fake cgroups on one core).
+    """
+
+    def __init__(self, root: Optional[str] = None, full_scan_interval: Optional[float] = None):
+        self.root = root or settings.cgroup_root
+        self.full_scan_interval = full_scan_interval or settings.cgroup_full_scan_interval
+        self.available = os.path.exists(os.path.join(self.root, "cgroup.controllers"))
+        self._nodes: Dict[str, _CgroupNode] = {}
+        self._last_full_scan = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"walks": 0, "cgroups": 0, "listed": 0, "reused": 0}
+
+    @instrumented("cgroup_walker.walk")
+    def walk(self) -> List[Dict[str, Any]]:
+        """
+        Sample every cgroup
+
+        Returns:
+            list: One dict per cgroup with ``path``, ``depth``,
+            ``memory_used`` (bytes), ``cpu_usage`` (CPUs),
+            ``io_read_bytes_per_sec`` and ``io_write_bytes_per_sec``;
+            rates are None on the first walk that sees a cgroup
+        """
+        if not self.available:
+            return []
+
+        with self._lock:
+            now = time.monotonic()
+            full_scan = now - self._last_full_scan >= self.full_scan_interval
+            if full_scan:
+                self._last_full_scan = now
+
+            nodes = self._nodes
+            seen = {}
+            results = []
+            stack = ["/"]
+            while stack:
+                name = stack.pop()
+                path = self.root if name == "/" else self.root + name
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    # Removed while walking
+                    continue
+
+                node = nodes.get(name)
+                if node is None:
+                    node = _CgroupNode()
+                seen[name] = node
+
+                key = (stat.st_mtime_ns, stat.st_nlink)
+                if full_scan or node.key != key:
+                    node.key = key
+                    try:
+                        node.children = [entry.name for entry in os.scandir(path) if entry.is_dir(follow_symlinks=False)]
+                    except OSError:
+                        node.children = []
+                    self.stats["listed"] += 1
+                else:
+                    self.stats["reused"] += 1
+
+                results.append(self._sample(name, path, node, now))
+                prefix = "/" if name == "/" else name + "/"
+                stack.extend(prefix + child for child in node.children)
+
+            self._nodes = seen
+            self.stats["walks"] += 1
+            self.stats["cgroups"] = len(seen)
+            return results
+
+    @staticmethod
+    def _sample(name: str, path: str, node: _CgroupNode, now: float) -> Dict[str, Any]:
+        """Read one cgroup's counters and turn them into rates since its previous sample"""
+        cpu_usec = read_bytes = write_bytes = memory_used = None
+
+        cpu_stat = _read(path + "/cpu.stat")
+        if cpu_stat is not None and cpu_stat.startswith(b"usage_usec "):
+            cpu_usec = int(cpu_stat[11:cpu_stat.index(b"\n")])
+        memory_current = _read(path + "/memory.current")
+        if memory_current is not None:
+            memory_used = int(memory_current)
+        io_stat = _read(path + "/io.stat")
+        if io_stat is not None:
+            io = parse_io_stat(io_stat.decode())
+            read_bytes, write_bytes = io["rbytes"], io["wbytes"]
+
+        elapsed = now - node.sampled
+        cpu_usage = io_read = io_write = None
+        if node.sampled and elapsed > 0:
+            if cpu_usec is not None and node.cpu_usec is not None:
+                cpu_usage = round(max(cpu_usec - node.cpu_usec, 0) / (elapsed * 1e6), 3)
+            if read_bytes is not None and node.read_bytes is not None:
+                io_read = round(max(read_bytes - node.read_bytes, 0) / elapsed, 1)
+                io_write = round(max(write_bytes - node.write_bytes, 0) / elapsed, 1)
+
+        node.sampled, node.cpu_usec, node.read_bytes, node.write_bytes = now, cpu_usec, read_bytes, write_bytes
+        return {
+            "path": name,
+            "depth": 0 if name == "/" else name.count("/"),
+            "memory_used": memory_used,
+            "cpu_usage": cpu_usage,
+            "io_read_bytes_per_sec": io_read,
+            "io_write_bytes_per_sec": io_write,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get walk counters (listed vs reused directories)"""
+        return {"root": self.root, "available": self.available, **self.stats}
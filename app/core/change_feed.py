@@ -0,0 +1,199 @@
+"""
+🌟 Polaris System Detection API - Hardware Inventory Change Feed
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.records import GPURecord, is_fallback, present
+
+# Inventory kinds in the order their changes are reported
+INVENTORY_KINDS = ("gpu", "nic", "mount", "package")
+
+# How often workers re-read a feed published by the shared sampler while long-polling
+SHARED_POLL_INTERVAL = 0.25
+
+
+def build_inventory(
+    gpu_records: Optional[List[GPURecord]] = None,
+    network_info: Optional[Dict[str, Any]] = None,
+    disk_info: Optional[Dict[str, Any]] = None,
+    packages: Optional[Dict[str, str]] = None,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Reduce detection results to the attributes that identify hardware and software
+
+    Usage figures (free memory, utilization, byte counters) are left out so
+    only discrete changes show up in a diff. A kind passed as None is left
+    out of the inventory and is not compared; so are GPU readings from a
+    failed collection, which would otherwise show every GPU as removed.
+
+    Returns:
+        dict: ``{kind: {key: attributes}}`` for the kinds given
+    """
+    inventory = {}
+    if gpu_records is not None and not is_fallback(gpu_records):
+        inventory["gpu"] = {
+            str(index): {"name": gpu.name, "total_memory": gpu.total_memory if present(gpu.total_memory) else None}
+            for index, gpu in enumerate(gpu_records)
+        }
+    if network_info is not None:
+        addresses = network_info.get("network_interfaces", {})
+        inventory["nic"] = {
+            name: {
+                "isup": stats.get("isup"),
+                "speed": stats.get("speed"),
+                "mtu": stats.get("mtu"),
+                "addresses": sorted(address["address"] for address in addresses.get(name, [])),
+            }
+            for name, stats in network_info.get("network_stats", {}).items()
+        }
+    if disk_info is not None:
+        inventory["mount"] = {
+            partition["mountpoint"]: {
+                "device": partition["device"],
+                "fstype": partition["fstype"],
+                "opts": partition["opts"],
+            }
+            for partition in disk_info.get("disk_partitions", [])
+        }
+    if packages is not None:
+        inventory["package"] = {name: {"version": version} for name, version in packages.items()}
+    return inventory
+
+
+def diff_inventory(
+    old: Dict[str, Dict[str, Dict[str, Any]]],
+    new: Dict[str, Dict[str, Dict[str, Any]]],
+) -> List[Tuple[str, str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """
+    Compare two inventories, kind by kind (kinds missing from either side are skipped)
+
+    Returns:
+        list: ``(kind, key, change, before, after)`` with change one of
+        "added", "removed" or "changed"; ``before``/``after`` hold only the
+        attributes that differ for "changed"
+    """
+    changes = []
+    for kind in INVENTORY_KINDS:
+        if kind not in old or kind not in new:
+            continue
+        before_items, after_items = old[kind], new[kind]
+        for key in sorted(before_items.keys() - after_items.keys()):
+            changes.append((kind, key, "removed", before_items[key], None))
+        for key in sorted(after_items.keys() - before_items.keys()):
+            changes.append((kind, key, "added", None, after_items[key]))
+        for key in sorted(before_items.keys() & after_items.keys()):
+            before, after = before_items[key], after_items[key]
+            if before != after:
+                fields = [field for field in after if before.get(field) != after[field]]
+                changes.append((
+                    kind, key, "changed",
+                    {field: before.get(field) for field in fields},
+                    {field: after[field] for field in fields},
+                ))
+    return changes
+
+
+class ChangeFeed:
+    """
+    Bounded log of inventory change events with monotonic sequence numbers
+
+    Each successive inventory is diffed against the previous one and every
+    difference becomes an event. Readers pass the last sequence number they
+    saw and get everything after it, or wait for the next event. The log
+    keeps the latest ``max_events`` events; a reader whose cursor fell out
+    of it, or whose cursor belongs to another ``epoch`` (a restarted or
+    different process), is told to ``reset`` and re-read the inventory.
+    """
+
+    def __init__(self, max_events: Optional[int] = None):
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events or settings.changes_max_events)
+        self.epoch = f"{os.getpid()}-{time.time_ns()}"
+        self.sequence = 0
+        self.inventory: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.stats = {"updates": 0, "waits": 0}
+        self._changed = asyncio.Event()
+        self._loaded: Optional[Dict[str, Any]] = None
+
+    def update(self, inventory: Dict[str, Dict[str, Dict[str, Any]]]) -> int:
+        """
+        Record an inventory, appending an event for each difference from the previous one
+
+        Kinds missing from ``inventory`` keep their previous state, so kinds
+        can be refreshed on different schedules. The first inventory of a
+        kind is the baseline and produces no events.
+
+        Returns:
+            int: Number of events appended
+        """
+        now = time.time()
+        changes = diff_inventory(self.inventory, inventory)
+        for kind, key, change, before, after in changes:
+            self.sequence += 1
+            self.events.append({
+                "sequence": self.sequence,
+                "timestamp": now,
+                "kind": kind,
+                "key": key,
+                "change": change,
+                "before": before,
+                "after": after,
+            })
+        self.inventory.update(inventory)
+        self.stats["updates"] += 1
+        if changes:
+            # Wake every waiter, then arm a fresh event for the next change
+            self._changed.set()
+            self._changed = asyncio.Event()
+        return len(changes)
+
+    def export(self) -> Dict[str, Any]:
+        """Get the epoch, sequence and retained events, for publishing to other processes"""
+        return {"epoch": self.epoch, "sequence": self.sequence, "events": list(self.events)}
+
+    def load(self, feed: Dict[str, Any]) -> None:
+        """Mirror a feed exported by another process (the shared sampler)"""
+        if feed is self._loaded:
+            return
+        self._loaded = feed
+        self.epoch = feed["epoch"]
+        self.sequence = feed["sequence"]
+        self.events = deque(feed["events"], maxlen=self.events.maxlen)
+
+    def read(self, since: int, epoch: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the events after ``since``
+
+        Returns:
+            dict: ``epoch``, latest ``sequence``, ``events`` and ``reset``
+            (the cursor is unknown here, so events may have been missed)
+        """
+        oldest = self.events[0]["sequence"] if self.events else self.sequence + 1
+        reset = (epoch is not None and epoch != self.epoch) or since > self.sequence or since < oldest - 1
+        if reset:
+            events = list(self.events)
+        else:
+            # Sequence numbers are contiguous, so the first wanted event is at a known offset
+            events = list(self.events)[since - oldest + 1:]
+        return {"epoch": self.epoch, "sequence": self.sequence, "events": events, "reset": reset}
+
+    async def wait(self, since: int, epoch: Optional[str] = None, timeout: float = 0.0) -> Dict[str, Any]:
+        """Like ``read``, but wait up to ``timeout`` seconds for an event when there is none yet"""
+        result = self.read(since, epoch)
+        if result["events"] or result["reset"] or timeout <= 0:
+            return result
+        self.stats["waits"] += 1
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.read(since, epoch)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the log size and counters"""
+        return {"epoch": self.epoch, "sequence": self.sequence, "events": len(self.events), **self.stats}
@@ -0,0 +1,178 @@
+"""
+🌟 Polaris System Detection API - Collector Executor
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.config.settings import settings
+from app.core.instrumentation import instrumentation
+
+
+class CollectorTimeoutError(Exception):
+    """Raised when a collector does not finish within its deadline"""
+
+    def __init__(self, collector: str, timeout: float):
+        self.collector = collector
+        self.timeout = timeout
+        super().__init__(f"Collector '{collector}' did not finish within {timeout:.1f}s")
+
+
+class CollectorExecutor:
+    """
+    Run blocking collectors (psutil, NVML, subprocesses) off the event loop
+
+    Every collector runs in a dedicated, sized thread pool. Each collector
+    name has its own concurrency limit, so one slow collector can never
+    occupy every worker thread, and its own timeout, so a caller is never
+    left waiting on a hung probe.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        default_concurrency: Optional[int] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.max_workers = max_workers or settings.collector_max_workers
+        self.default_timeout = default_timeout or settings.collector_timeout
+        self.default_concurrency = default_concurrency or settings.collector_concurrency
+        self.timeouts = dict(settings.collector_timeouts if timeouts is None else timeouts)
+        self.concurrency_limits = dict(
+            settings.collector_concurrency_limits if concurrency_limits is None else concurrency_limits
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.executions: Dict[str, int] = {}
+        self.timeouts_hit: Dict[str, int] = {}
+        # asyncio semaphores are bound to a loop, so keep one set per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool, creating it on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="polaris-collector",
+            )
+        return self._executor
+
+    def timeout_for(self, collector: str) -> float:
+        """Get the deadline in seconds for a collector"""
+        return self.timeouts.get(collector, self.default_timeout)
+
+    def concurrency_for(self, collector: str) -> int:
+        """Get the maximum number of concurrent runs for a collector"""
+        return self.concurrency_limits.get(collector, self.default_concurrency)
+
+    def _get_semaphore(self, loop: asyncio.AbstractEventLoop, collector: str) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for a collector on the given loop"""
+        semaphores = self._semaphores.setdefault(loop, {})
+        semaphore = semaphores.get(collector)
+        if semaphore is None:
+            semaphore = semaphores[collector] = asyncio.Semaphore(self.concurrency_for(collector))
+        return semaphore
+
+    async def run(
+        self,
+        collector: str,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run a blocking collector in the pool
+
+        Args:
+            collector: Collector name used for limits and timeouts
+            func: Blocking callable to run
+            timeout: Optional override of the collector deadline
+
+        Returns:
+            Any: Result of the collector
+
+        Raises:
+            CollectorTimeoutError: If the collector misses its deadline
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter_ns()
+        timeout = self.timeout_for(collector) if timeout is None else timeout
+        deadline = loop.time() + timeout
+        semaphore = self._get_semaphore(loop, collector)
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self._count_timeout(collector)
+            self._record(collector, started, True)
+            raise CollectorTimeoutError(collector, timeout) from None
+
+        self.executions[collector] = self.executions.get(collector, 0) + 1
+        try:
+            # Run in a copy of the caller's context so detector timings reach
+            # the Server-Timing header of the request that triggered them
+            context = contextvars.copy_context()
+            future = loop.run_in_executor(self.executor, functools.partial(context.run, func, *args, **kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+
+        # The slot is released when the thread finishes, not when the caller
+        # gives up, so a hung collector keeps counting against its own limit
+        future.add_done_callback(functools.partial(self._release, semaphore))
+
+        error = True
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), max(deadline - loop.time(), 0))
+            error = False
+            return result
+        except asyncio.TimeoutError:
+            self._count_timeout(collector)
+            raise CollectorTimeoutError(collector, timeout) from None
+        finally:
+            self._record(collector, started, error)
+
+    @staticmethod
+    def _record(collector: str, started: int, error: bool) -> None:
+        """Record the wall time of a run, including the wait for a slot"""
+        if instrumentation.enabled:
+            instrumentation.record(f"collector.{collector}", time.perf_counter_ns() - started, error)
+
+    def _count_timeout(self, collector: str) -> None:
+        """Count a missed deadline for a collector"""
+        self.timeouts_hit[collector] = self.timeouts_hit.get(collector, 0) + 1
+
+    @staticmethod
+    def _release(semaphore: asyncio.Semaphore, future: "asyncio.Future") -> None:
+        """Release a collector slot and consume any late result"""
+        semaphore.release()
+        if not future.cancelled():
+            future.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-collector execution and timeout counts"""
+        return {
+            "max_workers": self.max_workers,
+            "executions": dict(self.executions),
+            "timeouts": dict(self.timeouts_hit),
+        }
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool without waiting for hung collectors"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global collector executor instance
+collector_executor = CollectorExecutor()
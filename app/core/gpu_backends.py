@@ -0,0 +1,467 @@
+"""
+🌟 Polaris System Detection API - GPU Backends
+"""
+
+import abc
+import functools
+import importlib
+import importlib.util
+import os
+import random
+import re
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.records import MISSING, present
+
+# GPU Detection Libraries (imported lazily by the backend that needs them,
+# so pyrsmi is never loaded on NVIDIA hosts)
+HAS_NVIDIA = importlib.util.find_spec("pynvml") is not None
+HAS_AMD = importlib.util.find_spec("pyrsmi") is not None
+
+
+class GPUBackendError(Exception):
+    """Raised when a GPU backend query fails"""
+
+
+class GPUBackend(abc.ABC):
+    """
+    Base class for GPU vendor backends
+
+    A backend exposes the per-device queries GPUDetector needs. Each method
+    maps to one vendor library call so latency and failures behave like
+    the real library.
+    """
+
+    name = "none"
+    device_type = "cpu"
+
+    def initialize(self) -> None:
+        """Initialize the vendor library"""
+
+    def get_runtime_version(self) -> str:
+        """Get the GPU runtime version (CUDA/HIP) reported by PyTorch"""
+        return "n/a"
+
+    @abc.abstractmethod
+    def get_device_count(self) -> int:
+        """Get the number of devices"""
+
+    @abc.abstractmethod
+    def get_device_name(self, index: int) -> str:
+        """Get the name of a device"""
+
+    @abc.abstractmethod
+    def get_memory_info(self, index: int) -> Tuple[int, int, int]:
+        """Get (total, used, free) memory of a device in bytes"""
+
+    @abc.abstractmethod
+    def get_utilization(self, index: int) -> int:
+        """Get the utilization of a device in percent"""
+
+    def get_cpu_affinity(self) -> Dict[str, List[int]]:
+        """Get the CPUs local to each device, keyed by PCI address (``0000:3b:00.0``), when the library reports it"""
+        return {}
+
+    def collect_devices(self) -> List[Tuple[str, int, int, int, int]]:
+        """Get (name, total, used, free, utilization) of every device"""
+        devices = []
+        for index in range(self.get_device_count()):
+            name = self.get_device_name(index)
+            total, used, free = self.get_memory_info(index)
+            devices.append((name, total, used, free, self.get_utilization(index)))
+        return devices
+
+
+class NvidiaBackend(GPUBackend):
+    """NVIDIA GPUs via pynvml"""
+
+    name = "nvidia"
+    device_type = "nvidia"
+
+    def __init__(self):
+        self._handles: Dict[int, Any] = {}
+        self.nvml = None
+
+    def initialize(self) -> None:
+        self.nvml = importlib.import_module("pynvml")
+        self.nvml.nvmlInit()
+
+    def get_runtime_version(self) -> str:
+        import torch
+        return torch.version.cuda or "n/a"
+
+    def _handle(self, index: int):
+        """Get (and cache) the NVML handle of a device"""
+        handle = self._handles.get(index)
+        if handle is None:
+            handle = self._handles[index] = self.nvml.nvmlDeviceGetHandleByIndex(index)
+        return handle
+
+    def get_device_count(self) -> int:
+        count = self.nvml.nvmlDeviceGetCount()
+        if count != len(self._handles):
+            self._handles.clear()
+        return count
+
+    def get_device_name(self, index: int) -> str:
+        return self.nvml.nvmlDeviceGetName(self._handle(index))
+
+    def get_memory_info(self, index: int) -> Tuple[int, int, int]:
+        memory = self.nvml.nvmlDeviceGetMemoryInfo(self._handle(index))
+        return memory.total, memory.used, memory.free
+
+    def get_utilization(self, index: int) -> int:
+        return self.nvml.nvmlDeviceGetUtilizationRates(self._handle(index)).gpu
+
+    def get_cpu_affinity(self) -> Dict[str, List[int]]:
+        # NVML returns the ideal CPU set as a bitmask in 64-bit words
+        words = ((os.cpu_count() or 1) + 63) // 64
+        affinity = {}
+        for index in range(self.get_device_count()):
+            handle = self._handle(index)
+            bus_id = self.nvml.nvmlDeviceGetPciInfo(handle).busId
+            if isinstance(bus_id, bytes):
+                bus_id = bus_id.decode()
+            # NVML uses an 8-digit PCI domain, sysfs a 4-digit one
+            address = bus_id.lower()[-12:]
+            mask = self.nvml.nvmlDeviceGetCpuAffinity(handle, words)
+            affinity[address] = [
+                word_index * 64 + bit
+                for word_index, word in enumerate(mask)
+                for bit in range(64)
+                if word >> bit & 1
+            ]
+        return affinity
+
+
+class AMDBackend(GPUBackend):
+    """AMD GPUs via pyrsmi (ROCm SMI)"""
+
+    name = "amd"
+    device_type = "amd"
+
+    def __init__(self, is_wsl: bool = False):
+        # rocm-smi is not usable under WSL
+        self.is_wsl = is_wsl
+        self.rocml = None
+
+    def initialize(self) -> None:
+        self.rocml = importlib.import_module("pyrsmi.rocml")
+        if not self.is_wsl:
+            self.rocml.smi_initialize()
+
+    def get_runtime_version(self) -> str:
+        import torch
+        return torch.version.hip or "n/a"
+
+    def get_device_count(self) -> int:
+        if self.is_wsl:
+            return 0
+        return self.rocml.smi_get_device_count()
+
+    def get_device_name(self, index: int) -> str:
+        return self.rocml.smi_get_device_name(index)
+
+    def get_memory_info(self, index: int) -> Tuple[int, int, int]:
+        total = self.rocml.smi_get_device_memory_total(index)
+        used = self.rocml.smi_get_device_memory_used(index)
+        return total, used, total - used
+
+    def get_utilization(self, index: int) -> int:
+        return self.rocml.smi_get_device_utilization(index)
+
+
+class SysfsAMDBackend(GPUBackend):
+    """
+    AMD GPUs via the amdgpu driver's sysfs attributes (no ROCm SMI needed)
+
+    Reads ``gpu_busy_percent``, ``mem_info_vram_used`` and
+    ``mem_info_vram_total`` under ``<root>/card*/device``. The attribute
+    files are opened once and re-read with pread, so a sample costs two
+    small reads per device and no path lookups. A card without one of the
+    attributes reports that reading as MISSING, and a file that stops
+    reading (ENODEV after a GPU reset) is reopened once before failing.
+    """
+
+    name = "amd_sysfs"
+    device_type = "amd"
+
+    # PCI vendor ID of AMD/ATI
+    AMD_VENDOR_ID = "0x1002"
+    CARD_PATTERN = re.compile(r"card\d+$")
+    # Attributes re-read on every sample, in the order of the cached handles
+    SAMPLED_ATTRIBUTES = ("mem_info_vram_used", "gpu_busy_percent")
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.amd_sysfs_root
+        self.cards: List[str] = []
+        self._names: List[str] = []
+        self._totals: List[int] = []
+        # (vram used, busy percent) paths and open files per device; None
+        # when the card has no such attribute or the file is closed
+        self._paths: List[Tuple[Optional[str], ...]] = []
+        self._fds: List[List[Optional[int]]] = []
+
+    @classmethod
+    def find_cards(cls, root: Optional[str] = None) -> List[str]:
+        """Get the device directories of AMD GPUs with VRAM reporting, in card order"""
+        root = root or settings.amd_sysfs_root
+        try:
+            entries = os.listdir(root)
+        except OSError:
+            return []
+
+        cards = []
+        for entry in sorted((name for name in entries if cls.CARD_PATTERN.match(name)), key=lambda name: int(name[4:])):
+            device = os.path.join(root, entry, "device")
+            if _read_text(os.path.join(device, "vendor")) == cls.AMD_VENDOR_ID and \
+                    (_read_text(os.path.join(device, "mem_info_vram_total")) or "").isdigit():
+                cards.append(device)
+        return cards
+
+    def initialize(self) -> None:
+        self.close()
+        self.cards = self.find_cards(self.root)
+        if not self.cards:
+            raise GPUBackendError(f"No AMD GPUs found under {self.root}")
+
+        for device in self.cards:
+            name = _read_text(os.path.join(device, "product_name"))
+            self._names.append(name or f"AMD GPU [{_read_text(os.path.join(device, 'device')) or 'unknown'}]")
+            self._totals.append(int(_read_text(os.path.join(device, "mem_info_vram_total"))))
+            paths = tuple(
+                path if os.path.exists(path) else None
+                for path in (os.path.join(device, attribute) for attribute in self.SAMPLED_ATTRIBUTES)
+            )
+            self._paths.append(paths)
+            self._fds.append([None if path is None else os.open(path, os.O_RDONLY) for path in paths])
+
+    def get_runtime_version(self) -> str:
+        import torch
+        return torch.version.hip or "n/a"
+
+    def _read_attribute(self, index: int, slot: int) -> Any:
+        """
+        Re-read a sampled attribute of a device from the start
+
+        Returns:
+            int: The reading, or MISSING if the card has no such attribute
+
+        Raises:
+            GPUBackendError: If the attribute cannot be read, even after reopening it
+        """
+        fds = self._fds[index]
+        fd = fds[slot]
+        if fd is not None:
+            try:
+                return int(os.pread(fd, 32, 0))
+            except ValueError as e:
+                raise GPUBackendError(f"Error reading AMD GPU sysfs attribute: {e}") from e
+            except OSError:
+                # The handle went stale (ENODEV after a GPU reset or hot-unplug)
+                fds[slot] = None
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+        path = self._paths[index][slot]
+        if path is None:
+            return MISSING
+        try:
+            fds[slot] = os.open(path, os.O_RDONLY)
+            return int(os.pread(fds[slot], 32, 0))
+        except (OSError, ValueError) as e:
+            raise GPUBackendError(f"Error reading AMD GPU sysfs attribute: {e}") from e
+
+    def get_device_count(self) -> int:
+        return len(self.cards)
+
+    def get_device_name(self, index: int) -> str:
+        return self._names[index]
+
+    def get_memory_info(self, index: int) -> Tuple[int, int, int]:
+        total = self._totals[index]
+        used = self._read_attribute(index, 0)
+        return total, used, total - used if present(used) else MISSING
+
+    def get_utilization(self, index: int) -> int:
+        return self._read_attribute(index, 1)
+
+    def collect_devices(self) -> List[Tuple[str, int, int, int, int]]:
+        read_attribute = self._read_attribute
+        devices = []
+        for index, (name, total) in enumerate(zip(self._names, self._totals)):
+            used = read_attribute(index, 0)
+            free = total - used if present(used) else MISSING
+            devices.append((name, total, used, free, read_attribute(index, 1)))
+        return devices
+
+    def close(self) -> None:
+        """Close the cached attribute files"""
+        for fds in self._fds:
+            for fd in fds:
+                if fd is not None:
+                    os.close(fd)
+        self.cards, self._names, self._totals, self._paths, self._fds = [], [], [], [], []
+
+
+def _read_text(path: str) -> Optional[str]:
+    """Read a small text file, or None if it is missing"""
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class SimulatedGPUBackend(GPUBackend):
+    """
+    Deterministic simulated GPUs for benchmarks and tests
+
+    Readings are a pure function of the device index and how many times the
+    device has been sampled, so two backends built with the same arguments
+    produce identical sequences. ``latency`` is added to every call, like a
+    real per-call NVML round trip, and ``error_rate`` makes calls fail with
+    a seeded, reproducible pattern. ``hang_rate`` and ``hanging_devices``
+    make calls block for ``hang_seconds``, like a GPU that fell off the bus.
+    """
+
+    name = "simulated"
+    device_type = "simulated"
+
+    def __init__(
+        self,
+        device_count: int = 8,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        total_memory: int = 80 * 1024 ** 3,
+        device_name: str = "Polaris Simulated GPU",
+        failing_devices: Optional[List[int]] = None,
+        hang_rate: float = 0.0,
+        hang_seconds: float = 60.0,
+        hanging_devices: Optional[List[int]] = None,
+    ):
+        self.device_count = device_count
+        self.latency = latency
+        self.error_rate = error_rate
+        self.total_memory = total_memory
+        self.device_name = device_name
+        self.failing_devices = set(failing_devices or [])
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.hanging_devices = set(hanging_devices or [])
+        self.calls = 0
+        self._samples = [0] * device_count
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _call(self, index: Optional[int] = None) -> None:
+        """Account for one vendor call: latency, then hang and error injection"""
+        with self._lock:
+            self.calls += 1
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            hang = self.hang_rate > 0 and self._random.random() < self.hang_rate
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if hang or (index is not None and index in self.hanging_devices):
+            time.sleep(self.hang_seconds)
+        if fail or (index is not None and index in self.failing_devices):
+            target = "device count" if index is None else f"device {index}"
+            raise GPUBackendError(f"Simulated GPU error on {target}")
+        if index is not None and not 0 <= index < self.device_count:
+            raise GPUBackendError(f"Invalid simulated GPU index {index}")
+
+    def get_runtime_version(self) -> str:
+        return "simulated"
+
+    def get_device_count(self) -> int:
+        self._call()
+        return self.device_count
+
+    def get_device_name(self, index: int) -> str:
+        self._call(index)
+        return f"{self.device_name} {index}"
+
+    def get_memory_info(self, index: int) -> Tuple[int, int, int]:
+        self._call(index)
+        sample = self._samples[index]
+        used = self.total_memory * ((index * 7 + sample * 3) % 90 + 5) // 100
+        return self.total_memory, used, self.total_memory - used
+
+    def get_utilization(self, index: int) -> int:
+        self._call(index)
+        with self._lock:
+            sample = self._samples[index]
+            self._samples[index] += 1
+        return (index * 37 + sample * 11) % 101
+
+
+def create_gpu_backend(
+    is_wsl: bool = False,
+    backend: Optional[str] = None,
+    isolated: Optional[bool] = None,
+) -> Optional[GPUBackend]:
+    """
+    Create and initialize the configured GPU backend
+
+    Args:
+        is_wsl: Whether we are running under WSL
+        backend: Backend name (auto, nvidia, amd, amd_sysfs, simulated, none); defaults to settings
+        isolated: Run the backend in a supervised GPU worker process; defaults to settings
+
+    Returns:
+        GPUBackend: Initialized backend, or None when no GPU library is usable
+    """
+    backend = (backend or settings.gpu_backend).lower()
+    isolated = settings.gpu_worker_enabled if isolated is None else isolated
+
+    if backend == "none" or not settings.enable_gpu_detection:
+        return None
+
+    candidates = []
+    if backend in ("auto", "nvidia") and HAS_NVIDIA:
+        candidates.append(NvidiaBackend())
+    if backend in ("auto", "amd", "amd_sysfs") and sys.platform.startswith("linux") and SysfsAMDBackend.find_cards():
+        candidates.append(SysfsAMDBackend())
+    if backend in ("auto", "amd") and HAS_AMD:
+        candidates.append(AMDBackend(is_wsl))
+    if backend != "simulated" and not candidates:
+        return None
+
+    if isolated:
+        # Imported here because the worker module builds on this one
+        from app.core.gpu_worker import IsolatedGPUBackend
+        isolated_backend = IsolatedGPUBackend(functools.partial(create_gpu_backend, is_wsl, backend, False))
+        try:
+            if isolated_backend.start():
+                return isolated_backend
+        except GPUBackendError as e:
+            print(f"⚠️ Error starting GPU worker process: {e}")
+        isolated_backend.close()
+        return None
+
+    if backend == "simulated":
+        return SimulatedGPUBackend(
+            device_count=settings.simulated_gpu_count,
+            latency=settings.simulated_gpu_latency,
+            error_rate=settings.simulated_gpu_error_rate,
+            seed=settings.simulated_gpu_seed,
+            hang_rate=settings.simulated_gpu_hang_rate,
+            hang_seconds=settings.simulated_gpu_hang_seconds,
+        )
+
+    for candidate in candidates:
+        try:
+            candidate.initialize()
+            return candidate
+        except Exception as e:
+            print(f"⚠️ Error initializing {candidate.name.upper()} GPU backend: {e}")
+
+    return None
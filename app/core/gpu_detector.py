@@ -4,70 +4,60 @@
 
 from typing import Any, Dict, List, Optional
 
-import torch
-
+from app.core.gpu_backends import (HAS_AMD, HAS_NVIDIA, GPUBackend,
+                                   create_gpu_backend)
+from app.core.gpu_worker import GPUWorkerError
+from app.core.instrumentation import instrumented
+from app.core.records import GPURecord, fallback_records, gpu_records_to_dicts
 from app.utils.system_utils import bytes_to_string, is_wsl
 
-# GPU Detection Libraries
-try:
-    from pynvml import (nvmlDeviceGetCount, nvmlDeviceGetHandleByIndex,
-                        nvmlDeviceGetMemoryInfo, nvmlDeviceGetName,
-                        nvmlDeviceGetUtilizationRates, nvmlInit)
-    HAS_NVIDIA = True
-except Exception:
-    HAS_NVIDIA = False
-
-try:
-    from pyrsmi import rocml
-    HAS_AMD = True
-except Exception:
-    HAS_AMD = False
-
 
 class GPUDetector:
     """GPU detection and monitoring class"""
     
-    def __init__(self):
+    def __init__(self, backend: Optional[GPUBackend] = None):
         self.is_wsl = is_wsl()
+        self.backend = backend if backend is not None else create_gpu_backend(self.is_wsl)
+        self._last_records: List[GPURecord] = []
+        # Failed readings since the last good one; the error is printed
+        # when readings start failing and again when they recover
+        self._failures = 0
         self.device_info = self._initialize_gpu()
     
     def _initialize_gpu(self) -> Dict[str, Any]:
         """Initialize GPU detection and get device information"""
+        # PyTorch is the heaviest import, so load it only when a detector is built
+        import torch
+        
         device_info = {
             "device": "cpu",
             "device_type": "cpu",
             "cuda_version": "n/a",
             "has_nvidia": HAS_NVIDIA,
             "has_amd": HAS_AMD,
+            "gpu_backend": self.backend.name if self.backend else "none",
             "pytorch_version": torch.__version__
         }
         
         print(f"🔥 PyTorch version: {torch.__version__}")
         
+        # Simulated GPUs stand in for CUDA devices regardless of PyTorch
+        if self.backend is not None and self.backend.name == "simulated":
+            device_info["device"] = "cuda"
+            device_info["device_type"] = self.backend.device_type
+            device_info["cuda_version"] = self.backend.get_runtime_version()
+            print(f"🧪 Using simulated GPU backend with {self.backend.device_count} devices")
+            return device_info
+        
         # Determine which device to use (cuda/mps/cpu)
         if torch.cuda.is_available():
             device_info["device"] = "cuda"
             
-            if HAS_NVIDIA:
-                try:
-                    nvmlInit()
-                    device_info["cuda_version"] = torch.version.cuda
-                    device_info["device_type"] = "nvidia"
-                    pytorch_device = "CUDA"
-                    print(f"🌟 PyTorch using {pytorch_device}, version {device_info['cuda_version']}")
-                except Exception as e:
-                    print(f"⚠️ Error initializing NVIDIA GPU: {e}")
-                    
-            elif HAS_AMD:
-                try:
-                    if not self.is_wsl:
-                        rocml.smi_initialize()
-                    device_info["device_type"] = "amd"
-                    device_info["cuda_version"] = torch.version.hip
-                    pytorch_device = "ROCm"
-                    print(f"🌟 PyTorch using {pytorch_device}, version {device_info['cuda_version']}")
-                except Exception as e:
-                    print(f"⚠️ Error initializing AMD GPU: {e}")
+            if self.backend is not None:
+                device_info["device_type"] = self.backend.device_type
+                device_info["cuda_version"] = self.backend.get_runtime_version()
+                pytorch_device = "ROCm" if self.backend.device_type == "amd" else "CUDA"
+                print(f"🌟 PyTorch using {pytorch_device}, version {device_info['cuda_version']}")
                     
         elif torch.backends.mps.is_available():
             device_info["device"] = "mps"
@@ -76,72 +66,37 @@ class GPUDetector:
         
         return device_info
     
-    def get_gpu_info(self) -> List[Dict[str, Any]]:
-        """Get detailed GPU information for all detected GPUs"""
-        gpu_list = []
+    @instrumented("gpu_detector.get_gpu_records")
+    def get_gpu_records(self) -> List[GPURecord]:
+        """Get a reading of every detected GPU"""
+        if self.backend is None:
+            return []
         
         try:
-            # Determine device count
-            if HAS_AMD and not self.is_wsl:
-                device_count = rocml.smi_get_device_count()
-            elif HAS_NVIDIA:
-                device_count = nvmlDeviceGetCount()
-            else:
-                return []
-
-            for i in range(device_count):
-                info = {}
-                
-                # Get device handle
-                if HAS_AMD and not self.is_wsl:
-                    handle = rocml.smi_get_device_id(i)
-                elif HAS_NVIDIA:
-                    handle = nvmlDeviceGetHandleByIndex(i)
-                else:
-                    continue
-
-                # Get device name
-                if HAS_NVIDIA:
-                    device_name = nvmlDeviceGetName(handle)
-                elif HAS_AMD and not self.is_wsl:
-                    device_name = rocml.smi_get_device_name(i)
-                else:
-                    continue
-
+            records = [
                 # Handle byte string conversion
-                device_name = bytes_to_string(device_name)
-                info["name"] = device_name
-
-                # Get memory and utilization info
-                if HAS_NVIDIA:
-                    memory = nvmlDeviceGetMemoryInfo(handle)
-                    info["total_memory"] = memory.total
-                    info["free_memory"] = memory.free
-                    info["used_memory"] = memory.used
-
-                    utilization = nvmlDeviceGetUtilizationRates(handle)
-                    info["utilization"] = utilization.gpu
-                    
-                elif HAS_AMD and not self.is_wsl:
-                    info["total_memory"] = rocml.smi_get_device_memory_total(i)
-                    info["used_memory"] = rocml.smi_get_device_memory_used(i)
-                    info["free_memory"] = info["total_memory"] - info["used_memory"]
-                    info["utilization"] = rocml.smi_get_device_utilization(i)
-
-                gpu_list.append(info)
+                GPURecord(bytes_to_string(name), total, free, used, utilization)
+                for name, total, used, free, utilization in self.backend.collect_devices()
+            ]
+            self._last_records = records
+            if self._failures:
+                print(f"✅ GPU readings recovered after {self._failures} failed readings")
+                self._failures = 0
+            return records
                 
         except Exception as e:
-            print(f"⚠️ Error getting GPU info: {e}")
+            if not self._failures:
+                print(f"⚠️ Error getting GPU info: {e} (not repeated until readings recover)")
+            self._failures += 1
+            # A hung or crashed GPU worker keeps serving the last known state
+            if isinstance(e, GPUWorkerError) and self._last_records:
+                return [record.as_stale() for record in self._last_records]
             # Return CPU fallback
-            gpu_list.append({
-                "name": "cpu",
-                "total_memory": "n/a",
-                "free_memory": "n/a",
-                "used_memory": "n/a",
-                "utilization": "n/a",
-            })
-
-        return gpu_list
+            return fallback_records()
+    
+    def get_gpu_info(self) -> List[Dict[str, Any]]:
+        """Get detailed GPU information for all detected GPUs"""
+        return gpu_records_to_dicts(self.get_gpu_records())
     
     def get_device_info(self) -> Dict[str, Any]:
         """Get current device information"""
@@ -149,25 +104,9 @@ class GPUDetector:
     
     def get_gpu_summary(self) -> List[Dict[str, Any]]:
         """Get summarized GPU information for realtime monitoring"""
-        gpu_info = self.get_gpu_info()
-        summary = []
-        
-        for gpu in gpu_info:
-            gpu_summary = {
-                "name": gpu["name"],
-                "utilization": gpu["utilization"],
-            }
-            
-            # Calculate memory usage percentage
-            if (gpu["total_memory"] != "n/a" and 
-                gpu["used_memory"] != "n/a" and 
-                gpu["total_memory"] > 0):
-                gpu_summary["memory_used_percent"] = round(
-                    (gpu["used_memory"] / gpu["total_memory"]) * 100, 2
-                )
-            else:
-                gpu_summary["memory_used_percent"] = "n/a"
-                
-            summary.append(gpu_summary)
-        
-        return summary 
\ No newline at end of file
+        return self.summarize_gpu_info(self.get_gpu_records())
+    
+    @staticmethod
+    def summarize_gpu_info(records: List[GPURecord]) -> List[Dict[str, Any]]:
+        """Summarize already collected GPU readings for realtime monitoring"""
+        return [record.to_summary() for record in records]
@@ -0,0 +1,294 @@
+"""
+🌟 Polaris System Detection API - GPU Worker Process
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.gpu_backends import (AMDBackend, GPUBackend, GPUBackendError,
+                                   NvidiaBackend, SimulatedGPUBackend,
+                                   SysfsAMDBackend)
+
+# Backend calls the worker serves
+WORKER_METHODS = frozenset({
+    "get_device_count", "get_device_name", "get_memory_info", "get_utilization", "collect_devices",
+    "get_cpu_affinity",
+})
+
+# Local (never initialized) backends used for the PyTorch runtime version
+BACKEND_TYPES = {backend.name: backend for backend in (
+    NvidiaBackend, AMDBackend, SysfsAMDBackend, SimulatedGPUBackend,
+)}
+
+
+class GPUWorkerError(GPUBackendError):
+    """Raised when the GPU worker process is unavailable"""
+
+
+class GPUWorkerTimeoutError(GPUWorkerError):
+    """Raised when the GPU worker does not answer within its deadline"""
+
+    def __init__(self, method: str, timeout: float):
+        self.method = method
+        self.timeout = timeout
+        super().__init__(f"GPU worker call '{method}' did not finish within {timeout:.1f}s")
+
+
+def run_gpu_worker(connection, factory: Callable[[], Optional[GPUBackend]], parent_pid: int) -> None:
+    """
+    Serve GPU backend calls over a pipe
+
+    Runs in the GPU worker process and exits when the pipe closes or the
+    parent process goes away.
+    """
+    try:
+        backend = factory()
+    except Exception as e:
+        connection.send(("error", f"{type(e).__name__}: {e}"))
+        return
+
+    if backend is None:
+        connection.send(("ready", None))
+        return
+    connection.send(("ready", (backend.name, backend.device_type, getattr(backend, "device_count", None))))
+
+    while True:
+        try:
+            if not connection.poll(1.0):
+                if os.getppid() != parent_pid:
+                    return
+                continue
+            method, args = connection.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            return
+
+        if method not in WORKER_METHODS:
+            connection.send(("error", f"Unsupported GPU worker call '{method}'"))
+            continue
+        try:
+            connection.send(("ok", getattr(backend, method)(*args)))
+        except Exception as e:
+            connection.send(("error", str(e)))
+
+
+class IsolatedGPUBackend(GPUBackend):
+    """
+    Run a GPU backend in a supervised child process
+
+    Vendor libraries can block for tens of seconds when a GPU falls off
+    the bus. Every call goes to the worker process with a deadline; a
+    worker that misses it is killed and restarted in the background, with
+    exponential backoff while it keeps failing. Callers get a
+    GPUWorkerError right away instead of a hung thread.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Optional[GPUBackend]],
+        call_timeout: Optional[float] = None,
+        start_timeout: Optional[float] = None,
+        restart_backoff: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+    ):
+        """
+        Args:
+            factory: Picklable callable returning an initialized backend (or None), run in the worker
+            call_timeout: Deadline of a single call in seconds
+            start_timeout: Deadline for the worker to start and initialize the backend
+            restart_backoff: Initial wait before restarting a failed worker
+            max_backoff: Longest wait before restarting a failed worker
+        """
+        self.factory = factory
+        self.call_timeout = call_timeout or settings.gpu_call_timeout
+        self.start_timeout = start_timeout or settings.gpu_worker_start_timeout
+        self.restart_backoff = restart_backoff or settings.gpu_worker_restart_backoff
+        self.max_backoff = max_backoff or settings.gpu_worker_max_backoff
+        self.name = "none"
+        self.device_type = "cpu"
+        self.device_count: Optional[int] = None
+        self.process: Optional[multiprocessing.Process] = None
+        self.connection = None
+        self.stats = {"starts": 0, "restarts": 0, "calls": 0, "timeouts": 0, "crashes": 0, "errors": 0}
+        self._backoff = self.restart_backoff
+        self._retry_at = 0.0
+        self._restarting = False
+        # Restarts failed in a row; only the first error and the recovery are printed
+        self._failed_restarts = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """
+        Start the worker and take on the identity of its backend
+
+        Returns:
+            bool: False when the worker found no usable GPU backend
+        """
+        process, connection, identity = self._spawn()
+        if identity is None:
+            return False
+        with self._lock:
+            self.process, self.connection = process, connection
+        self.name, self.device_type, self.device_count = identity
+        return True
+
+    def initialize(self) -> None:
+        if not self.start():
+            raise GPUBackendError("No GPU backend available in the GPU worker")
+
+    def _spawn(self) -> Tuple[multiprocessing.Process, Any, Optional[Tuple[str, str, Optional[int]]]]:
+        """Spawn a worker and wait for its backend to initialize"""
+        context = multiprocessing.get_context("spawn")
+        connection, child_connection = context.Pipe()
+        process = context.Process(
+            target=run_gpu_worker,
+            args=(child_connection, self.factory, os.getpid()),
+            name="polaris-gpu-worker",
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        self.stats["starts"] += 1
+
+        try:
+            if not connection.poll(self.start_timeout):
+                raise GPUWorkerTimeoutError("start", self.start_timeout)
+            status, value = connection.recv()
+        except (EOFError, OSError):
+            self._kill(process, connection)
+            raise GPUWorkerError("GPU worker exited during startup") from None
+        except GPUWorkerTimeoutError:
+            self._kill(process, connection)
+            raise
+
+        if status != "ready" or value is None:
+            self._kill(process, connection)
+            if status != "ready":
+                raise GPUBackendError(value)
+        return process, connection, value
+
+    def _restart(self) -> None:
+        """Replace a failed worker (runs in the background so callers never wait on it)"""
+        try:
+            process, connection, identity = self._spawn()
+            if identity is None:
+                raise GPUWorkerError("GPU backend is no longer available")
+        except GPUBackendError as e:
+            with self._lock:
+                self._restarting = False
+                if not self._closed:
+                    if not self._failed_restarts:
+                        print(f"⚠️ Error restarting GPU worker: {e} (retrying with backoff, not repeated)")
+                    self._failed_restarts += 1
+                    self._fail("errors")
+            return
+
+        with self._lock:
+            if self._closed:
+                self._kill(process, connection)
+                return
+            self.process, self.connection = process, connection
+            self._restarting = False
+            self.stats["restarts"] += 1
+            if self._failed_restarts:
+                print(f"✅ GPU worker restarted after {self._failed_restarts} failed attempts")
+                self._failed_restarts = 0
+
+    @staticmethod
+    def _kill(process: multiprocessing.Process, connection) -> None:
+        """Stop a worker without waiting on a process stuck in the kernel"""
+        connection.close()
+        process.terminate()
+        process.join(0.5)
+        if process.is_alive():
+            process.kill()
+            process.join(0.5)
+
+    def _fail(self, counter: str) -> None:
+        """Drop the current worker and schedule its restart"""
+        self.stats[counter] += 1
+        if self.process is not None:
+            self._kill(self.process, self.connection)
+        self.process = self.connection = None
+        self._retry_at = time.monotonic() + self._backoff
+        self._backoff = min(self._backoff * 2, self.max_backoff)
+
+    def _call(self, method: str, *args: Any) -> Any:
+        """Run one backend call in the worker within the call deadline"""
+        # A call stuck on a hung worker holds the lock until its deadline
+        if not self._lock.acquire(timeout=self.call_timeout):
+            raise GPUWorkerTimeoutError(method, self.call_timeout)
+        try:
+            if self._closed:
+                raise GPUWorkerError("GPU worker is closed")
+            if self.connection is None:
+                if not self._restarting and time.monotonic() >= self._retry_at:
+                    self._restarting = True
+                    threading.Thread(target=self._restart, name="polaris-gpu-restart", daemon=True).start()
+                raise GPUWorkerError("GPU worker is restarting")
+
+            self.stats["calls"] += 1
+            try:
+                self.connection.send((method, args))
+                if not self.connection.poll(self.call_timeout):
+                    self._fail("timeouts")
+                    raise GPUWorkerTimeoutError(method, self.call_timeout)
+                status, value = self.connection.recv()
+            except (EOFError, OSError):
+                self._fail("crashes")
+                raise GPUWorkerError("GPU worker exited") from None
+
+            # A healthy answer resets the restart backoff
+            self._backoff = self.restart_backoff
+            if status != "ok":
+                raise GPUBackendError(value)
+            return value
+        finally:
+            self._lock.release()
+
+    def get_runtime_version(self) -> str:
+        backend = BACKEND_TYPES.get(self.name)
+        return backend().get_runtime_version() if backend is not None else "n/a"
+
+    def get_device_count(self) -> int:
+        return self._call("get_device_count")
+
+    def get_device_name(self, index: int) -> str:
+        return self._call("get_device_name", index)
+
+    def get_memory_info(self, index: int) -> Tuple[int, int, int]:
+        return self._call("get_memory_info", index)
+
+    def get_utilization(self, index: int) -> int:
+        return self._call("get_utilization", index)
+
+    def get_cpu_affinity(self) -> Dict[str, List[int]]:
+        return self._call("get_cpu_affinity")
+
+    def collect_devices(self) -> List[Tuple[str, int, int, int, int]]:
+        # One round trip for every device
+        return self._call("collect_devices")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get worker restarts, call outcomes and the current backoff"""
+        process = self.process
+        return {
+            "backend": self.name,
+            "pid": process.pid if process is not None else None,
+            "alive": process is not None and process.is_alive(),
+            "call_timeout": self.call_timeout,
+            **self.stats,
+            "restart_in": round(max(self._retry_at - time.monotonic(), 0.0), 3) if process is None else 0.0,
+        }
+
+    def close(self) -> None:
+        """Stop the worker"""
+        with self._lock:
+            self._closed = True
+            if self.process is not None:
+                self._kill(self.process, self.connection)
+            self.process = self.connection = None
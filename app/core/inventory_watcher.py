@@ -0,0 +1,157 @@
+"""
+🌟 Polaris System Detection API - Event-Invalidated Static Inventory Cache
+"""
+
+import select
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.config.settings import settings
+
+# Inventories and the change signal that invalidates each
+MOUNTS = "mounts"
+INTERFACES = "interfaces"
+
+# rtnetlink multicast groups: link state and IPv4/IPv6 address changes
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+
+class InventoryWatcher:
+    """
+    Cache of slow-changing inventories, invalidated by kernel change signals
+
+    Mount tables and network interfaces change maybe once a day, yet
+    listing them costs far more than the rest of a detection call. Cached
+    lists are dropped when the kernel signals a change: ``/proc/self/mountinfo``
+    polls with POLLPRI after a mount or unmount, and an rtnetlink socket
+    receives a message on link and address changes. Signals are checked
+    with a zero-timeout poll() on each lookup, so no thread is needed.
+    Everything is also re-listed every ``refresh_interval`` seconds, and
+    inventories without a signal (e.g. off Linux) after ``unwatched_max_age``.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: Optional[float] = None,
+        unwatched_max_age: Optional[float] = None,
+        mountinfo_path: str = "/proc/self/mountinfo",
+    ):
+        self.refresh_interval = refresh_interval or settings.inventory_refresh_interval
+        self.unwatched_max_age = unwatched_max_age or settings.inventory_unwatched_max_age
+        self.mountinfo_path = mountinfo_path
+        self.stats = {"hits": 0, "loads": 0, "invalidations": 0}
+        self._values: Dict[str, Any] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._watches: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._poller = None
+        self._mountinfo = None
+        self._netlink: Optional[socket.socket] = None
+        self._opened = False
+
+    def _open_watches(self) -> None:
+        """Open the change signals this platform supports"""
+        self._opened = True
+        if not hasattr(select, "poll"):
+            return
+        self._poller = select.poll()
+        try:
+            self._mountinfo = open(self.mountinfo_path, "rb")
+            self._poller.register(self._mountinfo, select.POLLPRI | select.POLLERR)
+            self._watches[self._mountinfo.fileno()] = MOUNTS
+        except OSError:
+            self._mountinfo = None
+        if hasattr(socket, "AF_NETLINK"):
+            try:
+                self._netlink = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+                self._netlink.setblocking(False)
+                self._netlink.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+                self._poller.register(self._netlink, select.POLLIN)
+                self._watches[self._netlink.fileno()] = INTERFACES
+            except OSError:
+                if self._netlink is not None:
+                    self._netlink.close()
+                self._netlink = None
+
+    def _drain_netlink(self) -> None:
+        """Read every pending rtnetlink message; only their arrival matters"""
+        while True:
+            try:
+                self._netlink.recv(65536)
+            except BlockingIOError:
+                return
+            except OSError:
+                # ENOBUFS: messages were lost, which still means something changed
+                return
+
+    def _check_signals(self) -> None:
+        """Drop the inventories whose change signal fired (zero-timeout poll)"""
+        if not self._watches:
+            return
+        for fd, _ in self._poller.poll(0):
+            kind = self._watches[fd]
+            if kind == INTERFACES:
+                self._drain_netlink()
+            # The mountinfo event is consumed by the poll itself
+            if self._values.pop(kind, None) is not None:
+                self.stats["invalidations"] += 1
+
+    def watched(self, kind: str) -> bool:
+        """Whether a kernel change signal invalidates an inventory"""
+        return kind in self._watches.values()
+
+    def get(self, kind: str, loader: Callable[[], Any]) -> Any:
+        """
+        Get an inventory, listing it with ``loader`` only after a change signal or when old
+
+        Args:
+            kind: MOUNTS or INTERFACES
+            loader: Blocking function that lists the inventory
+
+        Returns:
+            Any: The cached or freshly listed inventory (callers must not modify it)
+        """
+        with self._lock:
+            if not self._opened:
+                self._open_watches()
+            self._check_signals()
+            max_age = self.refresh_interval if self.watched(kind) else self.unwatched_max_age
+            now = time.monotonic()
+            if kind in self._values and now - self._loaded_at[kind] < max_age:
+                self.stats["hits"] += 1
+                return self._values[kind]
+
+            value = loader()
+            self._values[kind] = value
+            self._loaded_at[kind] = now
+            self.stats["loads"] += 1
+            return value
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        """Drop one inventory, or all of them"""
+        with self._lock:
+            if kind is None:
+                self._values.clear()
+            else:
+                self._values.pop(kind, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/load counters and the signals in use"""
+        return {
+            **self.stats,
+            "watched": sorted(set(self._watches.values())),
+            "cached": sorted(self._values),
+        }
+
+    def close(self) -> None:
+        """Close the change signal file and socket"""
+        with self._lock:
+            if self._mountinfo is not None:
+                self._mountinfo.close()
+            if self._netlink is not None:
+                self._netlink.close()
+            self._watches.clear()
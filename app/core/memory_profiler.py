@@ -0,0 +1,260 @@
+"""
+🌟 Polaris System Detection API - Agent Memory Profiling and Growth Monitoring
+"""
+
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import psutil
+
+from app.config.settings import settings
+
+# Agent memory readings kept in the history, and the ones checked for growth
+AGENT_METRICS = ("rss", "blocks", "objects")
+GROWTH_METRICS = ("rss", "objects")
+
+# Allocations made by tracemalloc itself and by the import machinery
+IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryProfilingError(Exception):
+    """Raised when memory snapshots are requested while profiling is disabled, or for an unknown snapshot"""
+
+
+class MemoryProfiler:
+    """
+    Opt-in tracemalloc snapshots of this process, diffed by allocation site
+
+    tracemalloc slows every allocation down and only sees allocations made
+    after it starts, so it runs only with ``memory_profiling_enabled`` and
+    is started with the manager. Every ``diff`` takes a numbered snapshot
+    and compares it with an earlier one (the latest ``max_snapshots`` are
+    kept), listing the allocation sites whose live memory grew the most.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        frames: Optional[int] = None,
+        max_snapshots: Optional[int] = None,
+    ):
+        self.enabled = settings.memory_profiling_enabled if enabled is None else enabled
+        self.frames = frames or settings.memory_profiling_frames
+        self.max_snapshots = max_snapshots or settings.memory_profiling_max_snapshots
+        self.snapshots: "OrderedDict[int, Tuple[float, tracemalloc.Snapshot]]" = OrderedDict()
+        self.sequence = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> "MemoryProfiler":
+        """Start tracing allocations when profiling is enabled"""
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        return self
+
+    def diff(self, since: Optional[int] = None, group_by: str = "lineno", limit: int = 25) -> Dict[str, Any]:
+        """
+        Take a snapshot and compare it with an earlier one
+
+        Args:
+            since: Snapshot number to compare with (default: the oldest kept;
+                the first snapshot is compared with nothing)
+            group_by: "lineno", "filename" or "traceback"
+            limit: Largest number of allocation sites to list
+
+        Returns:
+            dict: Snapshot numbers and times, traced memory, totals and the
+            ``top`` sites by growth of live memory
+
+        Raises:
+            MemoryProfilingError: If profiling is disabled or ``since`` is not kept
+        """
+        if not self.enabled:
+            raise MemoryProfilingError("Memory profiling is disabled (POLARIS_MEMORY_PROFILING_ENABLED=false)")
+
+        with self._lock:
+            if since is None:
+                since = next(iter(self.snapshots), None)
+            elif since not in self.snapshots:
+                raise MemoryProfilingError(f"Snapshot {since} is not kept (kept: {list(self.snapshots)})")
+            base_time, base = self.snapshots[since] if since is not None else (None, None)
+
+            now = time.time()
+            snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED_TRACES)
+            self.sequence += 1
+            self.snapshots[self.sequence] = (now, snapshot)
+            while len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+
+        if base is None:
+            base = tracemalloc.Snapshot([], self.frames)
+        stats = snapshot.compare_to(base, group_by)
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            "snapshot": self.sequence,
+            "timestamp": now,
+            "since": since,
+            "since_timestamp": base_time,
+            "traced_bytes": traced,
+            "peak_bytes": peak,
+            "size_diff": sum(stat.size_diff for stat in stats),
+            "count_diff": sum(stat.count_diff for stat in stats),
+            "top": [self._site(stat, group_by) for stat in stats[:limit]],
+        }
+
+    @staticmethod
+    def _site(stat: tracemalloc.StatisticDiff, group_by: str) -> Dict[str, Any]:
+        """Response form of one allocation site (frames are oldest first)"""
+        frame = stat.traceback[-1]
+        site = {
+            "site": frame.filename if group_by == "filename" else f"{frame.filename}:{frame.lineno}",
+            "size": stat.size,
+            "size_diff": stat.size_diff,
+            "count": stat.count,
+            "count_diff": stat.count_diff,
+        }
+        if group_by == "traceback":
+            site["traceback"] = [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+        return site
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get whether allocations are traced and the snapshots kept"""
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            "enabled": self.enabled,
+            "tracing": tracemalloc.is_tracing(),
+            "traced_bytes": traced,
+            "peak_bytes": peak,
+            "snapshots": list(self.snapshots),
+        }
+
+
+class MemoryGrowthMonitor:
+    """
+    This process' RSS and object counts over a sliding window, checked for steady growth
+
+    ``sample`` reads the RSS, the number of allocated Python memory blocks
+    and of gc-tracked objects at most every ``interval`` seconds (counting
+    objects walks the gc lists). Once readings cover the last ``window``
+    seconds, a metric is growing when the least-squares slope over both
+    the whole window and its latest half exceeds the configured limit, so
+    a one-off step such as start-up warm-up is not mistaken for a leak.
+    A warning is printed at most once per window.
+    """
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        window: Optional[float] = None,
+        max_rss_slope: Optional[float] = None,
+        max_objects_slope: Optional[float] = None,
+    ):
+        self.interval = interval or settings.memory_sample_interval
+        self.window = window or settings.memory_growth_window
+        self.limits = {
+            "rss": max_rss_slope or settings.memory_growth_max_rss_slope,
+            "objects": max_objects_slope or settings.memory_growth_max_objects_slope,
+        }
+        self.points: Deque[Tuple[float, Dict[str, float]]] = deque(maxlen=int(self.window / self.interval) + 1)
+        self.process = psutil.Process()
+        self.stats = {"samples": 0, "warnings": 0}
+        self.growing: List[str] = []
+        self._next_sample = 0.0
+        self._last_warning: Optional[float] = None
+
+    def read(self) -> Dict[str, float]:
+        """Read this process' memory use"""
+        return {
+            "rss": self.process.memory_info().rss,
+            "blocks": sys.getallocatedblocks(),
+            "objects": len(gc.get_objects()),
+        }
+
+    def sample(self, now: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """
+        Read and check this process' memory use when the sample interval has passed
+
+        Returns:
+            dict: The ``agent`` section of a host sample, or None when not due
+        """
+        now = time.time() if now is None else now
+        if now < self._next_sample:
+            return None
+        self._next_sample = now + self.interval
+        agent = self.read()
+        self.add(now, agent)
+        return agent
+
+    def add(self, timestamp: float, agent: Dict[str, float]) -> None:
+        """Add a reading to the window and check the growth limits"""
+        self.points.append((timestamp, agent))
+        while self.points and self.points[0][0] < timestamp - self.window:
+            self.points.popleft()
+        self.stats["samples"] += 1
+        self.check(timestamp)
+
+    def covered(self) -> float:
+        """Seconds of the window covered by readings"""
+        return self.points[-1][0] - self.points[0][0] if len(self.points) > 1 else 0.0
+
+    def slopes(self, since: Optional[float] = None) -> Dict[str, float]:
+        """Least-squares growth per hour of each checked metric over the window (or the readings after ``since``)"""
+        points = [point for point in self.points if since is None or point[0] >= since]
+        if len(points) < 2:
+            return {metric: 0.0 for metric in GROWTH_METRICS}
+        times = [timestamp for timestamp, _ in points]
+        mean_time = sum(times) / len(times)
+        spread = sum((timestamp - mean_time) ** 2 for timestamp in times)
+        slopes = {}
+        for metric in GROWTH_METRICS:
+            values = [agent[metric] for _, agent in points]
+            mean_value = sum(values) / len(values)
+            covariance = sum((timestamp - mean_time) * (value - mean_value) for timestamp, value in zip(times, values))
+            slopes[metric] = covariance / spread * 3600 if spread else 0.0
+        return slopes
+
+    def check(self, now: float) -> List[str]:
+        """
+        Compare the growth over the window with the limits, warning at most once per window
+
+        Returns:
+            list: Metrics growing faster than their limit
+        """
+        # A reading interval of slack, since readings rarely land exactly a window apart
+        if self.covered() < self.window - self.interval:
+            self.growing = []
+            return self.growing
+        slopes = self.slopes()
+        recent = self.slopes(since=now - self.window / 2)
+        self.growing = [
+            metric for metric in GROWTH_METRICS
+            if slopes[metric] > self.limits[metric] and recent[metric] > self.limits[metric]
+        ]
+        if self.growing and (self._last_warning is None or now - self._last_warning >= self.window):
+            self._last_warning = now
+            self.stats["warnings"] += 1
+            growth = ", ".join(f"{metric} +{slopes[metric]:,.0f}/h" for metric in self.growing)
+            print(f"⚠️ Agent memory keeps growing over the last {self.covered() / 60:.0f} min: {growth}")
+        return self.growing
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the latest reading, the growth per hour and the limits"""
+        slopes = self.slopes()
+        return {
+            "latest": self.points[-1][1] if self.points else None,
+            "window": self.window,
+            "covered": round(self.covered(), 3),
+            "slopes_per_hour": {metric: round(slope, 3) for metric, slope in slopes.items()},
+            "limits_per_hour": self.limits,
+            "growing": self.growing,
+            **self.stats,
+        }
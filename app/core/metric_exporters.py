@@ -0,0 +1,265 @@
+"""
+🌟 Polaris System Detection API - StatsD and OTLP Metric Exporters
+"""
+
+import abc
+import http.client
+import json
+import platform
+import socket
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app.config.settings import settings
+from app.core.metric_history import flatten_sample
+
+# A batch of (timestamp, flat metric values) samples
+Batch = List[Tuple[float, Dict[str, float]]]
+
+
+class MetricSink(abc.ABC):
+    """Base class for push destinations; ``send_batch`` runs on the exporter thread"""
+
+    name = "sink"
+
+    def __init__(self):
+        self.stats = {"batches": 0, "packets": 0, "bytes": 0, "errors": 0}
+
+    @abc.abstractmethod
+    def send_batch(self, batch: Batch) -> None:
+        """Encode and send a batch of samples"""
+
+    def close(self) -> None:
+        """Release the connection or socket"""
+
+
+class StatsDSink(MetricSink):
+    """
+    StatsD gauges over UDP
+
+    Gauges only keep their last value, so each batch sends the latest
+    value of every metric, as ``<prefix>.<metric>:<value>|g`` lines packed
+    into as few datagrams as fit within ``mtu`` bytes.
+    """
+
+    name = "statsd"
+
+    def __init__(self, address: str, prefix: Optional[str] = None, mtu: Optional[int] = None):
+        super().__init__()
+        host, _, port = address.rpartition(":")
+        # IPv6 literals come bracketed, as in "[::1]:8125"
+        self.address = (host.strip("[]") or "127.0.0.1", int(port))
+        self.prefix = settings.statsd_prefix if prefix is None else prefix
+        self.mtu = mtu or settings.exporter_mtu
+        self.socket = socket.socket(socket.AF_INET6 if ":" in self.address[0] else socket.AF_INET, socket.SOCK_DGRAM)
+
+    def encode(self, batch: Batch) -> List[bytes]:
+        """Pack the latest value of every metric into datagrams of at most ``mtu`` bytes"""
+        latest: Dict[str, float] = {}
+        for _, values in batch:
+            latest.update(values)
+
+        prefix = f"{self.prefix}." if self.prefix else ""
+        packets = []
+        current: List[bytes] = []
+        size = 0
+        for metric, value in latest.items():
+            line = f"{prefix}{metric}:{value:.15g}|g".encode()
+            # Lines are newline separated; a line never spans two datagrams
+            if current and size + 1 + len(line) > self.mtu:
+                packets.append(b"\n".join(current))
+                current, size = [], 0
+            size += len(line) + (1 if current else 0)
+            current.append(line)
+        if current:
+            packets.append(b"\n".join(current))
+        return packets
+
+    def send_batch(self, batch: Batch) -> None:
+        for packet in self.encode(batch):
+            self.socket.sendto(packet, self.address)
+            self.stats["packets"] += 1
+            self.stats["bytes"] += len(packet)
+        self.stats["batches"] += 1
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+class OTLPSink(MetricSink):
+    """
+    OTLP/HTTP metrics in the JSON encoding
+
+    Each batch becomes one ExportMetricsServiceRequest with a gauge per
+    metric holding every sample of the batch as a data point, posted over
+    a kept-alive connection.
+    """
+
+    name = "otlp"
+
+    def __init__(self, endpoint: str, timeout: Optional[float] = None):
+        super().__init__()
+        url = urlsplit(endpoint)
+        self.https = url.scheme == "https"
+        self.host = url.netloc
+        self.path = url.path or "/v1/metrics"
+        self.timeout = timeout or settings.exporter_timeout
+        self.resource = {"attributes": [
+            {"key": "service.name", "value": {"stringValue": "polaris"}},
+            {"key": "host.name", "value": {"stringValue": platform.node()}},
+        ]}
+        self.connection: Optional[http.client.HTTPConnection] = None
+
+    def encode(self, batch: Batch) -> bytes:
+        """Build the JSON ExportMetricsServiceRequest of a batch"""
+        points: Dict[str, List[Dict[str, Any]]] = {}
+        for timestamp, values in batch:
+            time_unix_nano = str(int(timestamp * 1e9))
+            for metric, value in values.items():
+                points.setdefault(metric, []).append({"timeUnixNano": time_unix_nano, "asDouble": value})
+        request = {"resourceMetrics": [{
+            "resource": self.resource,
+            "scopeMetrics": [{
+                "scope": {"name": "polaris", "version": settings.version},
+                "metrics": [
+                    {"name": metric, "gauge": {"dataPoints": data_points}}
+                    for metric, data_points in points.items()
+                ],
+            }],
+        }]}
+        return json.dumps(request, separators=(",", ":")).encode()
+
+    def send_batch(self, batch: Batch) -> None:
+        body = self.encode(batch)
+        if self.connection is None:
+            connection_type = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            self.connection = connection_type(self.host, timeout=self.timeout)
+        try:
+            self.connection.request("POST", self.path, body, {"Content-Type": "application/json"})
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException) as e:
+            # Reconnect on the next batch
+            self.connection.close()
+            self.connection = None
+            if isinstance(e, OSError):
+                raise
+            raise OSError(f"Bad response from OTLP endpoint: {type(e).__name__}: {e}") from e
+        if response.status >= 300:
+            raise OSError(f"OTLP endpoint answered {response.status} {response.reason}")
+        self.stats["batches"] += 1
+        self.stats["packets"] += 1
+        self.stats["bytes"] += len(body)
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+
+
+class MetricExporter:
+    """
+    Push host samples to StatsD and OTLP sinks from a background thread
+
+    ``submit`` flattens a sample and appends it to a bounded queue, so
+    collection never waits on the network; when a sink falls behind, the
+    oldest samples are dropped. The exporter thread sends what is queued
+    to every sink every ``flush_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        sinks: List[MetricSink],
+        queue_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.sinks = sinks
+        self.flush_interval = flush_interval or settings.exporter_flush_interval
+        self.queue: Deque[Tuple[float, Dict[str, float]]] = deque(maxlen=queue_size or settings.exporter_queue_size)
+        self.stats = {"submitted": 0, "dropped": 0, "flushes": 0}
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MetricExporter":
+        """Start the exporter thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="polaris-metric-exporter", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, timestamp: float, sample: Dict[str, Any]) -> None:
+        """Queue a host sample for the next flush, dropping the oldest if the queue is full"""
+        values = flatten_sample(sample)
+        if not values:
+            return
+        if len(self.queue) == self.queue.maxlen:
+            self.stats["dropped"] += 1
+        # A full deque drops its oldest entry on append
+        self.queue.append((timestamp, values))
+        self.stats["submitted"] += 1
+
+    def flush(self) -> int:
+        """
+        Send everything queued to every sink
+
+        Returns:
+            int: Number of samples sent
+        """
+        batch = []
+        while self.queue:
+            batch.append(self.queue.popleft())
+        if not batch:
+            return 0
+
+        for sink in self.sinks:
+            # Any sink failure is counted; it must never end the exporter thread
+            try:
+                sink.send_batch(batch)
+            except Exception as e:
+                sink.stats["errors"] += 1
+                print(f"⚠️ Error exporting metrics to {sink.name}: {e}")
+        self.stats["flushes"] += 1
+        return len(batch)
+
+    def _run(self) -> None:
+        """Flush every flush interval until closed"""
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue and per-sink counters"""
+        return {
+            "queued": len(self.queue),
+            **self.stats,
+            "sinks": {sink.name: dict(sink.stats) for sink in self.sinks},
+        }
+
+    def close(self) -> None:
+        """Send what is queued, then stop the thread and close the sinks"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        for sink in self.sinks:
+            sink.close()
+
+
+def create_metric_exporter() -> Optional[MetricExporter]:
+    """
+    Create the exporter for the configured sinks
+
+    Returns:
+        MetricExporter: Exporter (not started), or None when no sink is configured
+    """
+    sinks: List[MetricSink] = []
+    if settings.statsd_address:
+        sinks.append(StatsDSink(settings.statsd_address))
+    if settings.otlp_endpoint:
+        sinks.append(OTLPSink(settings.otlp_endpoint))
+    return MetricExporter(sinks) if sinks else None
@@ -0,0 +1,342 @@
+"""
+🌟 Polaris System Detection API - Tiered Metric History
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+
+# Rollup tiers, finest first: (name, bucket width in seconds)
+TIERS = (("1s", 1), ("1m", 60), ("1h", 3600))
+
+# Container metrics kept in the history
+CONTAINER_METRICS = (
+    "cpu_usage", "cpu_percent", "cpu_throttled_percent", "memory_used", "memory_percent",
+    "io_read_bytes_per_sec", "io_write_bytes_per_sec",
+)
+
+
+class HistoryDisabledError(Exception):
+    """Raised when the metric history is queried while it is disabled"""
+
+
+def _number(value: Any) -> bool:
+    """Whether a reading is a usable number (MISSING, "n/a" and None are not)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def flatten_sample(sample: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Turn a host sample (cpu, memory, disk, gpu, container and agent sections,
+    any of which may be missing; GPU readings are records) into flat metric
+    values such as ``gpu.0.utilization``
+    """
+    values = {}
+    if sample.get("cpu"):
+        values["cpu.percent"] = sample["cpu"]["cpu_percent"]
+    if sample.get("memory"):
+        virtual_memory = sample["memory"]["virtual_memory"]
+        values["memory.percent"] = virtual_memory["percent"]
+        values["memory.used"] = virtual_memory["used"]
+    if sample.get("disk"):
+        values["disk.percent"] = sample["disk"]["disk_usage"]["percent"]
+    for index, gpu in enumerate(sample.get("gpu") or []):
+        # Stale readings repeat the last known state, so they are not history
+        if gpu.stale:
+            continue
+        values[f"gpu.{index}.utilization"] = gpu.utilization
+        values[f"gpu.{index}.memory_used_percent"] = gpu.memory_used_percent
+    container = sample.get("container")
+    if container:
+        for key in CONTAINER_METRICS:
+            if _number(container.get(key)):
+                values[f"container.{key}"] = container[key]
+        for key, value in (container.get("pressure") or {}).items():
+            values[f"container.pressure.{key}"] = value
+    for key, value in (sample.get("agent") or {}).items():
+        values[f"agent.{key}"] = value
+    return {metric: float(value) for metric, value in values.items() if _number(value)}
+
+
+class MetricHistory:
+    """
+    Persistent metric history in SQLite with 1 s / 1 min / 1 h rollups
+
+    ``record`` only appends to an in-memory queue, so the sampling path
+    never waits on disk. A writer thread folds the queue into all three
+    tiers (min, max, sum and count per bucket) in one transaction every
+    ``flush_interval`` seconds, then enforces the per-tier retention and
+    the ``max_bytes`` size bound. Queries read the finest tier that still
+    covers the range within ``max_points`` points.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        retention: Optional[Dict[str, float]] = None,
+        max_bytes: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_points: Optional[int] = None,
+    ):
+        self.path = os.path.expanduser(path or settings.history_path)
+        self.retention = dict(retention if retention is not None else {
+            "1s": settings.history_retention_1s,
+            "1m": settings.history_retention_1m,
+            "1h": settings.history_retention_1h,
+        })
+        self.max_bytes = max_bytes or settings.history_max_bytes
+        self.flush_interval = flush_interval or settings.history_flush_interval
+        self.max_points = max_points or settings.history_max_points
+        self.stats = {"recorded": 0, "dropped": 0, "flushes": 0, "rows_written": 0, "rows_trimmed": 0}
+        self._pending: Deque[Tuple[float, Dict[str, float]]] = deque()
+        self._max_pending = settings.history_max_pending
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._read_lock = threading.Lock()
+        self._last_retention = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating it and its tiers on first use"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # The read connection is shared by the query threads, one at a time
+        connection = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+        # Only takes effect on a new database, before the tables exist
+        connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            for tier, _ in TIERS:
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS history_{tier} ("
+                    "metric TEXT NOT NULL, bucket INTEGER NOT NULL, "
+                    "minimum REAL NOT NULL, maximum REAL NOT NULL, total REAL NOT NULL, count INTEGER NOT NULL, "
+                    "PRIMARY KEY (metric, bucket)) WITHOUT ROWID"
+                )
+                connection.execute(f"CREATE INDEX IF NOT EXISTS history_{tier}_bucket ON history_{tier} (bucket)")
+        return connection
+
+    def _read(self, sql: str, parameters: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        """Run a query on the read connection, opening it on first use"""
+        with self._read_lock:
+            if self._connection is None:
+                self._connection = self._connect()
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def start(self) -> "MetricHistory":
+        """Start the writer thread (only the process that records needs it)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run_writer, name="polaris-history-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def record(self, timestamp: float, sample: Dict[str, Any]) -> None:
+        """Queue a host sample for the next batched write"""
+        values = flatten_sample(sample)
+        if not values:
+            return
+        # Drop the oldest samples rather than grow without bound if the disk stalls
+        if len(self._pending) >= self._max_pending:
+            self._pending.popleft()
+            self.stats["dropped"] += 1
+        self._pending.append((timestamp, values))
+        self.stats["recorded"] += 1
+
+    def _run_writer(self) -> None:
+        """Flush queued samples every flush interval until closed"""
+        connection = self._connect()
+        try:
+            while not self._stopping:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                try:
+                    self.flush(connection)
+                    if time.time() - self._last_retention >= 60.0:
+                        self.enforce_retention(connection)
+                except sqlite3.Error as e:
+                    print(f"⚠️ Error writing metric history: {e}")
+            self.flush(connection)
+        finally:
+            connection.close()
+
+    def flush(self, connection: sqlite3.Connection) -> int:
+        """
+        Fold queued samples into every tier in one transaction
+
+        Returns:
+            int: Number of bucket rows written
+        """
+        samples = []
+        while self._pending:
+            samples.append(self._pending.popleft())
+        if not samples:
+            return 0
+
+        # Aggregate in memory first so each bucket is written once per flush
+        buckets: Dict[Tuple[str, str, int], List[float]] = {}
+        for timestamp, values in samples:
+            for tier, width in TIERS:
+                bucket = int(timestamp // width * width)
+                for metric, value in values.items():
+                    row = buckets.get((tier, metric, bucket))
+                    if row is None:
+                        buckets[(tier, metric, bucket)] = [value, value, value, 1]
+                    else:
+                        row[0] = min(row[0], value)
+                        row[1] = max(row[1], value)
+                        row[2] += value
+                        row[3] += 1
+
+        with connection:
+            for tier, _ in TIERS:
+                connection.executemany(
+                    f"INSERT INTO history_{tier} VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (metric, bucket) DO UPDATE SET "
+                    "minimum = min(minimum, excluded.minimum), maximum = max(maximum, excluded.maximum), "
+                    "total = total + excluded.total, count = count + excluded.count",
+                    [(metric, bucket, *row) for (row_tier, metric, bucket), row in buckets.items() if row_tier == tier],
+                )
+        self.stats["flushes"] += 1
+        self.stats["rows_written"] += len(buckets)
+        return len(buckets)
+
+    def enforce_retention(self, connection: sqlite3.Connection) -> None:
+        """Delete buckets past their tier's retention, then trim the finest tiers while over the size bound"""
+        self._last_retention = now = time.time()
+        with connection:
+            for tier, _ in TIERS:
+                cursor = connection.execute(f"DELETE FROM history_{tier} WHERE bucket < ?", (now - self.retention[tier],))
+                self.stats["rows_trimmed"] += cursor.rowcount
+
+        # Give up the oldest tenth of the finest non-empty tier at a time
+        for tier, _ in TIERS:
+            while self._database_bytes(connection) > self.max_bytes:
+                rows = connection.execute(f"SELECT count(*) FROM history_{tier}").fetchone()[0]
+                if rows == 0:
+                    break
+                cutoff = connection.execute(
+                    f"SELECT bucket FROM history_{tier} ORDER BY bucket LIMIT 1 OFFSET ?", (rows // 10,)
+                ).fetchone()[0]
+                with connection:
+                    cursor = connection.execute(f"DELETE FROM history_{tier} WHERE bucket <= ?", (cutoff,))
+                    self.stats["rows_trimmed"] += cursor.rowcount
+                connection.execute("PRAGMA incremental_vacuum")
+                connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.execute("PRAGMA incremental_vacuum")
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    @staticmethod
+    def _database_bytes(connection: sqlite3.Connection) -> int:
+        """Get the space used by live pages (free pages are returned by incremental vacuum)"""
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        pages = connection.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        return (pages - free_pages) * page_size
+
+    def pick_tier(self, start: float, end: float, max_points: Optional[int] = None) -> Tuple[str, int]:
+        """Get the finest tier that still holds ``start`` and covers the range within max_points"""
+        now = time.time()
+        max_points = max_points or self.max_points
+        for tier, width in TIERS:
+            if now - start <= self.retention[tier] and (end - start) / width <= max_points:
+                return tier, width
+        return TIERS[-1]
+
+    def query(
+        self,
+        metrics: List[str],
+        start: float,
+        end: float,
+        tier: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get the history of metrics between two Unix timestamps
+
+        Args:
+            metrics: Metric names such as ``cpu.percent`` or ``gpu.0.utilization``
+            start: Range start (Unix seconds)
+            end: Range end (Unix seconds)
+            tier: Tier to read (1s, 1m, 1h); picked from the range when None
+
+        Returns:
+            dict: ``tier``, ``resolution`` (seconds), ``start``, ``end`` and
+            ``series`` mapping each metric to ``[bucket, min, max, avg]`` points
+        """
+        if tier is None:
+            tier, width = self.pick_tier(start, end)
+        else:
+            width = dict(TIERS)[tier]
+
+        series: Dict[str, List[List[float]]] = {metric: [] for metric in metrics}
+        if metrics:
+            placeholders = ", ".join("?" * len(metrics))
+            rows = self._read(
+                f"SELECT metric, bucket, minimum, maximum, total / count FROM history_{tier} "
+                f"WHERE metric IN ({placeholders}) AND bucket >= ? AND bucket <= ? ORDER BY metric, bucket",
+                (*metrics, int(start // width * width), end),
+            )
+            for metric, bucket, minimum, maximum, average in rows:
+                series[metric].append([bucket, minimum, maximum, round(average, 4)])
+        return {"tier": tier, "resolution": width, "start": start, "end": end, "series": series}
+
+    def downsample(self, metrics: List[str], start: float, end: float, points: int) -> Dict[str, Any]:
+        """
+        Get chart-ready series of at most ``points`` points each, whatever the range
+
+        The bucket averages of the finest tier holding at most
+        ``series_max_points`` buckets are reduced with LTTB, which keeps the
+        shape (peaks and dips) of the full-resolution series.
+
+        Returns:
+            dict: Like ``query``, with ``series`` mapping each metric to ``[time, avg]`` points
+        """
+        # numpy is only needed by this query, so the sampler never loads it
+        import numpy as np
+
+        from app.utils.lttb import lttb
+
+        tier, _ = self.pick_tier(start, end, settings.history_series_max_points)
+        history = self.query(metrics, start, end, tier)
+        for metric, rows in history["series"].items():
+            if rows:
+                data = np.asarray(rows, dtype=np.float64)
+                times, values = lttb(data[:, 0], data[:, 3], points)
+                history["series"][metric] = np.column_stack((times, values)).tolist()
+        history["points"] = points
+        return history
+
+    def list_metrics(self) -> List[str]:
+        """Get the names of all metrics in the history"""
+        rows = self._read(f"SELECT DISTINCT metric FROM history_{TIERS[-1][0]} ORDER BY metric")
+        return [metric for (metric,) in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write counters, the queue depth and the database size"""
+        try:
+            size = os.path.getsize(self.path) + (
+                os.path.getsize(f"{self.path}-wal") if os.path.exists(f"{self.path}-wal") else 0
+            )
+        except OSError:
+            size = 0
+        return {"path": self.path, "writer": self._thread is not None, "pending": len(self._pending),
+                "bytes": size, **self.stats}
+
+    def close(self) -> None:
+        """Write what is queued, stop the writer thread and close the read connection"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        with self._read_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
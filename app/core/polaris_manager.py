@@ -3,24 +3,122 @@
 """
 
 import asyncio
+import heapq
 import os
-from typing import Any, Dict
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import psutil
 
 from app.config.settings import settings
+from app.core.adaptive_sampling import MODE_NAMES
+from app.core.capability_probe import CapabilityProbe
+from app.core.change_feed import SHARED_POLL_INTERVAL, ChangeFeed, build_inventory
+from app.core.cgroup_detector import CgroupDetector
+from app.core.cgroup_walker import CgroupTreeWalker
+from app.core.collector_executor import CollectorExecutor, collector_executor
 from app.core.gpu_detector import GPUDetector
+from app.core.memory_profiler import MemoryGrowthMonitor, MemoryProfiler
+from app.core.metric_exporters import create_metric_exporter
+from app.core.metric_history import HistoryDisabledError, MetricHistory
+from app.core.records import GPURecord, gpu_records_to_dicts
+from app.core.result_cache import ResultCache, result_cache
+from app.core.shared_snapshot import SECTIONS, SnapshotReader
+from app.core.storage_probe import StorageProbe
 from app.core.system_detector import SystemDetector
-from app.utils.system_utils import get_platform_info
+from app.core.topology_detector import TopologyDetector
+from app.utils.startup_profiler import startup_profiler
+from app.utils.system_utils import get_installed_packages, get_platform_info
+
+
+# Sort keys of the cgroup breakdown (largest first; missing values last)
+CGROUP_SORT_KEYS = {
+    "cpu": lambda cgroup: cgroup["cpu_usage"] or 0.0,
+    "memory": lambda cgroup: cgroup["memory_used"] or 0,
+    "io": lambda cgroup: (cgroup["io_read_bytes_per_sec"] or 0.0) + (cgroup["io_write_bytes_per_sec"] or 0.0),
+}
 
 
 class PolarisManager:
     """Main Polaris system detection manager"""
     
-    def __init__(self):
-        self.gpu_detector = GPUDetector()
-        self.system_detector = SystemDetector()
-        self.platform_info = get_platform_info()
+    def __init__(
+        self,
+        executor: Optional[CollectorExecutor] = None,
+        cache: Optional[ResultCache] = None,
+        snapshot: Optional[SnapshotReader] = None,
+    ):
+        with startup_profiler.phase("GPUDetector"):
+            self.gpu_detector = GPUDetector()
+        with startup_profiler.phase("SystemDetector"):
+            self.system_detector = SystemDetector()
+        self.cgroup_detector = CgroupDetector() if settings.enable_container_metrics else None
+        self.cgroup_walker = CgroupTreeWalker() if settings.enable_container_metrics else None
+        self.topology_detector = TopologyDetector(gpu_backend=self.gpu_detector.backend)
+        self.capability_probe = CapabilityProbe()
+        self.storage_probe = StorageProbe()
+        self.history = MetricHistory() if settings.history_enabled else None
+        # With several workers the shared sampler exports instead
+        self.exporter = None if settings.shared_snapshot_name else create_metric_exporter()
+        self.change_feed = ChangeFeed()
+        self.memory_monitor = MemoryGrowthMonitor()
+        self.memory_profiler = MemoryProfiler().start()
+        self.executor = executor or collector_executor
+        self.cache = cache or result_cache
+        self.snapshot = snapshot if snapshot is not None else self._attach_snapshot()
+        self._sampler_interval = 0.0 if settings.adaptive_sampling_enabled else settings.sampler_interval
+        with startup_profiler.phase("platform info"):
+            self.platform_info = get_platform_info()
         self._base_system_info = self._initialize_base_info()
     
+    @staticmethod
+    def _attach_snapshot() -> Optional[SnapshotReader]:
+        """Attach to the sampler's shared snapshot when running as a worker"""
+        if not settings.shared_snapshot_name:
+            return None
+        try:
+            reader = SnapshotReader(settings.shared_snapshot_name)
+            print(f"📡 Reading host samples from shared snapshot '{reader.name}'")
+            return reader
+        except (FileNotFoundError, ValueError) as e:
+            print(f"⚠️ Shared snapshot unavailable, probing the host directly: {e}")
+            return None
+    
+    def _read_snapshot(self, sections: Tuple[str, ...], max_age_ms: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Get the latest shared sample if the given sections are fresh enough, else None"""
+        if self.snapshot is None:
+            return None
+        
+        # Requests drive the sampler's schedule, so record them even when the
+        # sample turns out to be too old to use
+        now = time.time()
+        for section in sections:
+            self.snapshot.note_demand(section, now)
+        
+        snapshot = self.snapshot.read()
+        if snapshot is None:
+            return None
+        
+        for section in sections:
+            # Without an explicit max_age_ms a section is fresh for its cache
+            # lifetime, plus one sampler tick of slack
+            if max_age_ms is None:
+                max_age = max(self.cache.ttl_for(section), self._sampler_interval) + settings.sampler_fast_interval
+            else:
+                max_age = max_age_ms / 1000.0
+            if now - snapshot["sections"][section]["sampled_at"] > max_age:
+                return None
+        return snapshot
+    
+    def subscribe_snapshot(self, seconds: float) -> None:
+        """Keep the sampler at its fast interval for the next ``seconds`` (stream subscribers)"""
+        if self.snapshot is None:
+            return
+        until = time.time() + seconds
+        for section in SECTIONS:
+            self.snapshot.subscribe(section, until)
+    
     def _initialize_base_info(self) -> Dict[str, Any]:
         """Initialize base system information"""
         device_info = self.gpu_detector.get_device_info()
@@ -35,18 +133,85 @@ class PolarisManager:
             "gpu_memory": "",
         }
     
-    async def get_complete_system_info(self) -> Dict[str, Any]:
+    async def _collect_cpu_info(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Collect CPU information in the collector pool"""
+        snapshot = self._read_snapshot(("cpu",), max_age_ms)
+        if snapshot is not None:
+            return {"architecture": self.platform_info["cpu"], **snapshot["cpu"]}
+        return await self.cache.get(
+            "cpu",
+            lambda: self.executor.run("cpu", self.system_detector.get_cpu_info),
+            max_age_ms,
+        )
+    
+    async def _collect_memory_info(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Collect memory information in the collector pool"""
+        snapshot = self._read_snapshot(("memory",), max_age_ms)
+        if snapshot is not None:
+            return snapshot["memory"]
+        return await self.cache.get(
+            "memory",
+            lambda: self.executor.run("memory", self.system_detector.get_memory_info),
+            max_age_ms,
+        )
+    
+    async def _load_disk_info(self) -> Dict[str, Any]:
+        """Load disk information, including Mac-specific usage"""
+        mac_disk_usage = await self.system_detector.get_mac_disk_usage()
+        return await self.executor.run("disk", self.system_detector.collect_disk_info, mac_disk_usage)
+    
+    async def _collect_disk_info(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Collect disk information in the collector pool"""
+        snapshot = self._read_snapshot(("disk",), max_age_ms)
+        if snapshot is not None:
+            return snapshot["disk"]
+        return await self.cache.get("disk", self._load_disk_info, max_age_ms)
+    
+    async def _collect_gpu_records(self, max_age_ms: Optional[int] = None) -> List[GPURecord]:
+        """Collect GPU readings in the collector pool (converted to dicts only in responses)"""
+        snapshot = self._read_snapshot(("gpu",), max_age_ms)
+        if snapshot is not None:
+            return snapshot["gpu"]
+        return await self.cache.get(
+            "gpu",
+            lambda: self.executor.run("gpu", self.gpu_detector.get_gpu_records),
+            max_age_ms,
+        )
+    
+    async def _collect_container_info(self, max_age_ms: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Collect cgroup limits, usage and PSI stall percentages in the collector pool"""
+        if self.cgroup_detector is None:
+            return None
+        snapshot = self._read_snapshot(("container",), max_age_ms)
+        if snapshot is not None:
+            return snapshot["container"]
+        return await self.cache.get(
+            "container",
+            lambda: self.executor.run("container", self.cgroup_detector.get_container_metrics),
+            max_age_ms,
+        )
+    
+    async def _collect_macmon_data(self, max_age_ms: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Collect Mac metrics if available"""
+        return await self.cache.get("mac", self.system_detector.get_macmon_data, max_age_ms)
+    
+    async def _collect_system_metrics(self, max_age_ms: Optional[int] = None) -> Tuple[Any, ...]:
+        """Collect CPU, memory, disk, Mac and GPU metrics concurrently"""
+        return await asyncio.gather(
+            self._collect_cpu_info(max_age_ms),
+            self._collect_memory_info(max_age_ms),
+            self._collect_disk_info(max_age_ms),
+            self._collect_macmon_data(max_age_ms),
+            self._collect_gpu_records(max_age_ms),
+        )
+    
+    async def get_complete_system_info(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
         """Get complete system information (main detection endpoint)"""
         # Start with base system info
         result = self._base_system_info.copy()
         
-        # Get real-time system metrics
-        cpu_info = self.system_detector.get_cpu_info()
-        memory_info = self.system_detector.get_memory_info()
-        disk_info = await self.system_detector.get_disk_info()
-        
-        # Get Mac-specific data if available
-        macmon_data = await self.system_detector.get_macmon_data()
+        # Get real-time system metrics and Mac-specific data if available
+        cpu_info, memory_info, disk_info, macmon_data, gpu_records = await self._collect_system_metrics(max_age_ms)
         
         # Update with real-time metrics
         result.update({
@@ -62,70 +227,328 @@ class PolarisManager:
             result["mac_metrics"] = macmon_data
         
         # Add GPU information
-        result["gpu"] = self.gpu_detector.get_gpu_info()
+        result["gpu"] = gpu_records_to_dicts(gpu_records)
         
         return result
     
-    async def get_gpu_detection(self) -> Dict[str, Any]:
+    async def get_gpu_detection(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
         """Get GPU detection information"""
         device_info = self.gpu_detector.get_device_info()
         
         return {
-            "polaris_gpu_detection": self.gpu_detector.get_gpu_info(),
+            "polaris_gpu_detection": gpu_records_to_dicts(await self._collect_gpu_records(max_age_ms)),
             "device": device_info["device"],
             "device_type": device_info["device_type"],
             "cuda_version": device_info["cuda_version"],
             "detection_timestamp": asyncio.get_event_loop().time()
         }
     
-    def get_cpu_detection(self) -> Dict[str, Any]:
+    async def get_cpu_detection(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
         """Get CPU detection information"""
         return {
-            "polaris_cpu_detection": self.system_detector.get_cpu_info(),
+            "polaris_cpu_detection": await self._collect_cpu_info(max_age_ms),
             "detection_timestamp": asyncio.get_event_loop().time()
         }
     
-    def get_memory_detection(self) -> Dict[str, Any]:
+    async def get_memory_detection(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
         """Get memory detection information"""
         return {
-            "polaris_memory_detection": self.system_detector.get_memory_info(),
+            "polaris_memory_detection": await self._collect_memory_info(max_age_ms),
             "detection_timestamp": asyncio.get_event_loop().time()
         }
     
-    async def get_disk_detection(self) -> Dict[str, Any]:
+    async def get_disk_detection(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
         """Get disk detection information"""
         return {
-            "polaris_disk_detection": await self.system_detector.get_disk_info(),
+            "polaris_disk_detection": await self._collect_disk_info(max_age_ms),
+            "storage_probe": self.storage_probe.get_results(),
             "detection_timestamp": asyncio.get_event_loop().time()
         }
     
-    def get_network_detection(self) -> Dict[str, Any]:
-        """Get network detection information"""
+    async def get_topology_detection(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Get NUMA nodes and device affinity with current per-node memory usage"""
         return {
-            "polaris_network_detection": self.system_detector.get_network_info(),
+            "polaris_topology_detection": await self.cache.get(
+                "topology",
+                lambda: self.executor.run("topology", self.topology_detector.get_topology),
+                max_age_ms,
+            ),
             "detection_timestamp": asyncio.get_event_loop().time()
         }
     
-    def get_environment_detection(self) -> Dict[str, Any]:
-        """Get environment detection information"""
+    async def get_capability(self, refresh: bool = False, wait: bool = False) -> Dict[str, Any]:
+        """Get hardware capability benchmark results, starting a run in the background when needed"""
+        return await self.capability_probe.get_capability(refresh, wait)
+    
+    async def record_samples(self) -> None:
+        """
+        Record a host sample into the metric history and exporter every history interval
+
+        Used when this process probes the host itself; with several workers
+        the shared sampler records and exports its samples instead. With
+        neither the history nor an exporter enabled, only this process'
+        memory use is sampled.
+        """
+        if self.history is None and self.exporter is None:
+            while True:
+                self.memory_monitor.sample()
+                await asyncio.sleep(self.memory_monitor.interval)
+        if self.history is not None:
+            self.history.start()
+        if self.exporter is not None:
+            self.exporter.start()
+        while True:
+            cpu_info, memory_info, disk_info, gpu_records, container_info = await asyncio.gather(
+                self._collect_cpu_info(),
+                self._collect_memory_info(),
+                self._collect_disk_info(),
+                self._collect_gpu_records(),
+                self._collect_container_info(),
+            )
+            now = time.time()
+            sample = {
+                "cpu": cpu_info,
+                "memory": memory_info,
+                "disk": disk_info,
+                "gpu": gpu_records,
+                "container": container_info,
+                "agent": self.memory_monitor.sample(now),
+            }
+            if self.history is not None:
+                self.history.record(now, sample)
+            if self.exporter is not None:
+                self.exporter.submit(now, sample)
+            await asyncio.sleep(settings.history_interval)
+    
+    def close_recorders(self) -> None:
+        """Flush and close the metric history and exporter"""
+        if self.history is not None:
+            self.history.close()
+        if self.exporter is not None:
+            self.exporter.close()
+    
+    async def watch_inventory(self) -> None:
+        """
+        Diff the GPU, NIC and mount inventory into the change feed every changes interval
+
+        Installed packages are listed less often, every changes packages interval.
+        With several workers the shared sampler diffs the inventory instead, and
+        this returns at once.
+        """
+        if self.snapshot is not None:
+            return
+        packages_listed = 0.0
+        while True:
+            try:
+                gpu_records, network_entry, disk_info = await asyncio.gather(
+                    self._collect_gpu_records(),
+                    self.cache.get_entry(
+                        "network",
+                        lambda: self.executor.run("network", self.system_detector.get_network_info),
+                    ),
+                    self._collect_disk_info(),
+                )
+                packages = None
+                if time.monotonic() - packages_listed >= settings.changes_packages_interval:
+                    packages = await self.executor.run("packages", get_installed_packages)
+                    packages_listed = time.monotonic()
+                self.change_feed.update(build_inventory(gpu_records, network_entry.value, disk_info, packages))
+            except Exception as e:
+                print(f"⚠️ Error updating inventory change feed: {e}")
+            await asyncio.sleep(settings.changes_interval)
+    
+    async def get_changes(self, since: int, epoch: Optional[str] = None, wait: float = 0.0) -> Dict[str, Any]:
+        """Get inventory change events after a sequence number, waiting up to ``wait`` seconds for one"""
+        wait = min(wait, settings.changes_max_wait)
+        if self.snapshot is None:
+            return await self.change_feed.wait(since, epoch, wait)
+
+        # The shared sampler publishes the feed; mirror it, re-reading while waiting
+        deadline = time.monotonic() + wait
+        while True:
+            feed = self.snapshot.read_changes()
+            if feed is not None:
+                self.change_feed.load(feed)
+            result = self.change_feed.read(since, epoch)
+            remaining = deadline - time.monotonic()
+            if result["events"] or result["reset"] or remaining <= 0:
+                return result
+            await asyncio.sleep(min(SHARED_POLL_INTERVAL, remaining))
+    
+    async def get_history(
+        self,
+        metrics: List[str],
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        tier: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get metric history between two Unix timestamps (default: the last hour)"""
+        if self.history is None:
+            raise HistoryDisabledError("Metric history is disabled (POLARIS_HISTORY_ENABLED=false)")
+        end = time.time() if end is None else end
+        start = end - 3600.0 if start is None else start
+        return await self.executor.run("history", self.history.query, metrics, start, end, tier)
+    
+    async def get_history_series(
+        self,
+        metrics: List[str],
+        points: int,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Get LTTB-downsampled metric history between two Unix timestamps (default: the last hour)"""
+        if self.history is None:
+            raise HistoryDisabledError("Metric history is disabled (POLARIS_HISTORY_ENABLED=false)")
+        end = time.time() if end is None else end
+        start = end - 3600.0 if start is None else start
+        return await self.executor.run("history", self.history.downsample, metrics, start, end, points)
+    
+    async def get_history_metrics(self) -> List[str]:
+        """Get the names of the metrics in the history"""
+        if self.history is None:
+            raise HistoryDisabledError("Metric history is disabled (POLARIS_HISTORY_ENABLED=false)")
+        return await self.executor.run("history", self.history.list_metrics)
+    
+    async def get_memory_profile(
+        self,
+        since: Optional[int] = None,
+        group_by: str = "lineno",
+        limit: int = 25,
+    ) -> Dict[str, Any]:
+        """Take a tracemalloc snapshot and diff it by allocation site against an earlier one"""
+        profile = await self.executor.run("memory_profile", self.memory_profiler.diff, since, group_by, limit)
+        profile["growth"] = self.memory_monitor.get_stats()
+        return profile
+    
+    async def get_cgroup_breakdown(
+        self,
+        sort: str = "cpu",
+        limit: Optional[int] = None,
+        max_age_ms: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Get per-cgroup resource usage, largest consumers first"""
+        if self.cgroup_walker is None:
+            cgroups = []
+        else:
+            cgroups = await self.cache.get(
+                "cgroups",
+                lambda: self.executor.run("cgroups", self.cgroup_walker.walk),
+                max_age_ms,
+            )
+        
+        if sort == "path":
+            ordered = sorted(cgroups, key=lambda cgroup: cgroup["path"])[:limit]
+        else:
+            key = CGROUP_SORT_KEYS[sort]
+            count = len(cgroups) if limit is None else limit
+            ordered = heapq.nlargest(count, cgroups, key=key)
         return {
-            "polaris_environment_detection": self.system_detector.get_environment_info(),
+            "polaris_cgroups": ordered,
+            "cgroup_count": len(cgroups),
             "detection_timestamp": asyncio.get_event_loop().time()
         }
     
-    def get_realtime_monitoring(self) -> Dict[str, Any]:
+    async def get_network_detection(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Get network detection information"""
+        entry = await self.cache.get_entry(
+            "network",
+            lambda: self.executor.run("network", self.system_detector.get_network_info),
+            max_age_ms,
+        )
+        
+        # Large, slow-changing payloads carry their collection time so the
+        # serialized (and compressed) response stays identical until it changes
+        return {
+            "polaris_network_detection": entry.value,
+            "detection_timestamp": entry.timestamp
+        }
+    
+    async def get_environment_detection(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Get environment detection information"""
+        entry = await self.cache.get_entry(
+            "environment",
+            lambda: self.executor.run("environment", self.system_detector.get_environment_info),
+            max_age_ms,
+        )
+        
+        return {
+            "polaris_environment_detection": entry.value,
+            "detection_timestamp": entry.timestamp
+        }
+    
+    async def get_realtime_monitoring(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
         """Get real-time monitoring information"""
-        realtime_metrics = self.system_detector.get_realtime_metrics()
-        gpu_summary = self.gpu_detector.get_gpu_summary()
+        snapshot = self._read_snapshot(SECTIONS, max_age_ms)
+        if snapshot is not None:
+            return {
+                "polaris_realtime_monitoring": {
+                    **snapshot["realtime"],
+                    "gpu_status": self.gpu_detector.summarize_gpu_info(snapshot["gpu"]),
+                    "container": snapshot["container"] if self.cgroup_detector is not None else None,
+                },
+                "detection_timestamp": asyncio.get_event_loop().time()
+            }
+        
+        realtime_metrics, gpu_records, container_info = await asyncio.gather(
+            self.cache.get(
+                "realtime",
+                lambda: self.executor.run("realtime", self.system_detector.get_realtime_metrics),
+                max_age_ms,
+            ),
+            self._collect_gpu_records(max_age_ms),
+            self._collect_container_info(max_age_ms),
+        )
         
         return {
             "polaris_realtime_monitoring": {
                 **realtime_metrics,
-                "gpu_status": gpu_summary
+                "gpu_status": self.gpu_detector.summarize_gpu_info(gpu_records),
+                "container": container_info,
             },
             "detection_timestamp": asyncio.get_event_loop().time()
         }
     
+    def get_sampling_stats(self) -> Optional[Dict[str, Any]]:
+        """Get the shared sampler's per-section schedule and CPU use since sampling began, or None without one"""
+        snapshot = self.snapshot.read() if self.snapshot is not None else None
+        if snapshot is None:
+            return None
+        
+        now = time.time()
+        sampler = snapshot["sampler"]
+        uptime = max(now - sampler["started"], 1e-9)
+        return {
+            "adaptive": settings.adaptive_sampling_enabled,
+            "uptime": round(uptime, 3),
+            "cpu_seconds": round(sampler["cpu_seconds"], 3),
+            "cpu_percent": round(100.0 * sampler["cpu_seconds"] / uptime, 3),
+            "sections": {
+                section: {
+                    "mode": MODE_NAMES[state["mode"]],
+                    "interval": state["interval"],
+                    "samples": state["samples"],
+                    "samples_per_second": round(state["samples"] / uptime, 3),
+                    "demand_per_second": round(state["demand_rate"], 3),
+                    "age": round(now - state["sampled_at"], 3),
+                }
+                for section, state in snapshot["sections"].items()
+            },
+        }
+    
+    @staticmethod
+    def get_agent_stats() -> Dict[str, Any]:
+        """Get the CPU time used by this server process since it started"""
+        process = psutil.Process()
+        cpu_times = process.cpu_times()
+        cpu_seconds = cpu_times.user + cpu_times.system
+        uptime = max(time.time() - process.create_time(), 1e-9)
+        return {
+            "pid": process.pid,
+            "uptime": round(uptime, 3),
+            "cpu_seconds": round(cpu_seconds, 3),
+            "cpu_percent": round(100.0 * cpu_seconds / uptime, 3),
+        }
+    
     def get_system_summary(self) -> Dict[str, Any]:
         """Get system summary for root endpoint"""
         device_info = self.gpu_detector.get_device_info()
@@ -136,7 +559,7 @@ class PolarisManager:
             "pytorch_device": device_info["device"]
         }
     
-    async def get_transformer_lab_compatible_info(self) -> Dict[str, Any]:
+    async def get_transformer_lab_compatible_info(self, max_age_ms: Optional[int] = None) -> Dict[str, Any]:
         """Get Transformer Lab compatible system information"""
         # This mirrors the original Transformer Lab serverinfo.py response format
         result = self._base_system_info.copy()
@@ -145,13 +568,8 @@ class PolarisManager:
         result.pop("api_name", None)
         result.pop("version", None)
         
-        # Get real-time system metrics
-        cpu_info = self.system_detector.get_cpu_info()
-        memory_info = self.system_detector.get_memory_info()
-        disk_info = await self.system_detector.get_disk_info()
-        
-        # Get Mac-specific data if available
-        macmon_data = await self.system_detector.get_macmon_data()
+        # Get real-time system metrics and Mac-specific data if available
+        cpu_info, memory_info, disk_info, macmon_data, gpu_records = await self._collect_system_metrics(max_age_ms)
         
         # Update with real-time metrics (Transformer Lab format)
         result.update({
@@ -166,6 +584,34 @@ class PolarisManager:
             result["mac_metrics"] = macmon_data
         
         # Add GPU information
-        result["gpu"] = self.gpu_detector.get_gpu_info()
+        result["gpu"] = gpu_records_to_dicts(gpu_records)
         
-        return result 
\ No newline at end of file
+        return result
+
+
+# Shared manager instance, built on first use so importing the app stays cheap
+_polaris_manager: Optional[PolarisManager] = None
+_polaris_manager_lock = threading.Lock()
+
+
+def get_polaris_manager() -> PolarisManager:
+    """Get the shared Polaris manager, creating it on first use"""
+    global _polaris_manager
+    if _polaris_manager is None:
+        with _polaris_manager_lock:
+            if _polaris_manager is None:
+                with startup_profiler.phase("PolarisManager"):
+                    _polaris_manager = PolarisManager()
+    return _polaris_manager
+
+
+def get_existing_polaris_manager() -> Optional[PolarisManager]:
+    """Get the shared Polaris manager if it has been created, without creating it"""
+    return _polaris_manager
+
+
+async def get_polaris_manager_async() -> PolarisManager:
+    """Get the shared Polaris manager without blocking the event loop while it is built"""
+    if _polaris_manager is not None:
+        return _polaris_manager
+    return await asyncio.to_thread(get_polaris_manager)
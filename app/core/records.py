@@ -0,0 +1,138 @@
+"""
+🌟 Polaris System Detection API - Compact Snapshot Records
+"""
+
+from typing import Any, Dict, List
+
+# How a missing reading is shown in API responses
+NOT_AVAILABLE = "n/a"
+
+
+class _Missing:
+    """Type of MISSING; a falsy singleton that survives pickling"""
+
+    __slots__ = ()
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __reduce__(self):
+        return (_Missing, ())
+
+
+# Reading not available (failed collection, unsupported platform); never a
+# valid number, unlike 0, and distinct from None
+MISSING = _Missing()
+
+
+def present(value: Any) -> bool:
+    """Whether a reading is available"""
+    return value is not MISSING and value is not None
+
+
+def shown(value: Any) -> Any:
+    """Render a reading for an API response (MISSING becomes "n/a")"""
+    return NOT_AVAILABLE if value is MISSING else value
+
+
+class GPURecord:
+    """
+    One GPU reading
+
+    Records are built once by the collector and shared, unchanged, by the
+    result cache, the shared snapshot, the history and every response; they
+    only become dicts in ``to_dict`` when a response is built.
+    """
+
+    __slots__ = ("name", "total_memory", "free_memory", "used_memory", "utilization", "stale")
+
+    def __init__(
+        self,
+        name: str,
+        total_memory: Any = MISSING,
+        free_memory: Any = MISSING,
+        used_memory: Any = MISSING,
+        utilization: Any = MISSING,
+        stale: bool = False,
+    ):
+        self.name = name
+        self.total_memory = total_memory
+        self.free_memory = free_memory
+        self.used_memory = used_memory
+        self.utilization = utilization
+        self.stale = stale
+
+    @property
+    def memory_used_percent(self) -> Any:
+        """Used share of device memory in percent, or MISSING"""
+        total, used = self.total_memory, self.used_memory
+        if present(total) and present(used) and total > 0:
+            return round(used / total * 100, 2)
+        return MISSING
+
+    def as_stale(self) -> "GPURecord":
+        """Copy of this reading marked as repeating the last known state"""
+        return GPURecord(
+            self.name, self.total_memory, self.free_memory, self.used_memory, self.utilization, stale=True
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Response form (``stale`` only when set)"""
+        gpu = {
+            "name": self.name,
+            "total_memory": shown(self.total_memory),
+            "free_memory": shown(self.free_memory),
+            "used_memory": shown(self.used_memory),
+            "utilization": shown(self.utilization),
+        }
+        if self.stale:
+            gpu["stale"] = True
+        return gpu
+
+    def to_summary(self) -> Dict[str, Any]:
+        """Realtime monitoring form (``stale`` only when set)"""
+        summary = {
+            "name": self.name,
+            "utilization": shown(self.utilization),
+            "memory_used_percent": shown(self.memory_used_percent),
+        }
+        if self.stale:
+            summary["stale"] = True
+        return summary
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, GPURecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"GPURecord({fields})"
+
+
+# Name of the placeholder reading served when GPU collection fails
+CPU_FALLBACK_NAME = "cpu"
+
+
+def fallback_records() -> List[GPURecord]:
+    """Placeholder served instead of GPU readings when collection fails"""
+    return [GPURecord(CPU_FALLBACK_NAME)]
+
+
+def is_fallback(records: List[GPURecord]) -> bool:
+    """Whether readings are the placeholder of a failed collection rather than real devices"""
+    return len(records) == 1 and records[0].name == CPU_FALLBACK_NAME and not present(records[0].total_memory)
+
+
+def gpu_records_to_dicts(records: List[GPURecord]) -> List[Dict[str, Any]]:
+    """Response form of a list of GPU readings"""
+    return [record.to_dict() for record in records]
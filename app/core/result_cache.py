@@ -0,0 +1,188 @@
+"""
+🌟 Polaris System Detection API - Result Cache
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.config.settings import settings
+
+
+class CacheEntry:
+    """
+    A cached collector result
+
+    ``created`` is monotonic and only used for ages; ``timestamp`` is the
+    wall clock time the collection started, for responses.
+    """
+
+    __slots__ = ("value", "created", "timestamp", "generation")
+
+    def __init__(self, value: Any, created: float, generation: int, timestamp: Optional[float] = None):
+        self.value = value
+        self.created = created
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.generation = generation
+
+    @property
+    def age(self) -> float:
+        """Seconds since the result was collected"""
+        return time.monotonic() - self.created
+
+
+class ResultCache:
+    """
+    Per-section TTL cache with single-flight loading
+
+    Concurrent requests for a section that is being collected share the
+    in-flight collection instead of starting their own. Within the
+    stale-while-revalidate window an expired result is served immediately
+    while one background collection refreshes it. Callers may pass
+    ``max_age_ms`` to demand a fresher (or accept an older) result, in
+    which case stale results are never served.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.ttls = dict(ttls if ttls is not None else {
+            "cpu": settings.cpu_check_interval,
+            "memory": settings.memory_check_interval,
+            "disk": settings.disk_check_interval,
+            "gpu": settings.gpu_check_interval,
+            "network": settings.network_check_interval,
+            "environment": settings.environment_check_interval,
+            "realtime": settings.cpu_check_interval,
+            "mac": settings.cpu_check_interval,
+            "container": settings.cpu_check_interval,
+            "cgroups": settings.cpu_check_interval,
+            "topology": settings.memory_check_interval,
+        })
+        self.default_ttl = settings.result_cache_ttl if default_ttl is None else default_ttl
+        self.stale_while_revalidate = (
+            settings.result_cache_stale_while_revalidate
+            if stale_while_revalidate is None else stale_while_revalidate
+        )
+        self.enabled = settings.result_cache_enabled if enabled is None else enabled
+        self._entries: Dict[str, CacheEntry] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._generation = 0
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0}
+
+    def ttl_for(self, section: str) -> float:
+        """Get the freshness lifetime in seconds for a section"""
+        return self.ttls.get(section, self.default_ttl)
+
+    def peek(self, section: str) -> Optional[CacheEntry]:
+        """Get the current entry for a section without loading"""
+        return self._entries.get(section)
+
+    def invalidate(self, section: Optional[str] = None) -> None:
+        """Drop one cached section, or all of them"""
+        if section is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(section, None)
+
+    async def get(
+        self,
+        section: str,
+        loader: Callable[[], Awaitable[Any]],
+        max_age_ms: Optional[int] = None,
+    ) -> Any:
+        """
+        Get a section result, collecting it only when needed
+
+        Args:
+            section: Cache section name
+            loader: Coroutine factory that collects the section
+            max_age_ms: Oldest acceptable result in milliseconds (default: section TTL)
+
+        Returns:
+            Any: The cached or freshly collected result
+        """
+        entry = await self.get_entry(section, loader, max_age_ms)
+        return entry.value
+
+    async def get_entry(
+        self,
+        section: str,
+        loader: Callable[[], Awaitable[Any]],
+        max_age_ms: Optional[int] = None,
+    ) -> CacheEntry:
+        """Get a section cache entry (value plus collection time), collecting it only when needed"""
+        if not self.enabled:
+            return await self._load(section, loader)
+
+        entry = self._entries.get(section)
+        max_age = self.ttl_for(section) if max_age_ms is None else max_age_ms / 1000.0
+
+        if entry is not None:
+            age = entry.age
+            if age <= max_age:
+                self.stats["hits"] += 1
+                return entry
+
+            # Serve the stale result and refresh it in the background
+            if max_age_ms is None and age <= max_age + self.stale_while_revalidate:
+                self.stats["stale_hits"] += 1
+                if self._get_inflight(section) is None:
+                    self.stats["refreshes"] += 1
+                    self._start_load(section, loader)
+                return entry
+
+        inflight = self._get_inflight(section)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        self.stats["misses"] += 1
+        return await asyncio.shield(self._start_load(section, loader))
+
+    def _get_inflight(self, section: str) -> Optional[asyncio.Future]:
+        """Get the in-flight collection for a section on the running loop"""
+        inflight = self._inflight.get(section)
+        if inflight is None or inflight.get_loop() is not asyncio.get_running_loop():
+            return None
+        return inflight
+
+    def _start_load(self, section: str, loader: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Start a shared collection for a section"""
+        task = asyncio.ensure_future(self._load(section, loader))
+        self._inflight[section] = task
+        task.add_done_callback(lambda _: self._finish_load(section, task))
+        return task
+
+    def _finish_load(self, section: str, task: asyncio.Future) -> None:
+        """Forget a finished collection and consume unobserved errors"""
+        if self._inflight.get(section) is task:
+            del self._inflight[section]
+        if not task.cancelled():
+            task.exception()
+
+    async def _load(self, section: str, loader: Callable[[], Awaitable[Any]]) -> CacheEntry:
+        """Run a collection and store its result"""
+        started, timestamp = time.monotonic(), time.time()
+        value = await loader()
+        self._generation += 1
+        entry = self._entries[section] = CacheEntry(value, started, self._generation, timestamp)
+        return entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters and per-section ages"""
+        return {
+            **self.stats,
+            "sections": {
+                section: {"age": round(entry.age, 3), "generation": entry.generation}
+                for section, entry in self._entries.items()
+            },
+        }
+
+
+# Global result cache instance
+result_cache = ResultCache()
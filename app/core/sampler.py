@@ -0,0 +1,209 @@
+"""
+🌟 Polaris System Detection API - Host Sampler Process
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from app.config.settings import settings
+from app.core.adaptive_sampling import AdaptiveSamplingPolicy
+from app.core.shared_snapshot import SECTIONS, SnapshotWriter
+
+
+def collect_sample(
+    system_detector,
+    gpu_detector,
+    sections: Iterable[str] = SECTIONS,
+    cgroup_detector=None,
+) -> Dict[str, Any]:
+    """Collect the given sections of a host sample with the regular detectors"""
+    sample = {}
+    if "cpu" in sections:
+        sample["cpu"] = system_detector.get_cpu_info()
+    if "memory" in sections:
+        sample["memory"] = system_detector.get_memory_info()
+    if "disk" in sections:
+        mac_disk_usage = None
+        if sys.platform == "darwin":
+            mac_disk_usage = asyncio.run(system_detector.get_mac_disk_usage())
+        sample["disk"] = system_detector.collect_disk_info(mac_disk_usage)
+    if "gpu" in sections:
+        sample["gpu"] = gpu_detector.get_gpu_records()
+    if "container" in sections:
+        # Usage and stall rates are deltas since the previous container sample
+        sample["container"] = cgroup_detector.get_container_metrics() if cgroup_detector is not None else None
+    return sample
+
+
+def collect_inventory(system_detector, gpu_detector, packages: bool = False) -> Dict[str, Any]:
+    """Collect the inventory diffed by the change feed (installed packages only when asked)"""
+    from app.core.change_feed import build_inventory
+    from app.utils.system_utils import get_installed_packages
+
+    return build_inventory(
+        gpu_detector.get_gpu_records(),
+        system_detector.get_network_info(),
+        system_detector.collect_disk_info(),
+        get_installed_packages() if packages else None,
+    )
+
+
+def run_sampler(name: str, interval: float, parent_pid: int) -> None:
+    """
+    Keep the shared snapshot current, sampling each section on its own schedule
+
+    With adaptive sampling every section is sampled at the fast interval
+    while a stream is subscribed or it is polled often, at its check
+    interval while it is being requested and at the heartbeat interval once
+    it has gone idle; without
+    it every section is sampled every ``interval`` seconds.
+
+    With the change feed enabled, the inventory is also diffed here every
+    changes interval and the feed published through the snapshot, so every
+    worker serves the same epoch and sequence numbers.
+
+    Runs in its own process and exits on SIGTERM or when the server process
+    goes away.
+    """
+    from app.core.cgroup_detector import CgroupDetector
+    from app.core.change_feed import ChangeFeed
+    from app.core.gpu_detector import GPUDetector
+    from app.core.memory_profiler import MemoryGrowthMonitor
+    from app.core.metric_exporters import create_metric_exporter
+    from app.core.metric_history import MetricHistory
+    from app.core.system_detector import SystemDetector
+
+    system_detector = SystemDetector()
+    gpu_detector = GPUDetector()
+    cgroup_detector = CgroupDetector() if settings.enable_container_metrics else None
+    writer = SnapshotWriter.attach(name)
+    history = MetricHistory().start() if settings.history_enabled else None
+    exporter = create_metric_exporter()
+    if exporter is not None:
+        exporter.start()
+    # The sampler records the history, so it tracks its own memory use
+    memory_monitor = MemoryGrowthMonitor()
+    change_feed = ChangeFeed() if settings.changes_enabled else None
+    next_changes = 0.0 if change_feed is not None else float("inf")
+    packages_listed = 0.0
+    policy = AdaptiveSamplingPolicy(fixed_interval=interval)
+    # Demand is re-checked at least this often, so a subscriber or the first
+    # request after an idle period is picked up quickly
+    tick = min(policy.fast_interval, interval)
+    # CPU use is reported from here on, leaving out the one-off detector setup
+    started = time.time()
+    cpu_baseline = time.process_time()
+    published = None
+    last_sampled = {section: 0.0 for section in SECTIONS}
+    mode = "adaptive" if policy.enabled else f"every {interval:.2f}s"
+    print(f"📡 Polaris sampler writing '{name}' ({mode})")
+    # SamplerProcess.stop sends SIGTERM; leave the loop so the history and
+    # the exporter flush what they have queued
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+
+    try:
+        while os.getppid() == parent_pid and not stopping.is_set():
+            now = time.time()
+            states = {}
+            due = []
+            next_due = now + tick
+            for section, (last_demand, demand_count, subscribers_until) in writer.read_demand().items():
+                section_interval, section_mode = policy.evaluate(
+                    section, now, last_demand, demand_count, subscribers_until
+                )
+                states[section] = (section_interval, section_mode, policy.rates[section])
+                if now >= last_sampled[section] + section_interval:
+                    due.append(section)
+                else:
+                    next_due = min(next_due, last_sampled[section] + section_interval)
+
+            schedule = {section: state[:2] for section, state in states.items()}
+            if due:
+                published = schedule
+                try:
+                    sample = collect_sample(system_detector, gpu_detector, due, cgroup_detector)
+                    writer.write(sample, states, started, time.process_time() - cpu_baseline)
+                    sample["agent"] = memory_monitor.sample(now)
+                    if history is not None:
+                        history.record(now, sample)
+                    if exporter is not None:
+                        exporter.submit(now, sample)
+                except Exception as e:
+                    print(f"⚠️ Error sampling host: {e}")
+                for section in due:
+                    last_sampled[section] = now
+            elif schedule != published:
+                # Publish schedule changes (e.g. going idle) on their own; with
+                # nothing due there is no sample to record or export
+                published = schedule
+                writer.write({}, states, started, time.process_time() - cpu_baseline)
+
+            if now >= next_changes:
+                next_changes = now + settings.changes_interval
+                try:
+                    list_packages = now - packages_listed >= settings.changes_packages_interval
+                    inventory = collect_inventory(system_detector, gpu_detector, list_packages)
+                    if list_packages:
+                        packages_listed = now
+                    # The first inventory is published too, so workers serve this epoch from the start
+                    if change_feed.update(inventory) or change_feed.stats["updates"] == 1:
+                        writer.write_changes(change_feed.export())
+                except Exception as e:
+                    print(f"⚠️ Error updating inventory change feed: {e}")
+
+            stopping.wait(max(min(next_due, next_changes) - time.time(), 0.0))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if history is not None:
+            history.close()
+        if exporter is not None:
+            exporter.close()
+        writer.close()
+
+
+class SamplerProcess:
+    """
+    A shared snapshot segment plus the process that keeps it current
+
+    The server process owns the segment; uvicorn workers attach to it by
+    name (``POLARIS_SHARED_SNAPSHOT_NAME``) and read it instead of probing
+    the host themselves.
+    """
+
+    def __init__(self, name: Optional[str] = None, interval: Optional[float] = None):
+        self.name = name or f"polaris_{os.getpid()}"
+        self.interval = interval or settings.sampler_interval
+        self.writer: Optional[SnapshotWriter] = None
+        self.process: Optional[multiprocessing.Process] = None
+
+    def start(self) -> "SamplerProcess":
+        """Create the segment and start sampling"""
+        self.writer = SnapshotWriter.create(self.name)
+        self.process = multiprocessing.get_context("spawn").Process(
+            target=run_sampler,
+            args=(self.name, self.interval, os.getpid()),
+            name="polaris-sampler",
+            # Not a daemon, because it starts its own GPU worker process; it
+            # exits by itself when the server process goes away
+            daemon=False,
+        )
+        self.process.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop sampling and remove the segment"""
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join(timeout=5)
+            self.process = None
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
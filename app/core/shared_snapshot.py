@@ -0,0 +1,512 @@
+"""
+🌟 Polaris System Detection API - Shared Memory Snapshot
+"""
+
+import json
+import math
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.cgroup_detector import PRESSURE_KEYS
+from app.core.records import MISSING, GPURecord, fallback_records, is_fallback, present
+
+# Layout version, bumped whenever the layout below changes
+SNAPSHOT_MAGIC = b"PLRS"
+SNAPSHOT_VERSION = 5
+MAX_GPUS = 16
+GPU_NAME_SIZE = 64
+CGROUP_NAME_SIZE = 256
+INVENTORY_SIZE = 64 * 1024
+CHANGES_SIZE = 512 * 1024
+
+# Integer fields use -1 and float fields NaN for "not available on this platform"
+VIRTUAL_MEMORY_FIELDS = (
+    ("total", "q"), ("available", "q"), ("percent", "d"), ("used", "q"), ("free", "q"),
+    ("active", "q"), ("inactive", "q"), ("buffers", "q"), ("cached", "q"),
+    ("shared", "q"), ("slab", "q"), ("wired", "q"),
+)
+SWAP_MEMORY_FIELDS = (
+    ("total", "q"), ("used", "q"), ("free", "q"), ("percent", "d"), ("sin", "q"), ("sout", "q"),
+)
+DISK_USAGE_FIELDS = (("total", "q"), ("used", "q"), ("free", "q"), ("percent", "d"))
+CONTAINER_FIELDS = (
+    ("cpu_limit", "d"), ("memory_limit", "q"), ("memory_used", "q"), ("memory_percent", "d"),
+    ("cpu_usage", "d"), ("cpu_percent", "d"), ("cpu_throttled_percent", "d"),
+    ("io_read_bytes_per_sec", "d"), ("io_write_bytes_per_sec", "d"),
+) + tuple((key, "d") for key in PRESSURE_KEYS)
+
+# Sections sampled on their own schedules
+SECTIONS = ("cpu", "memory", "disk", "gpu", "container")
+
+# Fixed layout: the sequence number, then the sample, then the slowly
+# changing inventory (disk partitions) and the inventory change feed as JSON
+# blobs. The demand table at the end is written by workers, not the sampler,
+# and is outside the seqlock.
+SEQUENCE = struct.Struct("<Q")
+META = struct.Struct("<4sHHdQdd")  # magic, version, max GPUs, timestamp, writes, sampler start, sampler CPU s
+SECTION_STATE = struct.Struct("<dQdBd")  # sampled at, samples, interval, mode, demand rate
+CPU = struct.Struct("<di3d3d")  # percent, count, freq current/min/max, load average 1/5/15
+VIRTUAL_MEMORY = struct.Struct("<" + "".join(kind for _, kind in VIRTUAL_MEMORY_FIELDS))
+SWAP_MEMORY = struct.Struct("<" + "".join(kind for _, kind in SWAP_MEMORY_FIELDS))
+DISK_USAGE = struct.Struct("<" + "".join(kind for _, kind in DISK_USAGE_FIELDS))
+GPU_HEADER = struct.Struct("<iB")  # device count, collection failed
+GPU = struct.Struct(f"<{GPU_NAME_SIZE}sqqqd?")  # name, total, used, free, utilization, stale
+CONTAINER_HEADER = struct.Struct(f"<?{CGROUP_NAME_SIZE}s")  # available, cgroup name
+CONTAINER = struct.Struct("<" + "".join(kind for _, kind in CONTAINER_FIELDS))
+INVENTORY_HEADER = struct.Struct("<QI")  # generation, length
+CHANGES_HEADER = struct.Struct("<QI")  # generation, length
+DEMAND = struct.Struct("<dQd")  # last requested, request count, subscribers until
+DEMAND_TIME = struct.Struct("<d")
+DEMAND_COUNT = struct.Struct("<Q")
+
+META_OFFSET = SEQUENCE.size
+SECTION_STATE_OFFSET = META_OFFSET + META.size
+CPU_OFFSET = SECTION_STATE_OFFSET + SECTION_STATE.size * len(SECTIONS)
+VIRTUAL_MEMORY_OFFSET = CPU_OFFSET + CPU.size
+SWAP_MEMORY_OFFSET = VIRTUAL_MEMORY_OFFSET + VIRTUAL_MEMORY.size
+DISK_USAGE_OFFSET = SWAP_MEMORY_OFFSET + SWAP_MEMORY.size
+GPU_HEADER_OFFSET = DISK_USAGE_OFFSET + DISK_USAGE.size
+GPU_OFFSET = GPU_HEADER_OFFSET + GPU_HEADER.size
+CONTAINER_HEADER_OFFSET = GPU_OFFSET + GPU.size * MAX_GPUS
+CONTAINER_OFFSET = CONTAINER_HEADER_OFFSET + CONTAINER_HEADER.size
+INVENTORY_HEADER_OFFSET = CONTAINER_OFFSET + CONTAINER.size
+INVENTORY_OFFSET = INVENTORY_HEADER_OFFSET + INVENTORY_HEADER.size
+CHANGES_HEADER_OFFSET = INVENTORY_OFFSET + INVENTORY_SIZE
+CHANGES_OFFSET = CHANGES_HEADER_OFFSET + CHANGES_HEADER.size
+DEMAND_OFFSET = CHANGES_OFFSET + CHANGES_SIZE
+SNAPSHOT_SIZE = DEMAND_OFFSET + DEMAND.size * len(SECTIONS)
+
+NAN = float("nan")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without handing it to this process' resource tracker"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # Before 3.13 every attaching process registers the segment and its
+    # resource tracker unlinks it on exit, even though the creator owns it
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _pack_fields(fields: Tuple[Tuple[str, str], ...], values: Dict[str, Any]) -> List[Any]:
+    """Order a psutil namedtuple dict by a field spec, marking missing fields"""
+    packed = []
+    for field, kind in fields:
+        value = values.get(field)
+        if value is None:
+            packed.append(-1 if kind == "q" else NAN)
+        else:
+            packed.append(int(value) if kind == "q" else float(value))
+    return packed
+
+
+def _unpack_fields(fields: Tuple[Tuple[str, str], ...], values: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Rebuild a psutil namedtuple dict, dropping fields missing on this platform"""
+    return {
+        field: value
+        for (field, kind), value in zip(fields, values)
+        if not (value == -1 if kind == "q" else math.isnan(value))
+    }
+
+
+class SnapshotWriter:
+    """
+    Write host samples into a shared memory segment
+
+    Only the sampler process writes. A write makes the sequence number odd,
+    updates the sample in place and makes it even again, so readers can
+    detect (and retry) a torn read without any lock.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False):
+        self.shm = shm
+        self.owner = owner
+        self.buffer = shm.buf
+        # A writer that died mid-update leaves an odd sequence number behind
+        sequence = SEQUENCE.unpack_from(self.buffer, 0)[0]
+        self.sequence = sequence + (sequence & 1)
+        self.samples = 0
+        self.inventory_generation = INVENTORY_HEADER.unpack_from(self.buffer, INVENTORY_HEADER_OFFSET)[0]
+        self.changes_generation = CHANGES_HEADER.unpack_from(self.buffer, CHANGES_HEADER_OFFSET)[0]
+        self._inventory = b""
+
+    @classmethod
+    def create(cls, name: str) -> "SnapshotWriter":
+        """Create (and own) a new snapshot segment"""
+        return cls(shared_memory.SharedMemory(name=name, create=True, size=SNAPSHOT_SIZE), owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SnapshotWriter":
+        """Attach to a segment created by another process"""
+        return cls(_attach(name))
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory segment"""
+        return self.shm.name
+
+    def write(
+        self,
+        sample: Dict[str, Any],
+        states: Dict[str, Tuple[float, int, float]],
+        sampler_started: float = 0.0,
+        sampler_cpu_seconds: float = 0.0,
+    ) -> None:
+        """
+        Publish a (possibly partial) sample
+
+        Args:
+            sample: Dict with any of ``cpu``, ``memory``, ``disk``, ``gpu`` and
+                ``container`` in the shapes returned by the detectors (GPU
+                records for ``gpu``);
+                sections left out keep their previous values
+            states: (interval, mode, demand rate) per section
+            sampler_started: Wall clock time the sampler started
+            sampler_cpu_seconds: CPU time the sampler has used so far
+        """
+        buffer = self.buffer
+        now = time.time()
+
+        self.samples += 1
+        self.sequence += 1
+        SEQUENCE.pack_into(buffer, 0, self.sequence)
+
+        META.pack_into(
+            buffer, META_OFFSET,
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, MAX_GPUS, now, self.samples, sampler_started, sampler_cpu_seconds,
+        )
+        for index, section in enumerate(SECTIONS):
+            offset = SECTION_STATE_OFFSET + index * SECTION_STATE.size
+            sampled_at, samples = SECTION_STATE.unpack_from(buffer, offset)[:2]
+            if section in sample:
+                sampled_at, samples = now, samples + 1
+            interval, mode, rate = states.get(section, (0.0, 0, 0.0))
+            SECTION_STATE.pack_into(buffer, offset, sampled_at, samples, interval, mode, rate)
+
+        if "cpu" in sample:
+            cpu = sample["cpu"]
+            cpu_freq = cpu.get("cpu_freq") or {}
+            load_avg = cpu.get("load_avg") or (NAN, NAN, NAN)
+            CPU.pack_into(
+                buffer, CPU_OFFSET,
+                float(cpu["cpu_percent"]), int(cpu["cpu_count"] or 0),
+                float(cpu_freq.get("current", NAN)), float(cpu_freq.get("min", NAN)), float(cpu_freq.get("max", NAN)),
+                *(float(value) for value in load_avg),
+            )
+
+        if "memory" in sample:
+            memory = sample["memory"]
+            VIRTUAL_MEMORY.pack_into(
+                buffer, VIRTUAL_MEMORY_OFFSET, *_pack_fields(VIRTUAL_MEMORY_FIELDS, memory["virtual_memory"])
+            )
+            SWAP_MEMORY.pack_into(
+                buffer, SWAP_MEMORY_OFFSET, *_pack_fields(SWAP_MEMORY_FIELDS, memory["swap_memory"])
+            )
+
+        if "disk" in sample:
+            disk = sample["disk"]
+            DISK_USAGE.pack_into(buffer, DISK_USAGE_OFFSET, *_pack_fields(DISK_USAGE_FIELDS, disk["disk_usage"]))
+
+            # The inventory rarely changes, so it is only rewritten (and only
+            # decoded by readers) when its generation moves
+            inventory = json.dumps(disk["disk_partitions"]).encode("utf-8")
+            if len(inventory) > INVENTORY_SIZE:
+                inventory = b"[]"
+            if inventory != self._inventory:
+                self._inventory = inventory
+                self.inventory_generation += 1
+                INVENTORY_HEADER.pack_into(buffer, INVENTORY_HEADER_OFFSET, self.inventory_generation, len(inventory))
+                buffer[INVENTORY_OFFSET:INVENTORY_OFFSET + len(inventory)] = inventory
+
+        if "gpu" in sample:
+            gpus = sample["gpu"]
+            gpu_failed = is_fallback(gpus)
+            if gpu_failed:
+                gpus = []
+            gpus = gpus[:MAX_GPUS]
+            GPU_HEADER.pack_into(buffer, GPU_HEADER_OFFSET, len(gpus), gpu_failed)
+            for index, gpu in enumerate(gpus):
+                utilization = gpu.utilization
+                memory = (gpu.total_memory, gpu.used_memory, gpu.free_memory)
+                GPU.pack_into(
+                    buffer, GPU_OFFSET + index * GPU.size,
+                    str(gpu.name).encode("utf-8")[:GPU_NAME_SIZE],
+                    *(int(value) if present(value) else -1 for value in memory),
+                    float(utilization) if present(utilization) else NAN,
+                    gpu.stale,
+                )
+
+        if "container" in sample:
+            container = sample["container"]
+            CONTAINER_HEADER.pack_into(
+                buffer, CONTAINER_HEADER_OFFSET,
+                container is not None, str((container or {}).get("cgroup") or "").encode("utf-8")[:CGROUP_NAME_SIZE],
+            )
+            if container is not None:
+                CONTAINER.pack_into(
+                    buffer, CONTAINER_OFFSET,
+                    *_pack_fields(CONTAINER_FIELDS, {**container, **container["pressure"]}),
+                )
+
+        self.sequence += 1
+        SEQUENCE.pack_into(buffer, 0, self.sequence)
+
+    def write_changes(self, feed: Dict[str, Any]) -> None:
+        """
+        Publish the inventory change feed (``epoch``, ``sequence`` and ``events``)
+
+        When the events do not fit, the oldest are left out; readers whose
+        cursor falls before the remaining events are then told to reset.
+        """
+        events = feed["events"]
+        while True:
+            blob = json.dumps({**feed, "events": events}).encode("utf-8")
+            if len(blob) <= CHANGES_SIZE or not events:
+                break
+            events = events[len(events) // 2 + 1:]
+
+        buffer = self.buffer
+        self.sequence += 1
+        SEQUENCE.pack_into(buffer, 0, self.sequence)
+        self.changes_generation += 1
+        CHANGES_HEADER.pack_into(buffer, CHANGES_HEADER_OFFSET, self.changes_generation, len(blob))
+        buffer[CHANGES_OFFSET:CHANGES_OFFSET + len(blob)] = blob
+        self.sequence += 1
+        SEQUENCE.pack_into(buffer, 0, self.sequence)
+
+    def read_demand(self) -> Dict[str, Tuple[float, int, float]]:
+        """Get (last requested, request count, subscribers until) per section, as written by workers"""
+        return {
+            section: DEMAND.unpack_from(self.buffer, DEMAND_OFFSET + index * DEMAND.size)
+            for index, section in enumerate(SECTIONS)
+        }
+
+    def close(self) -> None:
+        """Detach, and remove the segment if this writer created it"""
+        self.buffer = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SnapshotReader:
+    """
+    Read samples published by the sampler process
+
+    Reading never takes a lock: the sequence number is checked before and
+    after decoding and the read is retried if a write was in progress.
+    While the sequence number is unchanged the previously decoded sample
+    is returned as is, so concurrent requests share one decode.
+    """
+
+    def __init__(self, name: str, max_retries: int = 100):
+        self.shm = _attach(name)
+        self.buffer = self.shm.buf
+        self.max_retries = max_retries
+        self._sequence = 0
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._inventory_generation = 0
+        self._partitions: List[Dict[str, Any]] = []
+        self._changes_generation = 0
+        self._changes: Optional[Dict[str, Any]] = None
+        self.stats = {"reads": 0, "decodes": 0, "retries": 0, "failed_reads": 0}
+
+        magic, version = META.unpack_from(self.buffer, META_OFFSET)[:2]
+        if SEQUENCE.unpack_from(self.buffer, 0)[0] and (magic, version) != (SNAPSHOT_MAGIC, SNAPSHOT_VERSION):
+            raise ValueError(f"Unsupported snapshot layout {magic!r} v{version} in '{name}'")
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory segment"""
+        return self.shm.name
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest sample
+
+        Returns:
+            dict: ``timestamp``, ``samples``, ``sections`` (per-section sample
+            time and schedule), ``sampler``, ``cpu``, ``memory``, ``disk``,
+            ``gpu``, ``container`` and ``realtime``, or None if nothing was
+            published yet
+        """
+        self.stats["reads"] += 1
+        buffer = self.buffer
+
+        for _ in range(self.max_retries):
+            sequence = SEQUENCE.unpack_from(buffer, 0)[0]
+            if sequence == self._sequence:
+                return self._snapshot
+            if sequence & 1:
+                # Writer is mid-update; let it finish
+                self.stats["retries"] += 1
+                time.sleep(0)
+                continue
+
+            snapshot, generation = self._decode(buffer)
+            if snapshot is not None and SEQUENCE.unpack_from(buffer, 0)[0] == sequence:
+                self.stats["decodes"] += 1
+                self._sequence = sequence
+                self._snapshot = snapshot
+                self._inventory_generation = generation
+                self._partitions = snapshot["disk"]["disk_partitions"]
+                return snapshot
+            self.stats["retries"] += 1
+
+        self.stats["failed_reads"] += 1
+        return self._snapshot
+
+    def _decode(self, buffer: memoryview) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Decode the sample currently in the segment, with its inventory generation"""
+        _, _, _, timestamp, samples, sampler_started, sampler_cpu_seconds = META.unpack_from(buffer, META_OFFSET)
+        sections = {}
+        for index, section in enumerate(SECTIONS):
+            sampled_at, section_samples, interval, mode, rate = SECTION_STATE.unpack_from(
+                buffer, SECTION_STATE_OFFSET + index * SECTION_STATE.size
+            )
+            sections[section] = {
+                "sampled_at": sampled_at,
+                "samples": section_samples,
+                "interval": interval,
+                "mode": mode,
+                "demand_rate": rate,
+            }
+        cpu_percent, cpu_count, freq_current, freq_min, freq_max, *load_avg = CPU.unpack_from(buffer, CPU_OFFSET)
+        virtual_memory = _unpack_fields(VIRTUAL_MEMORY_FIELDS, VIRTUAL_MEMORY.unpack_from(buffer, VIRTUAL_MEMORY_OFFSET))
+        swap_memory = _unpack_fields(SWAP_MEMORY_FIELDS, SWAP_MEMORY.unpack_from(buffer, SWAP_MEMORY_OFFSET))
+        disk_usage = _unpack_fields(DISK_USAGE_FIELDS, DISK_USAGE.unpack_from(buffer, DISK_USAGE_OFFSET))
+
+        gpu_count, gpu_failed = GPU_HEADER.unpack_from(buffer, GPU_HEADER_OFFSET)
+        # A failed collection is shown as the CPU fallback, as GPUDetector does
+        gpus = fallback_records() if gpu_failed else []
+        for index in range(min(gpu_count, MAX_GPUS)):
+            name, total, used, free, utilization, stale = GPU.unpack_from(buffer, GPU_OFFSET + index * GPU.size)
+            gpus.append(GPURecord(
+                name.rstrip(b"\0").decode("utf-8", "replace"),
+                *(MISSING if value == -1 else value for value in (total, free, used)),
+                MISSING if math.isnan(utilization) else int(utilization),
+                stale,
+            ))
+
+        container = None
+        container_available, cgroup = CONTAINER_HEADER.unpack_from(buffer, CONTAINER_HEADER_OFFSET)
+        if container_available:
+            values = _unpack_fields(CONTAINER_FIELDS, CONTAINER.unpack_from(buffer, CONTAINER_OFFSET))
+            container = {"cgroup": cgroup.rstrip(b"\0").decode("utf-8", "replace") or None}
+            container.update((field, values.get(field)) for field, _ in CONTAINER_FIELDS[:-len(PRESSURE_KEYS)])
+            container["pressure"] = {key: values[key] for key in PRESSURE_KEYS if key in values}
+
+        generation, length = INVENTORY_HEADER.unpack_from(buffer, INVENTORY_HEADER_OFFSET)
+        partitions = self._partitions
+        if generation != self._inventory_generation:
+            try:
+                partitions = json.loads(bytes(buffer[INVENTORY_OFFSET:INVENTORY_OFFSET + min(length, INVENTORY_SIZE)]))
+            except ValueError:
+                # Torn read of the inventory; retry
+                return None, generation
+
+        cpu_info = {
+            "cpu_percent": cpu_percent,
+            "cpu_count": cpu_count,
+            "cpu_freq": None if math.isnan(freq_current) else {
+                "current": freq_current, "min": freq_min, "max": freq_max,
+            },
+        }
+        if not math.isnan(load_avg[0]):
+            cpu_info["load_avg"] = tuple(load_avg)
+
+        return {
+            "timestamp": timestamp,
+            "samples": samples,
+            "sections": sections,
+            "sampler": {"started": sampler_started, "cpu_seconds": sampler_cpu_seconds},
+            "cpu": cpu_info,
+            "memory": {"virtual_memory": virtual_memory, "swap_memory": swap_memory},
+            "disk": {"disk_usage": disk_usage, "disk_partitions": partitions},
+            "gpu": gpus,
+            "container": container,
+            "realtime": {
+                "cpu_percent": cpu_percent,
+                "memory_percent": virtual_memory.get("percent"),
+                "disk_percent": disk_usage.get("percent"),
+            },
+        }, generation
+
+    def read_changes(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the inventory change feed published by the sampler
+
+        Returns:
+            dict: ``epoch``, ``sequence`` and ``events`` (the same object
+            until the sampler publishes again), or None if nothing was
+            published yet
+        """
+        buffer = self.buffer
+        for _ in range(self.max_retries):
+            sequence = SEQUENCE.unpack_from(buffer, 0)[0]
+            if sequence & 1:
+                self.stats["retries"] += 1
+                time.sleep(0)
+                continue
+            generation, length = CHANGES_HEADER.unpack_from(buffer, CHANGES_HEADER_OFFSET)
+            if generation == self._changes_generation:
+                return self._changes
+            try:
+                changes = json.loads(bytes(buffer[CHANGES_OFFSET:CHANGES_OFFSET + min(length, CHANGES_SIZE)]))
+            except ValueError:
+                changes = None
+            if changes is not None and SEQUENCE.unpack_from(buffer, 0)[0] == sequence:
+                self._changes_generation = generation
+                self._changes = changes
+                return changes
+            self.stats["retries"] += 1
+
+        self.stats["failed_reads"] += 1
+        return self._changes
+
+    def note_demand(self, section: str, now: Optional[float] = None) -> None:
+        """
+        Tell the sampler a section was requested
+
+        Workers update the demand table without any locking, so concurrent
+        increments from several workers can occasionally be lost. The
+        sampler only derives a request rate from the counter, which a lost
+        increment does not meaningfully change.
+        """
+        offset = DEMAND_OFFSET + SECTIONS.index(section) * DEMAND.size
+        DEMAND_TIME.pack_into(self.buffer, offset, time.time() if now is None else now)
+        DEMAND_COUNT.pack_into(self.buffer, offset + 8, DEMAND_COUNT.unpack_from(self.buffer, offset + 8)[0] + 1)
+
+    def subscribe(self, section: str, until: float) -> None:
+        """Ask the sampler to sample a section at the fast interval until the given time"""
+        offset = DEMAND_OFFSET + SECTIONS.index(section) * DEMAND.size + 16
+        if DEMAND_TIME.unpack_from(self.buffer, offset)[0] < until:
+            DEMAND_TIME.pack_into(self.buffer, offset, until)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get read counters and the age of the latest sample"""
+        snapshot = self._snapshot
+        return {
+            "name": self.name,
+            **self.stats,
+            "samples": snapshot["samples"] if snapshot else 0,
+            "age": round(time.time() - snapshot["timestamp"], 3) if snapshot else None,
+        }
+
+    def close(self) -> None:
+        """Detach from the segment"""
+        self.buffer = None
+        self.shm.close()
@@ -0,0 +1,206 @@
+"""
+🌟 Polaris System Detection API - Storage Throughput and Latency Probe
+"""
+
+import errno
+import mmap
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.utils.stats_utils import summarize_latencies
+
+# Alignment O_DIRECT needs for offsets, sizes and buffers
+DIRECT_IO_ALIGNMENT = 4096
+
+
+class StorageProbe:
+    """
+    Opt-in sequential and random read/write probe of configured mount points
+
+    Each probe writes a temporary file under the mount point, reads it back
+    sequentially, then times random reads and writes of single blocks.
+    O_DIRECT bypasses the page cache where the filesystem supports it;
+    elsewhere writes are synced and the file is dropped from the cache with
+    ``posix_fadvise`` before reading. IO is issued in unpaced bursts of
+    ``burst_size`` bytes with sleeps in between, so the average stays within
+    ``max_rate`` bytes per second and a probe never saturates storage a
+    workload is using. Throughput and IOPS are computed from the time spent
+    in bursts only, so they report the device, not the rate limit.
+    Probes run in a background thread, at most every ``interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        paths: Optional[List[str]] = None,
+        file_size: Optional[int] = None,
+        block_size: Optional[int] = None,
+        random_ops: Optional[int] = None,
+        max_rate: Optional[float] = None,
+        burst_size: Optional[int] = None,
+        interval: Optional[float] = None,
+    ):
+        self.paths = list(settings.storage_probe_paths if paths is None else paths)
+        self.file_size = file_size or settings.storage_probe_file_size
+        self.block_size = block_size or settings.storage_probe_block_size
+        self.random_ops = random_ops or settings.storage_probe_random_ops
+        self.max_rate = max_rate or settings.storage_probe_max_rate
+        self.burst_size = burst_size or settings.storage_probe_burst_size
+        self.interval = interval or settings.storage_probe_interval
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _pace(self, moved: int, started: float) -> None:
+        """Sleep after a burst until ``moved`` bytes since ``started`` fit within the rate limit"""
+        ahead = moved / self.max_rate - (time.perf_counter() - started)
+        if ahead > 0:
+            time.sleep(ahead)
+
+    @staticmethod
+    def _open(path: str, flags: int) -> Tuple[int, bool]:
+        """Open with O_DIRECT when the platform and filesystem support it"""
+        direct = getattr(os, "O_DIRECT", 0)
+        if direct:
+            try:
+                return os.open(path, flags | direct), True
+            except OSError as e:
+                if e.errno != errno.EINVAL:
+                    raise
+        return os.open(path, flags), False
+
+    @staticmethod
+    def _drop_cache(fd: int) -> None:
+        """Evict a file from the page cache so reads reach the device"""
+        os.fsync(fd)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+    def probe_path(self, mount_point: str) -> Dict[str, Any]:
+        """
+        Probe one mount point (blocking)
+
+        Returns:
+            dict: Sequential write/read throughput (MB/s), random 4 KiB
+            read/write IOPS and latency summaries, and whether O_DIRECT was used
+        """
+        started_at = time.time()
+        block_size = self.block_size - self.block_size % DIRECT_IO_ALIGNMENT or DIRECT_IO_ALIGNMENT
+        blocks = max(self.file_size // block_size, 1)
+        size = blocks * block_size
+        # Anonymous maps are page aligned, as O_DIRECT requires
+        buffer = mmap.mmap(-1, block_size)
+        buffer.write(os.urandom(block_size))
+        small = memoryview(buffer)[:DIRECT_IO_ALIGNMENT]
+        path = os.path.join(mount_point, f".polaris-storage-probe-{os.getpid()}")
+        rng = random.Random(0)
+
+        try:
+            burst_blocks = max(self.burst_size // block_size, 1)
+            fd, direct = self._open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC)
+            try:
+                # Each write burst is synced so buffered writes reach the device within it
+                start, write_seconds = time.perf_counter(), 0.0
+                for first in range(0, blocks, burst_blocks):
+                    last = min(first + burst_blocks, blocks)
+                    burst_start = time.perf_counter()
+                    for block in range(first, last):
+                        os.pwrite(fd, buffer, block * block_size)
+                    os.fsync(fd)
+                    write_seconds += time.perf_counter() - burst_start
+                    self._pace(last * block_size, start)
+                if not direct:
+                    self._drop_cache(fd)
+
+                start, read_seconds = time.perf_counter(), 0.0
+                for first in range(0, blocks, burst_blocks):
+                    last = min(first + burst_blocks, blocks)
+                    burst_start = time.perf_counter()
+                    for block in range(first, last):
+                        os.preadv(fd, [buffer], block * block_size)
+                    read_seconds += time.perf_counter() - burst_start
+                    self._pace(last * block_size, start)
+            finally:
+                os.close(fd)
+
+            # Random single-block IO; buffered writes are made synchronous instead
+            offsets = [rng.randrange(size // DIRECT_IO_ALIGNMENT) * DIRECT_IO_ALIGNMENT for _ in range(self.random_ops)]
+            latencies: Dict[str, List[float]] = {"read": [], "write": []}
+            fd, _ = self._open(path, os.O_RDWR | (0 if direct else getattr(os, "O_DSYNC", 0)))
+            try:
+                if not direct:
+                    self._drop_cache(fd)
+                burst_ops = max(self.burst_size // DIRECT_IO_ALIGNMENT, 1)
+                start = time.perf_counter()
+                for index, offset in enumerate(offsets):
+                    operation = "read" if index % 2 == 0 else "write"
+                    op_start = time.perf_counter()
+                    if operation == "read":
+                        os.preadv(fd, [small], offset)
+                    else:
+                        os.pwrite(fd, small, offset)
+                    latencies[operation].append(time.perf_counter() - op_start)
+                    if (index + 1) % burst_ops == 0:
+                        self._pace((index + 1) * DIRECT_IO_ALIGNMENT, start)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            return {"path": mount_point, "measured_at": started_at, "error": str(e)}
+        finally:
+            small.release()
+            buffer.close()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+        read_latency = summarize_latencies(latencies["read"])
+        write_latency = summarize_latencies(latencies["write"])
+        return {
+            "path": mount_point,
+            "direct_io": direct,
+            "file_size": size,
+            "block_size": block_size,
+            "sequential_write_mb_per_sec": round(size / write_seconds / 1e6, 2),
+            "sequential_read_mb_per_sec": round(size / read_seconds / 1e6, 2),
+            # Per-op latencies never include the pacing sleeps between bursts
+            "random_read_iops": round(1000.0 / read_latency["mean_ms"], 1) if read_latency["mean_ms"] else None,
+            "random_write_iops": round(1000.0 / write_latency["mean_ms"], 1) if write_latency["mean_ms"] else None,
+            "random_read_latency": read_latency,
+            "random_write_latency": write_latency,
+            "measured_at": started_at,
+            "duration": round(time.time() - started_at, 3),
+            "error": None,
+        }
+
+    def _run(self) -> None:
+        """Probe every configured mount point, one at a time"""
+        for mount_point in self.paths:
+            result = self.probe_path(mount_point)
+            if result["error"]:
+                print(f"⚠️ Error probing storage at {mount_point}: {result['error']}")
+            with self._lock:
+                self.results[mount_point] = result
+
+    def get_results(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Get the latest results per mount point, starting a background probe when they are old
+
+        Returns:
+            dict: Results keyed by mount point (empty until the first probe
+            finishes), or None when no mount point is configured
+        """
+        if not self.paths:
+            return None
+
+        with self._lock:
+            results = dict(self.results)
+            running = self._thread is not None and self._thread.is_alive()
+            oldest = min((result["measured_at"] for result in results.values()), default=0.0)
+            if not running and (len(results) < len(self.paths) or time.time() - oldest > self.interval):
+                self._thread = threading.Thread(target=self._run, name="polaris-storage-probe", daemon=True)
+                self._thread.start()
+        return results
@@ -11,15 +11,21 @@ from typing import Any, Dict, List, Optional
 
 import psutil
 
+from app.core.instrumentation import instrumentation, instrumented
+from app.core.inventory_watcher import INTERFACES, MOUNTS, InventoryWatcher
 from app.utils.system_utils import get_platform_info, safe_subprocess_run
 
 
 class SystemDetector:
     """System detection and monitoring class"""
     
-    def __init__(self):
+    def __init__(self, inventory: Optional[InventoryWatcher] = None):
         self.platform_info = get_platform_info()
+        self.inventory = inventory or InventoryWatcher()
+        # Built on first use and reused; a new MacMon per call leaks memory over months
+        self._macmon = None
     
+    @instrumented("system_detector.get_mac_disk_usage")
     async def get_mac_disk_usage(self) -> Optional[int]:
         """Get macOS-specific disk usage via diskutil"""
         if sys.platform != "darwin":
@@ -51,21 +57,24 @@ class SystemDetector:
 
         return None
 
+    @instrumented("system_detector.get_macmon_data")
     async def get_macmon_data(self) -> Optional[Dict[str, Any]]:
         """Get detailed Mac system metrics via macmon library"""
         if sys.platform != "darwin":
             return None
 
         try:
-            from macmon import MacMon
-            macmon = MacMon()
-            data = await macmon.get_metrics_async()
+            if self._macmon is None:
+                from macmon import MacMon
+                self._macmon = MacMon()
+            data = await self._macmon.get_metrics_async()
             json_data = json.loads(data)
             return json_data
         except Exception as e:
             print(f"⚠️ Error retrieving macmon data: {e}")
             return None
     
+    @instrumented("system_detector.get_cpu_info")
     def get_cpu_info(self) -> Dict[str, Any]:
         """Get detailed CPU information"""
         cpu_info = {
@@ -81,6 +90,7 @@ class SystemDetector:
         
         return cpu_info
     
+    @instrumented("system_detector.get_memory_info")
     def get_memory_info(self) -> Dict[str, Any]:
         """Get detailed memory information"""
         return {
@@ -92,6 +102,11 @@ class SystemDetector:
         """Get detailed disk information"""
         # Get Mac-specific disk usage if available
         mac_disk_usage = await self.get_mac_disk_usage()
+        return self.collect_disk_info(mac_disk_usage)
+    
+    @instrumented("system_detector.collect_disk_info")
+    def collect_disk_info(self, mac_disk_usage: Optional[int] = None) -> Dict[str, Any]:
+        """Collect disk information (blocking), applying Mac disk usage if given"""
         disk_usage = psutil.disk_usage("/")._asdict()
         
         if mac_disk_usage:
@@ -101,33 +116,50 @@ class SystemDetector:
         
         return {
             "disk_usage": disk_usage,
-            "disk_partitions": [p._asdict() for p in psutil.disk_partitions()],
+            "disk_partitions": self.inventory.get(MOUNTS, self._list_partitions),
         }
     
+    @staticmethod
+    def _list_partitions() -> List[Dict[str, Any]]:
+        """List mounted partitions (re-run only after the mount table changes)"""
+        with instrumentation.timer("system_detector.disk_partitions"):
+            return [p._asdict() for p in psutil.disk_partitions()]
+    
+    @staticmethod
+    def _list_interfaces() -> Dict[str, Any]:
+        """List interface addresses and link state (re-run only after a link or address change)"""
+        with instrumentation.timer("system_detector.network_interfaces"):
+            return {
+                "network_interfaces": {
+                    name: [addr._asdict() for addr in addrs] 
+                    for name, addrs in psutil.net_if_addrs().items()
+                },
+                "network_stats": {
+                    name: stats._asdict() 
+                    for name, stats in psutil.net_if_stats().items()
+                },
+            }
+    
+    @instrumented("system_detector.get_network_info")
     def get_network_info(self) -> Dict[str, Any]:
         """Get network interface information"""
         return {
             "network_io": psutil.net_io_counters()._asdict(),
-            "network_interfaces": {
-                name: [addr._asdict() for addr in addrs] 
-                for name, addrs in psutil.net_if_addrs().items()
-            },
-            "network_stats": {
-                name: stats._asdict() 
-                for name, stats in psutil.net_if_stats().items()
-            },
+            **self.inventory.get(INTERFACES, self._list_interfaces),
         }
     
+    @instrumented("system_detector.get_environment_info")
     def get_environment_info(self) -> Dict[str, Any]:
         """Get Python and PyTorch environment information"""
         env_info = {}
         
         # Get Python packages
         try:
-            packages = subprocess.check_output(
-                sys.executable + " -m pip list --format=json", 
-                shell=True
-            )
+            with instrumentation.timer("system_detector.pip_list"):
+                packages = subprocess.check_output(
+                    sys.executable + " -m pip list --format=json", 
+                    shell=True
+                )
             packages = packages.decode("utf-8")
             env_info["packages"] = json.loads(packages)
         except Exception as e:
@@ -135,16 +167,18 @@ class SystemDetector:
 
         # Get PyTorch environment
         try:
-            output = subprocess.check_output(
-                sys.executable + " -m torch.utils.collect_env", 
-                shell=True
-            )
+            with instrumentation.timer("system_detector.collect_env"):
+                output = subprocess.check_output(
+                    sys.executable + " -m torch.utils.collect_env", 
+                    shell=True
+                )
             env_info["pytorch_env"] = output.decode("utf-8")
         except Exception as e:
             env_info["pytorch_env_error"] = f"Failed to get PyTorch environment: {e}"
 
         return env_info
     
+    @instrumented("system_detector.get_realtime_metrics")
     def get_realtime_metrics(self) -> Dict[str, Any]:
         """Get lightweight real-time performance metrics"""
         return {
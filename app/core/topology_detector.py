@@ -0,0 +1,232 @@
+"""
+🌟 Polaris System Detection API - NUMA and Device Affinity Topology
+"""
+
+import glob
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import psutil
+
+from app.config.settings import settings
+from app.core.cgroup_detector import parse_cpu_list
+from app.core.gpu_backends import GPUBackend, GPUBackendError
+from app.core.instrumentation import instrumented
+
+# PCI class prefixes (class code >> 16) reported as devices
+PCI_DEVICE_KINDS = {"0x02": "nic", "0x03": "gpu", "0x12": "accelerator"}
+
+# Per-node meminfo lines read to estimate available memory as the kernel's MemAvailable does
+NODE_MEMINFO_FIELDS = ("MemTotal:", "MemFree:", "Active(file):", "Inactive(file):", "SReclaimable:")
+
+
+def format_cpu_list(cpus: List[int]) -> str:
+    """Format CPU numbers as a cpuset list such as ``0-3,6``"""
+    ranges = []
+    for cpu in sorted(set(cpus)):
+        if ranges and ranges[-1][1] == cpu - 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+def _read(path: str) -> Optional[str]:
+    """Read a small sysfs attribute, or None if it is missing"""
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class TopologyDetector:
+    """
+    NUMA nodes and the CPUs and memory node local to each GPU and NIC
+
+    The topology comes from ``/sys/devices/system/node`` and the PCI
+    devices' ``numa_node`` and ``local_cpulist``, plus the GPU library's
+    CPU affinity where it reports one. It does not change while the host
+    runs, so it is built once; only the per-node memory usage is re-read.
+    """
+
+    def __init__(
+        self,
+        sys_root: Optional[str] = None,
+        gpu_backend: Optional[GPUBackend] = None,
+        proc_root: Optional[str] = None,
+    ):
+        self.sys_root = sys_root or settings.sys_root
+        self.proc_root = proc_root or settings.proc_root
+        self.gpu_backend = gpu_backend
+        self._topology: Optional[Dict[str, Any]] = None
+        self._reserves: Optional[Dict[int, Tuple[int, int]]] = None
+        self._lock = threading.Lock()
+
+    def _node_dirs(self) -> List[str]:
+        """Get the NUMA node directories in node order"""
+        dirs = glob.glob(os.path.join(self.sys_root, "devices", "system", "node", "node[0-9]*"))
+        return sorted(dirs, key=lambda path: int(os.path.basename(path)[4:]))
+
+    def _build_nodes(self) -> List[Dict[str, Any]]:
+        """Get each NUMA node's CPUs and distances"""
+        nodes = []
+        for path in self._node_dirs():
+            cpus = _read(os.path.join(path, "cpulist")) or ""
+            distances = (_read(os.path.join(path, "distance")) or "").split()
+            nodes.append({
+                "node": int(os.path.basename(path)[4:]),
+                "cpus": cpus,
+                "cpu_count": parse_cpu_list(cpus),
+                "distances": [int(distance) for distance in distances],
+            })
+
+        if not nodes:
+            # Without NUMA support everything is local to a single node
+            if hasattr(os, "sched_getaffinity"):
+                cpus = format_cpu_list(list(os.sched_getaffinity(0)))
+            else:
+                cpus = format_cpu_list(list(range(os.cpu_count() or 1)))
+            nodes.append({"node": 0, "cpus": cpus, "cpu_count": parse_cpu_list(cpus), "distances": [10]})
+        return nodes
+
+    def _build_devices(self) -> List[Dict[str, Any]]:
+        """Get the GPUs, NICs and accelerators on the PCI bus with their local node and CPUs"""
+        try:
+            affinity = self.gpu_backend.get_cpu_affinity() if self.gpu_backend is not None else {}
+        except GPUBackendError as e:
+            print(f"⚠️ Error getting GPU CPU affinity: {e}")
+            affinity = {}
+
+        devices = []
+        for path in sorted(glob.glob(os.path.join(self.sys_root, "bus", "pci", "devices", "*"))):
+            kind = PCI_DEVICE_KINDS.get((_read(os.path.join(path, "class")) or "")[:4])
+            if kind is None:
+                continue
+
+            address = os.path.basename(path)
+            numa_node = int(_read(os.path.join(path, "numa_node")) or -1)
+            interfaces = sorted(
+                os.path.basename(interface)
+                for interface in glob.glob(os.path.join(path, "net", "*")) + glob.glob(os.path.join(path, "virtio*", "net", "*"))
+            )
+            library_cpus = affinity.get(address)
+            devices.append({
+                "pci_address": address,
+                "kind": kind,
+                "vendor": _read(os.path.join(path, "vendor")),
+                "device": _read(os.path.join(path, "device")),
+                "numa_node": numa_node if numa_node >= 0 else None,
+                "local_cpus": _read(os.path.join(path, "local_cpulist")),
+                "library_cpus": format_cpu_list(library_cpus) if library_cpus else None,
+                "interfaces": interfaces,
+            })
+        return devices
+
+    def get_static_topology(self) -> Dict[str, Any]:
+        """Get the NUMA nodes and devices, building them on first use"""
+        if self._topology is None:
+            with self._lock:
+                if self._topology is None:
+                    self._topology = {"nodes": self._build_nodes(), "devices": self._build_devices()}
+        return self._topology
+
+    def _node_reserves(self) -> Dict[int, Tuple[int, int]]:
+        """
+        Get the reserved and low-watermark memory (bytes) of each node from ``/proc/zoneinfo``
+
+        Reserved memory is each zone's high watermark plus its largest
+        lowmem protection, as the kernel subtracts for ``MemAvailable``.
+        Watermarks only change with ``vm.min_free_kbytes``, so they are
+        read once.
+        """
+        if self._reserves is None:
+            page_size = os.sysconf("SC_PAGE_SIZE")
+            reserves: Dict[int, List[int]] = {}
+            node = None
+            # Zones start with "Node 0, zone   Normal"; watermarks are in pages
+            for line in (_read(os.path.join(self.proc_root, "zoneinfo")) or "").splitlines():
+                fields = line.replace(",", " ").replace("(", " ").replace(")", " ").split()
+                if fields[:1] == ["Node"]:
+                    node = int(fields[1])
+                    reserves.setdefault(node, [0, 0])
+                elif node is None or len(fields) < 2:
+                    continue
+                elif fields[0] == "high":
+                    reserves[node][0] += int(fields[1]) * page_size
+                elif fields[0] == "low":
+                    reserves[node][1] += int(fields[1]) * page_size
+                elif fields[0] == "protection:":
+                    reserves[node][0] += max(int(field) for field in fields[1:]) * page_size
+            self._reserves = {node: (reserved, low) for node, (reserved, low) in reserves.items()}
+        return self._reserves
+
+    def get_node_memory(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Get the memory total, used and free (bytes) of each NUMA node
+
+        Free memory is estimated per node the way the kernel estimates
+        ``MemAvailable`` (free pages above the reserves, plus the page
+        cache and reclaimable slab that can be dropped), so node usage
+        agrees with ``/polaris/memory`` and with the single-node fallback
+        for hosts without NUMA.
+        """
+        reserves = self._node_reserves()
+        memory = {}
+        for path in self._node_dirs():
+            node = int(os.path.basename(path)[4:])
+            values = {}
+            # Lines look like "Node 0 MemTotal:       16318412 kB"
+            for line in (_read(os.path.join(path, "meminfo")) or "").splitlines():
+                fields = line.split()
+                if len(fields) >= 4 and fields[2] in NODE_MEMINFO_FIELDS:
+                    values[fields[2][:-1]] = int(fields[3]) * 1024
+            if "MemTotal" in values and "MemFree" in values:
+                total = values["MemTotal"]
+                reserved, low = reserves.get(node, (0, 0))
+                page_cache = values.get("Active(file)", 0) + values.get("Inactive(file)", 0)
+                reclaimable = values.get("SReclaimable", 0)
+                free = (
+                    values["MemFree"] - reserved
+                    + page_cache - min(page_cache // 2, low)
+                    + reclaimable - min(reclaimable // 2, low)
+                )
+                free = max(0, min(total, free))
+                memory[node] = {
+                    "memory_total": total,
+                    "memory_used": total - free,
+                    "memory_free": free,
+                }
+
+        if not memory:
+            virtual_memory = psutil.virtual_memory()
+            memory[0] = {
+                "memory_total": virtual_memory.total,
+                "memory_used": virtual_memory.total - virtual_memory.available,
+                "memory_free": virtual_memory.available,
+            }
+        return memory
+
+    @instrumented("topology_detector.get_topology")
+    def get_topology(self) -> Dict[str, Any]:
+        """
+        Get the host topology with current per-node memory usage
+
+        Returns:
+            dict: ``nodes`` (CPUs, distances and memory per NUMA node) and
+            ``devices`` (GPUs, NICs and accelerators with their local node
+            and CPUs)
+        """
+        topology = self.get_static_topology()
+        memory = self.get_node_memory()
+        nodes = []
+        for node in topology["nodes"]:
+            usage = memory.get(node["node"], {})
+            total = usage.get("memory_total")
+            nodes.append({
+                **node,
+                **usage,
+                "memory_percent": round(100.0 * usage["memory_used"] / total, 2) if total else None,
+            })
+        return {"nodes": nodes, "devices": topology["devices"]}
@@ -2,11 +2,89 @@
 🌟 Polaris System Detection API - Main Application
 """
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api import main_routes, polaris_routes
+from app.api.middleware import InstrumentationMiddleware
 from app.config.settings import settings
+from app.core.collector_executor import CollectorTimeoutError, collector_executor
+from app.core.memory_profiler import MemoryProfilingError
+from app.core.metric_history import HistoryDisabledError
+from app.core.polaris_manager import get_existing_polaris_manager, get_polaris_manager_async
+from app.utils.startup_profiler import startup_profiler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    # Build detectors in the background so /health answers immediately
+    warm_up = None
+    if settings.warm_up_on_startup:
+        warm_up = asyncio.create_task(get_polaris_manager_async())
+    
+    # Record the metric history, export metrics and track agent memory here
+    # unless a shared sampler process does
+    recorder = None
+    if not settings.shared_snapshot_name:
+        recorder = asyncio.create_task(record_samples())
+    
+    # Diff the hardware inventory for the change feed
+    watcher = None
+    if settings.changes_enabled:
+        watcher = asyncio.create_task(watch_inventory())
+    
+    yield
+    
+    if warm_up is not None and not warm_up.done():
+        warm_up.cancel()
+    if watcher is not None:
+        watcher.cancel()
+    if recorder is not None:
+        recorder.cancel()
+        # Without a manager nothing was recorded; don't build one just to close it
+        manager = get_existing_polaris_manager()
+        if manager is not None:
+            await asyncio.to_thread(manager.close_recorders)
+    collector_executor.shutdown()
+
+
+async def record_samples() -> None:
+    """Record and export host samples (or only track agent memory) for the lifetime of the app"""
+    manager = await get_polaris_manager_async()
+    await manager.record_samples()
+
+
+async def watch_inventory() -> None:
+    """Feed inventory changes into the change feed for the lifetime of the app"""
+    manager = await get_polaris_manager_async()
+    await manager.watch_inventory()
+
+
+async def collector_timeout_handler(request: Request, exc: CollectorTimeoutError) -> JSONResponse:
+    """Report a collector that missed its deadline as a gateway timeout"""
+    return JSONResponse(
+        status_code=504,
+        content={
+            "detail": str(exc),
+            "collector": exc.collector,
+            "timeout": exc.timeout,
+        },
+    )
+
+
+async def history_disabled_handler(request: Request, exc: HistoryDisabledError) -> JSONResponse:
+    """Report history queries while the history is disabled as not found"""
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+async def memory_profiling_handler(request: Request, exc: MemoryProfilingError) -> JSONResponse:
+    """Report snapshot requests while profiling is disabled, or for an unknown snapshot, as not found"""
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
 
 
 def create_app() -> FastAPI:
@@ -18,7 +96,8 @@ def create_app() -> FastAPI:
         description=settings.description,
         version=settings.version,
         docs_url=settings.docs_url,
-        redoc_url=settings.redoc_url
+        redoc_url=settings.redoc_url,
+        lifespan=lifespan
     )
 
     # Add CORS middleware
@@ -30,6 +109,14 @@ def create_app() -> FastAPI:
         allow_headers=settings.cors_headers,
     )
 
+    # Per-route latency histograms and Server-Timing headers (outermost)
+    app.add_middleware(InstrumentationMiddleware)
+
+    # Report collectors that miss their deadline as 504s
+    app.add_exception_handler(CollectorTimeoutError, collector_timeout_handler)
+    app.add_exception_handler(HistoryDisabledError, history_disabled_handler)
+    app.add_exception_handler(MemoryProfilingError, memory_profiling_handler)
+
     # Include routers
     app.include_router(main_routes.router)
     app.include_router(polaris_routes.router)
@@ -43,7 +130,8 @@ def create_app() -> FastAPI:
 
 
 # Create the app instance
-app = create_app()
+with startup_profiler.phase("create_app"):
+    app = create_app()
 
 
 if __name__ == "__main__":
@@ -14,6 +14,7 @@ class GPUInfo(BaseModel):
     free_memory: Union[int, str]
     used_memory: Union[int, str]
     utilization: Union[int, str]
+    stale: bool = False
 
 
 class GPUSummary(BaseModel):
@@ -21,6 +22,7 @@ class GPUSummary(BaseModel):
     name: str
     utilization: Union[int, str]
     memory_used_percent: Union[float, str]
+    stale: bool = False
 
 
 class MemoryInfo(BaseModel):
@@ -128,6 +130,7 @@ class MemoryDetectionResponse(BaseModel):
 class DiskDetectionResponse(BaseModel):
     """Disk detection response"""
     polaris_disk_detection: Dict[str, Any]
+    storage_probe: Optional[Dict[str, Dict[str, Any]]] = None
     detection_timestamp: float
 
 
@@ -149,6 +152,145 @@ class RealtimeMonitoringResponse(BaseModel):
     detection_timestamp: float
 
 
+class GPUStatus(BaseModel):
+    """GPU status entry of the realtime monitoring payload"""
+    name: str
+    utilization: Union[int, float, str]
+    memory_used_percent: Union[float, str]
+    stale: bool = False
+
+
+class ContainerMetrics(BaseModel):
+    """cgroup v2 capacity and usage, with PSI stall percentages"""
+    cgroup: Optional[str] = None
+    cpu_limit: float
+    memory_limit: Optional[int] = None
+    memory_used: Optional[int] = None
+    memory_percent: Optional[float] = None
+    cpu_usage: Optional[float] = None
+    cpu_percent: Optional[float] = None
+    cpu_throttled_percent: Optional[float] = None
+    io_read_bytes_per_sec: Optional[float] = None
+    io_write_bytes_per_sec: Optional[float] = None
+    pressure: Dict[str, float] = {}
+
+
+class CgroupUsage(BaseModel):
+    """Resource usage of one cgroup"""
+    path: str
+    depth: int
+    memory_used: Optional[int] = None
+    cpu_usage: Optional[float] = None
+    io_read_bytes_per_sec: Optional[float] = None
+    io_write_bytes_per_sec: Optional[float] = None
+
+
+class CgroupsResponse(BaseModel):
+    """Per-cgroup resource breakdown response"""
+    polaris_cgroups: List[CgroupUsage]
+    cgroup_count: int
+    detection_timestamp: float
+
+
+class NUMANode(BaseModel):
+    """NUMA node with its CPUs, distances and memory usage"""
+    node: int
+    cpus: str
+    cpu_count: int
+    distances: List[int] = []
+    memory_total: Optional[int] = None
+    memory_used: Optional[int] = None
+    memory_free: Optional[int] = None
+    memory_percent: Optional[float] = None
+
+
+class PCIDeviceTopology(BaseModel):
+    """GPU, NIC or accelerator with the NUMA node and CPUs local to it"""
+    pci_address: str
+    kind: str
+    vendor: Optional[str] = None
+    device: Optional[str] = None
+    numa_node: Optional[int] = None
+    local_cpus: Optional[str] = None
+    library_cpus: Optional[str] = None
+    interfaces: List[str] = []
+
+
+class TopologyInfo(BaseModel):
+    """Host NUMA and device affinity topology"""
+    nodes: List[NUMANode]
+    devices: List[PCIDeviceTopology] = []
+
+
+class TopologyDetectionResponse(BaseModel):
+    """Topology detection response"""
+    polaris_topology_detection: TopologyInfo
+    detection_timestamp: float
+
+
+class CapabilityResponse(BaseModel):
+    """Hardware capability microbenchmark results compared with the CPU model's baseline"""
+    status: str
+    sku: str
+    measured_at: Optional[float] = None
+    age: Optional[float] = None
+    duration: Optional[float] = None
+    metrics: Dict[str, float] = {}
+    baseline: Optional[Dict[str, float]] = None
+    ratios: Dict[str, float] = {}
+    slow_metrics: List[str] = []
+    slow: bool = False
+    error: Optional[str] = None
+
+
+class HistoryResponse(BaseModel):
+    """Metric history from one rollup tier; points are [bucket start, min, max, avg]"""
+    tier: str
+    resolution: int
+    start: float
+    end: float
+    series: Dict[str, List[List[float]]]
+
+
+class SeriesResponse(BaseModel):
+    """Chart-ready metric history; points are [time, avg], at most ``points`` per series"""
+    tier: str
+    resolution: int
+    start: float
+    end: float
+    points: int
+    series: Dict[str, List[List[float]]]
+
+
+class ChangeEvent(BaseModel):
+    """One inventory change; ``before``/``after`` hold the attributes that differ"""
+    sequence: int
+    timestamp: float
+    kind: str
+    key: str
+    change: str
+    before: Optional[Dict[str, Any]] = None
+    after: Optional[Dict[str, Any]] = None
+
+
+class ChangesResponse(BaseModel):
+    """Inventory change events after a sequence number"""
+    epoch: str
+    sequence: int
+    events: List[ChangeEvent]
+    reset: bool
+
+
+class RealtimeMetrics(BaseModel):
+    """Decoded realtime monitoring payload (used by the Polaris client)"""
+    cpu_percent: float
+    memory_percent: float
+    disk_percent: float
+    gpu_status: List[GPUStatus] = []
+    container: Optional[ContainerMetrics] = None
+    detection_timestamp: float
+
+
 class PolarisRootResponse(BaseModel):
     """Root endpoint response"""
     api_name: str = "🌟 Polaris System Detection API"
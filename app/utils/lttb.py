@@ -0,0 +1,119 @@
+"""
+🌟 Polaris System Detection API - LTTB Downsampling
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# Buckets up to this many points are solved for every possible previous
+# point at once (work grows with the square of the width); wider buckets
+# are walked one at a time, where the numpy call overhead per bucket is
+# small next to the work it saves
+TABLE_MAX_WIDTH = 16
+# Elements of the (bucket, previous point, point) area array computed at once
+TABLE_CHUNK_ELEMENTS = 1 << 16
+
+
+def lttb(x: Sequence[float], y: Sequence[float], threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets
+
+    Keeps the first and last points and, from each of ``threshold - 2``
+    equal buckets in between, the point forming the largest triangle with
+    the previously kept point and the average of the next bucket. Peaks and
+    dips survive, unlike with plain averaging.
+
+    Each choice depends on the point kept in the bucket before, so the
+    buckets cannot simply be solved side by side. Narrow buckets (at most
+    ``TABLE_MAX_WIDTH`` points) are padded to equal length and solved for
+    every point of the previous bucket at once, one argmax per row; the
+    actual choices are then a lookup per bucket. Wider buckets are walked
+    in order with numpy over each bucket's points. Around 16 to 32 points
+    per bucket neither is much faster than plain Python.
+
+    Args:
+        x: Point times, ascending
+        y: Point values
+        threshold: Number of points to keep (at least 3)
+
+    Returns:
+        tuple: (x, y) arrays of at most ``threshold`` points
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold < 3:
+        raise ValueError("LTTB needs a threshold of at least 3 points")
+    if n <= threshold:
+        return x.copy(), y.copy()
+
+    # Edges of the threshold - 2 buckets over the points between first and last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    counts = np.diff(edges)
+    average_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    average_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # Each bucket looks ahead to the next bucket's average, the last one to the last point
+    next_x = np.append(average_x[1:], x[-1])
+    next_y = np.append(average_y[1:], y[-1])
+
+    if counts.max() <= TABLE_MAX_WIDTH:
+        selected = _select_by_table(x, y, edges, counts, next_x, next_y)
+    else:
+        selected = _select_by_walk(x, y, edges, next_x, next_y)
+    kept = np.concatenate(([0], selected, [n - 1]))
+    return x[kept], y[kept]
+
+
+def _select_by_walk(
+    x: np.ndarray, y: np.ndarray, edges: np.ndarray, next_x: np.ndarray, next_y: np.ndarray
+) -> np.ndarray:
+    """Choose the point of each bucket in order, one bucket at a time"""
+    selected = np.empty(len(edges) - 1, dtype=np.intp)
+    previous = 0
+    for bucket in range(len(selected)):
+        start, end = edges[bucket], edges[bucket + 1]
+        previous_x, previous_y = x[previous], y[previous]
+        # Twice the triangle area; the constant factor does not change the argmax
+        areas = np.abs(
+            (previous_x - next_x[bucket]) * (y[start:end] - previous_y)
+            - (previous_x - x[start:end]) * (next_y[bucket] - previous_y)
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket] = previous
+    return selected
+
+
+def _select_by_table(
+    x: np.ndarray, y: np.ndarray, edges: np.ndarray, counts: np.ndarray, next_x: np.ndarray, next_y: np.ndarray
+) -> np.ndarray:
+    """Choose the point of each bucket from a table of choices for every possible previous point"""
+    buckets = len(counts)
+    width = int(counts.max())
+    # Buckets as rows padded to the widest one; padding never wins the argmax
+    offsets = np.arange(width)
+    padding = offsets >= counts[:, None]
+    indices = np.minimum(edges[:-1, None] + offsets, len(x) - 2)
+    # The candidates kept before each bucket: the first point, then the previous bucket
+    previous = np.vstack((np.zeros((1, width), dtype=np.intp), indices[:-1]))
+
+    # table[bucket, i]: column chosen in the bucket when column i of the previous one was kept
+    table = np.empty((buckets, width), dtype=np.intp)
+    step = max(1, TABLE_CHUNK_ELEMENTS // (width * width))
+    for first in range(0, buckets, step):
+        rows = slice(first, first + step)
+        previous_x, previous_y = x[previous[rows]][:, :, None], y[previous[rows]][:, :, None]
+        areas = np.abs(
+            (previous_x - next_x[rows, None, None]) * (y[indices[rows]][:, None, :] - previous_y)
+            - (previous_x - x[indices[rows]][:, None, :]) * (next_y[rows, None, None] - previous_y)
+        )
+        areas[np.broadcast_to(padding[rows, None, :], areas.shape)] = -1.0
+        table[rows] = np.argmax(areas, axis=2)
+
+    # Follow the table from the first point, which is column 0 before the first bucket
+    column = 0
+    columns = []
+    for choices in table.tolist():
+        column = choices[column]
+        columns.append(column)
+    return indices[np.arange(buckets), columns]
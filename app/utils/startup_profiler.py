@@ -0,0 +1,123 @@
+"""
+🌟 Polaris System Detection API - Startup Profiler
+"""
+
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupProfiler:
+    """
+    Measure import and initialization time during startup
+
+    Initialization phases (detectors, manager, app creation) are always
+    timed because that costs a couple of perf_counter calls. Import timing
+    wraps ``__import__`` and is only active between ``enable()`` and
+    ``disable()``, which ``python main.py --profile-startup`` does.
+    """
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float, float]] = []
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self._original_import = None
+        self._stack: List[float] = []
+        self._started = time.perf_counter()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether import timing is active"""
+        return self._original_import is not None
+
+    def enable(self) -> None:
+        """Start timing imports of modules that are not loaded yet"""
+        if self.enabled:
+            return
+        self._original_import = builtins.__import__
+        self._started = time.perf_counter()
+        builtins.__import__ = self._timed_import
+
+    def disable(self) -> None:
+        """Stop timing imports"""
+        if self.enabled:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """__import__ replacement recording cumulative and self time per new module"""
+        original_import = self._original_import
+        if level or name in sys.modules:
+            return original_import(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start_time = time.perf_counter()
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.imports[name] = (elapsed, elapsed - children)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time an initialization phase"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start_time, time.perf_counter() - start_time))
+
+    def get_report(self, top: int = 25) -> Dict[str, object]:
+        """
+        Summarize startup time
+
+        Returns:
+            dict: Phases, slowest imports (cumulative and self) and per-package self time
+        """
+        packages: Dict[str, float] = {}
+        for name, (_, self_time) in self.imports.items():
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0.0) + self_time
+
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return {
+            "elapsed_s": time.perf_counter() - self._started,
+            "phases": [
+                {"name": name, "seconds": seconds}
+                for name, _, seconds in sorted(self.phases, key=lambda phase: phase[1])
+            ],
+            "imports": [
+                {"module": name, "cumulative_s": cumulative, "self_s": self_time}
+                for name, (cumulative, self_time) in slowest
+            ],
+            "packages": dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]),
+        }
+
+    def print_report(self, top: int = 25) -> None:
+        """Print the startup breakdown"""
+        report = self.get_report(top)
+
+        print("\n⏱️  Initialization phases:")
+        for phase in report["phases"]:
+            print(f"   {phase['seconds'] * 1000:>9.1f}ms  {phase['name']}")
+
+        if report["imports"]:
+            print(f"\n📦 Slowest imports (top {top}, cumulative / self):")
+            for item in report["imports"]:
+                print(
+                    f"   {item['cumulative_s'] * 1000:>9.1f}ms {item['self_s'] * 1000:>9.1f}ms  {item['module']}"
+                )
+
+            print("\n📚 Import self time by package:")
+            for package, seconds in report["packages"].items():
+                print(f"   {seconds * 1000:>9.1f}ms  {package}")
+
+        print(f"\n🏁 Total startup: {report['elapsed_s'] * 1000:.1f}ms")
+
+
+# Global startup profiler instance
+startup_profiler = StartupProfiler()
@@ -0,0 +1,49 @@
+"""
+🌟 Polaris System Detection API - Statistics Utilities
+"""
+
+from typing import Dict, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Compute a percentile with linear interpolation
+
+    Args:
+        values: Sample values (need not be sorted)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: Percentile value, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * (pct / 100.0)
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_latencies(samples: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples given in seconds
+
+    Args:
+        samples: Latency samples in seconds
+
+    Returns:
+        dict: Count plus mean, p50, p95, p99 and max in milliseconds
+    """
+    if not samples:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+    return {
+        "count": len(samples),
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000,
+    }
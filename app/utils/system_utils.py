@@ -2,15 +2,18 @@
 🌟 Polaris System Detection API - System Utilities
 """
 
+import functools
+import importlib.metadata
 import platform
 import subprocess
 import sys
-from typing import Optional
+from typing import Dict, Optional
 
 
+@functools.lru_cache(maxsize=None)
 def is_wsl() -> bool:
     """
-    Detect if running on Windows Subsystem for Linux
+    Detect if running on Windows Subsystem for Linux (cached, as it cannot change)
     
     Returns:
         bool: True if running on WSL, False otherwise
@@ -49,6 +52,46 @@ def get_platform_info() -> dict:
     }
 
 
+@functools.lru_cache(maxsize=None)
+def get_cpu_model() -> str:
+    """
+    Get the CPU model name (cached, as it cannot change)
+    
+    Returns:
+        str: Model name such as "AMD EPYC 7763 64-Core Processor", or the architecture when unknown
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/cpuinfo") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if key.strip() in ("model name", "Model", "cpu model"):
+                        return value.strip()
+        except OSError:
+            pass
+    elif sys.platform == "darwin":
+        try:
+            return subprocess.check_output(["sysctl", "-n", "machdep.cpu.brand_string"], text=True).strip()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            pass
+    return platform.processor() or platform.machine()
+
+
+def get_installed_packages() -> Dict[str, str]:
+    """
+    Get the installed Python distributions of this interpreter without running pip
+    
+    Returns:
+        dict: Version by distribution name
+    """
+    packages = {}
+    for distribution in importlib.metadata.distributions():
+        name = distribution.metadata["Name"]
+        if name:
+            packages[name] = distribution.version
+    return packages
+
+
 def safe_subprocess_run(command: str, shell: bool = True) -> Optional[str]:
     """
     Safely run a subprocess command with error handling
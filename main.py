@@ -2,28 +2,164 @@
 🌟 Polaris System Detection API - Root Entry Point
 """
 
-import uvicorn
+import argparse
+import asyncio
+import inspect
+import os
+import signal
+import stat
+import sys
 
-from app.config.settings import settings
-from app.main import app
 
-if __name__ == "__main__":
+async def _first_request(app) -> int:
+    """Serve one detection request in-process and return its status code"""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://polaris") as client:
+        response = await client.get("/polaris/detect")
+    return response.status_code
+
+
+def profile_startup():
+    """Print an import and initialization time breakdown, then exit"""
+    from app.utils.startup_profiler import startup_profiler
+
+    startup_profiler.enable()
+    with startup_profiler.phase("import app.main"):
+        from app.main import app
+    with startup_profiler.phase("first request /polaris/detect"):
+        status_code = asyncio.run(_first_request(app))
+    startup_profiler.disable()
+
+    print("🌟 ================================")
+    print("🌟  POLARIS STARTUP PROFILE")
+    print("🌟 ================================")
+    print(f"📡 First request status: {status_code}")
+    startup_profiler.print_report()
+    print("🌟 ================================")
+
+
+def bind_tcp_socket(config):
+    """
+    Bind the TCP listener with TCP_NODELAY
+
+    uvicorn creates pre-bound listeners with proto 0, so asyncio does not
+    enable TCP_NODELAY on accepted connections and keep-alive requests stall
+    on Nagle's algorithm and delayed ACKs (~40ms). Accepted sockets inherit
+    the option from the listener.
+    """
+    import socket
+
+    sock = config.bind_socket()
+    if sock.family in (socket.AF_INET, socket.AF_INET6):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def bind_unix_socket(path: str):
+    """Bind the Unix domain socket listener, replacing a stale socket file"""
+    import socket
+
+    if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+        os.remove(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    os.chmod(path, 0o660)
+    return sock
+
+
+def serve_sockets(config, sockets):
+    """Serve one app on several bound sockets (TCP and Unix), with any number of workers"""
+    import uvicorn
+
+    server = uvicorn.Server(config)
+    if config.workers > 1:
+        from uvicorn.supervisors import Multiprocess
+
+        # Older uvicorn releases take the worker entry point explicitly
+        kwargs = {"target": server.run} if "target" in inspect.signature(Multiprocess).parameters else {}
+        Multiprocess(config, sockets=sockets, **kwargs).run()
+    else:
+        server.run(sockets=sockets)
+
+
+def main():
+    """Start the Polaris server"""
+    import uvicorn
+
+    from app.config.settings import settings
+
     print("🌟 ================================")
     print("🌟  POLARIS SYSTEM DETECTION API")
     print("🌟 ================================")
     print(f"🚀 Starting Polaris on http://{settings.host}:{settings.port}")
     print(f"📖 API Docs: http://{settings.host}:{settings.port}{settings.docs_url}")
-    
+
     if settings.legacy_compatible:
         print(f"🔄 Legacy Port: {settings.legacy_port}")
         print(f"🔄 Compatibility: http://{settings.host}:{settings.port}{settings.legacy_prefix}")
-    
+
+    if settings.uds_path:
+        print(f"🔌 Unix socket: {settings.uds_path}")
+
+    # Several workers share one host sampler instead of each probing the host
+    sampler = None
+    if settings.workers > 1:
+        print(f"👷 Workers: {settings.workers}")
+        if settings.shared_snapshot_enabled:
+            from app.core.sampler import SamplerProcess
+            sampler = SamplerProcess().start()
+            os.environ["POLARIS_SHARED_SNAPSHOT_NAME"] = sampler.name
+
     print("🌟 ================================")
-    
-    uvicorn.run(
-        "app.main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=settings.reload,
-        log_level=settings.log_level
-    ) 
\ No newline at end of file
+
+    # uvicorn re-raises SIGTERM once it has shut down; exit normally instead
+    # so the sampler and the Unix socket are cleaned up below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        if settings.uds_path or settings.workers > 1:
+            # Bind the listeners here: TCP (with TCP_NODELAY) plus the optional
+            # Unix socket, served by the same server or workers (no reload)
+            config = uvicorn.Config(
+                "app.main:app",
+                host=settings.host,
+                port=settings.port,
+                workers=settings.workers,
+                log_level=settings.log_level
+            )
+            sockets = [bind_tcp_socket(config)]
+            if settings.uds_path:
+                sockets.append(bind_unix_socket(settings.uds_path))
+            try:
+                serve_sockets(config, sockets)
+            finally:
+                if settings.uds_path and os.path.exists(settings.uds_path):
+                    os.remove(settings.uds_path)
+        else:
+            uvicorn.run(
+                "app.main:app",
+                host=settings.host,
+                port=settings.port,
+                reload=settings.reload,
+                log_level=settings.log_level
+            )
+    finally:
+        if sampler is not None:
+            sampler.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="🌟 Polaris System Detection API")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an import and initialization time breakdown instead of serving",
+    )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        profile_startup()
+    else:
+        main()
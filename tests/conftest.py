@@ -0,0 +1,9 @@
+"""
+🌟 Polaris System Detection API - Test Configuration
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path, so tests import ``app`` like the tools do
+sys.path.insert(0, str(Path(__file__).parent.parent))
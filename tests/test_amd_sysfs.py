@@ -0,0 +1,90 @@
+"""
+🌟 Polaris System Detection API - AMD sysfs Backend Tests
+"""
+
+import os
+
+import pytest
+
+from app.core.gpu_backends import GPUBackendError, SysfsAMDBackend
+from app.core.records import MISSING
+
+GIB = 1024 ** 3
+
+
+@pytest.fixture
+def drm_root(tmp_path):
+    """A fake /sys/class/drm with two AMD cards, a connector and an integrated non-AMD card"""
+    for index, vendor in enumerate(("0x1002", "0x1002", "0x8086")):
+        device = tmp_path / f"card{index}" / "device"
+        device.mkdir(parents=True)
+        (device / "vendor").write_text(f"{vendor}\n")
+        (device / "device").write_text("0x73bf\n")
+        (device / "mem_info_vram_total").write_text(f"{(16 + index) * GIB}\n")
+        (device / "mem_info_vram_used").write_text(f"{index * GIB}\n")
+        (device / "gpu_busy_percent").write_text(f"{index * 10}\n")
+    (tmp_path / "card0-DP-1").mkdir()
+    (tmp_path / "card0" / "device" / "product_name").write_text("Radeon Test\n")
+    return tmp_path
+
+
+@pytest.fixture
+def backend(drm_root):
+    backend = SysfsAMDBackend(root=str(drm_root))
+    backend.initialize()
+    yield backend
+    backend.close()
+
+
+def test_finds_only_amd_cards(drm_root):
+    assert SysfsAMDBackend.find_cards(str(drm_root)) == [
+        str(drm_root / "card0" / "device"),
+        str(drm_root / "card1" / "device"),
+    ]
+
+
+def test_no_cards_fails_to_initialize(tmp_path):
+    with pytest.raises(GPUBackendError):
+        SysfsAMDBackend(root=str(tmp_path)).initialize()
+
+
+def test_collect_devices_reads_the_tree(backend):
+    assert backend.collect_devices() == [
+        ("Radeon Test", 16 * GIB, 0, 16 * GIB, 0),
+        ("AMD GPU [0x73bf]", 17 * GIB, GIB, 16 * GIB, 10),
+    ]
+
+
+def test_cached_handles_see_new_values(backend, drm_root):
+    backend.collect_devices()
+    (drm_root / "card1" / "device" / "mem_info_vram_used").write_text(f"{4 * GIB}\n")
+    (drm_root / "card1" / "device" / "gpu_busy_percent").write_text("87\n")
+    assert backend.get_memory_info(1) == (17 * GIB, 4 * GIB, 13 * GIB)
+    assert backend.get_utilization(1) == 87
+
+
+def test_missing_attribute_reads_as_missing(drm_root):
+    # Like some APUs, card 0 has no busy percent
+    os.remove(drm_root / "card0" / "device" / "gpu_busy_percent")
+    backend = SysfsAMDBackend(root=str(drm_root))
+    backend.initialize()
+    try:
+        assert backend.get_utilization(0) is MISSING
+        assert backend.collect_devices()[0][4] is MISSING
+        assert backend.get_utilization(1) == 10
+    finally:
+        backend.close()
+
+
+def test_stale_handles_are_reopened(backend, drm_root):
+    # Close card 1's handles behind the backend's back, as a GPU reset leaves them failing
+    for fd in backend._fds[1]:
+        os.close(fd)
+    (drm_root / "card1" / "device" / "gpu_busy_percent").write_text("55\n")
+    assert backend.collect_devices()[1] == ("AMD GPU [0x73bf]", 17 * GIB, GIB, 16 * GIB, 55)
+
+
+def test_unreadable_attribute_raises(backend, drm_root):
+    (drm_root / "card1" / "device" / "gpu_busy_percent").write_text("busy\n")
+    with pytest.raises(GPUBackendError):
+        backend.get_utilization(1)
@@ -0,0 +1,119 @@
+"""
+🌟 Polaris System Detection API - cgroup v2 and PSI Detector Tests
+"""
+
+import os
+
+import pytest
+
+from app.core.cgroup_detector import CgroupDetector, parse_cpu_list
+
+CGROUP = "kubepods.slice/pod1/polaris"
+
+
+def write_counters(cgroup, proc, step: int) -> None:
+    """Write cgroup v2 and PSI counter files as they would read after ``step`` seconds"""
+    (cgroup / "cpu.stat").write_text(
+        f"usage_usec {step * 1500000}\nuser_usec {step * 1000000}\nsystem_usec {step * 500000}\n"
+        f"nr_periods {step * 10}\nnr_throttled {step * 2}\nthrottled_usec {step * 40000}\n"
+    )
+    (cgroup / "io.stat").write_text(
+        f"8:0 rbytes={step * 4096000} wbytes={step * 1024000} rios={step * 100} wios={step * 25} dbytes=0 dios=0\n"
+        f"259:0 rbytes={step * 1000} wbytes=0 rios={step} wios=0 dbytes=0 dios=0\n"
+    )
+    (cgroup / "memory.current").write_text(f"{(512 + step) * 1024 ** 2}\n")
+    for resource, some in (("cpu", 100000), ("memory", 50000), ("io", 250000)):
+        (proc / "pressure" / resource).write_text(
+            f"some avg10=0.00 avg60=0.00 avg300=0.00 total={step * some}\n"
+            f"full avg10=0.00 avg60=0.00 avg300=0.00 total={step * some // 2}\n"
+        )
+
+
+@pytest.fixture
+def fake_roots(tmp_path):
+    """A fake cgroup v2 mount and /proc for a container limited to 1.5 CPUs and 1 GiB"""
+    cgroup_root, proc_root = tmp_path / "cgroup", tmp_path / "proc"
+    cgroup = cgroup_root / CGROUP
+    cgroup.mkdir(parents=True)
+    (proc_root / "self").mkdir(parents=True)
+    (proc_root / "pressure").mkdir()
+    (cgroup_root / "cgroup.controllers").write_text("cpuset cpu io memory pids\n")
+    (proc_root / "self" / "cgroup").write_text(f"0::/{CGROUP}\n")
+    (cgroup / "cpu.max").write_text("150000 100000\n")
+    (cgroup / "cpuset.cpus.effective").write_text("0-3\n")
+    (cgroup / "memory.max").write_text(f"{1024 ** 3}\n")
+    write_counters(cgroup, proc_root, 0)
+    return cgroup_root, proc_root
+
+
+def allowed_cpus() -> float:
+    """CPUs this process may run on, which no limit exceeds"""
+    return float(len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count())
+
+
+def test_parse_cpu_list():
+    assert parse_cpu_list("0-3,6") == 5
+    assert parse_cpu_list("") == 0
+
+
+def test_limits_from_own_cgroup(fake_roots):
+    cgroup_root, proc_root = fake_roots
+    detector = CgroupDetector(cgroup_root=str(cgroup_root), proc_root=str(proc_root))
+    assert detector.path == str(cgroup_root / CGROUP)
+    assert detector.get_limits() == {
+        "cgroup": f"/{CGROUP}",
+        "cpu_limit": min(1.5, allowed_cpus()),
+        "memory_limit": 1024 ** 3,
+    }
+
+
+def test_rates_between_counter_readings(fake_roots):
+    cgroup_root, proc_root = fake_roots
+    detector = CgroupDetector(cgroup_root=str(cgroup_root), proc_root=str(proc_root))
+    previous = detector.read_counters()
+    write_counters(cgroup_root / CGROUP, proc_root, 1)
+    current = detector.read_counters()
+    previous["time"], current["time"] = 0.0, 1.0
+
+    assert detector.compute_rates(previous, current) == {
+        "cpu_usage": 1.5,
+        "cpu_throttled_percent": 20.0,
+        "io_read_bytes_per_sec": 4097000.0,
+        "io_write_bytes_per_sec": 1024000.0,
+        "pressure": {
+            "cpu_some": 10.0, "cpu_full": 5.0, "memory_some": 5.0, "memory_full": 2.5,
+            "io_some": 25.0, "io_full": 12.5,
+        },
+    }
+
+
+def test_recreated_cgroup_does_not_go_negative(fake_roots):
+    cgroup_root, proc_root = fake_roots
+    write_counters(cgroup_root / CGROUP, proc_root, 5)
+    detector = CgroupDetector(cgroup_root=str(cgroup_root), proc_root=str(proc_root))
+    previous = detector.read_counters()
+    write_counters(cgroup_root / CGROUP, proc_root, 1)
+    current = detector.read_counters()
+    previous["time"], current["time"] = 0.0, 1.0
+
+    rates = detector.compute_rates(previous, current)
+    assert rates["cpu_usage"] == 0.0
+    assert rates["io_read_bytes_per_sec"] == 0.0
+    assert set(rates["pressure"].values()) == {0.0}
+
+
+def test_container_metrics_against_limits(fake_roots):
+    cgroup_root, proc_root = fake_roots
+    detector = CgroupDetector(cgroup_root=str(cgroup_root), proc_root=str(proc_root))
+    metrics = detector.get_container_metrics()
+    assert metrics["memory_used"] == 512 * 1024 ** 2
+    assert metrics["memory_percent"] == 50.0
+    assert metrics["cpu_percent"] == 0.0
+
+
+def test_without_cgroup_v2(tmp_path):
+    (tmp_path / "proc" / "pressure").mkdir(parents=True)
+    detector = CgroupDetector(cgroup_root=str(tmp_path / "cgroup"), proc_root=str(tmp_path / "proc"))
+    assert not detector.is_v2
+    assert detector.get_limits() == {"cgroup": None, "cpu_limit": allowed_cpus(), "memory_limit": None}
+    assert detector.get_container_metrics()["cpu_usage"] is None
@@ -0,0 +1,98 @@
+"""
+🌟 Polaris System Detection API - GPU Worker Fault Tests
+"""
+
+import functools
+import time
+
+import pytest
+
+from app.core.gpu_backends import GPUBackendError, SimulatedGPUBackend
+from app.core.gpu_detector import GPUDetector
+from app.core.gpu_worker import GPUWorkerError, GPUWorkerTimeoutError, IsolatedGPUBackend
+
+CALL_TIMEOUT = 0.5
+# A hung call may take its deadline plus the time to kill the worker
+WORST_CALL_SECONDS = CALL_TIMEOUT + 1.5
+
+
+@pytest.fixture
+def make_isolated():
+    """Start IsolatedGPUBackends around two simulated GPUs, closed after the test"""
+    backends = []
+
+    def make(**kwargs) -> IsolatedGPUBackend:
+        backend = IsolatedGPUBackend(
+            functools.partial(SimulatedGPUBackend, device_count=2, **kwargs),
+            call_timeout=CALL_TIMEOUT,
+            restart_backoff=0.1,
+        )
+        backends.append(backend)
+        assert backend.start()
+        return backend
+
+    yield make
+    for backend in backends:
+        backend.close()
+
+
+def wait_for_worker(backend: IsolatedGPUBackend, timeout: float = 30.0) -> int:
+    """Call the backend until a (restarted) worker answers"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return backend.get_device_count()
+        except GPUWorkerError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def test_hung_call_times_out_and_worker_restarts(make_isolated):
+    backend = make_isolated(hanging_devices=[1], hang_seconds=60.0)
+    assert backend.get_utilization(0) == 0
+
+    started = time.monotonic()
+    with pytest.raises(GPUWorkerTimeoutError):
+        backend.get_utilization(1)
+    assert time.monotonic() - started < WORST_CALL_SECONDS
+    assert backend.get_stats()["timeouts"] == 1
+
+    # Callers are turned away while the replacement starts in the background
+    with pytest.raises(GPUWorkerError, match="restarting"):
+        backend.get_device_count()
+    assert wait_for_worker(backend) == 2
+    assert backend.get_stats()["restarts"] == 1
+
+
+def test_vendor_errors_keep_the_worker(make_isolated):
+    backend = make_isolated(failing_devices=[1])
+    pid = backend.get_stats()["pid"]
+
+    with pytest.raises(GPUBackendError, match="device 1") as error:
+        backend.get_memory_info(1)
+    assert not isinstance(error.value, GPUWorkerError)
+
+    assert backend.get_memory_info(0)[0] == 80 * 1024 ** 3
+    stats = backend.get_stats()
+    assert (stats["pid"], stats["timeouts"], stats["crashes"]) == (pid, 0, 0)
+
+
+def test_detector_serves_stale_records_while_hung(make_isolated):
+    detector = GPUDetector(backend=make_isolated())
+    records = detector.get_gpu_records()
+    assert [record.stale for record in records] == [False, False]
+
+    # The GPUs fall off the bus after a good reading
+    detector.backend = make_isolated(hanging_devices=[0, 1], hang_seconds=60.0)
+    started = time.monotonic()
+    stale = detector.get_gpu_records()
+    assert time.monotonic() - started < WORST_CALL_SECONDS
+    assert [record.name for record in stale] == [record.name for record in records]
+    assert all(record.stale for record in stale)
+
+
+def test_detector_falls_back_on_vendor_errors(make_isolated):
+    detector = GPUDetector(backend=make_isolated(failing_devices=[1]))
+    records = detector.get_gpu_records()
+    assert [record.name for record in records] == ["cpu"]
@@ -1,18 +1,80 @@
 #!/usr/bin/env python3
 """
 🌟 Polaris System Detection API - Benchmark Tool
-Simple performance benchmark for API endpoints
+Performance benchmarks for the Polaris manager and the HTTP API
+
+Usage:
+    python tools/benchmark.py                      # In-process manager benchmarks
+    python tools/benchmark.py http --concurrency 16 --output results.json
+    python tools/benchmark.py http --mode loopback --baseline baseline.json
+    python tools/benchmark.py http --mode loopback --workers 4
+    python tools/benchmark.py gpu-scaling --gpu-counts 1 8 16
+    python tools/benchmark.py gpu-faults --hang-rate 0.02
+    python tools/benchmark.py amd-sysfs --devices 8
+    python tools/benchmark.py cgroup
+    python tools/benchmark.py exporters --mtu 1432
+    python tools/benchmark.py inventory --trigger
+    python tools/benchmark.py records --gpus 8
+    python tools/benchmark.py uds --requests 500
+    python tools/benchmark.py startup --runs 5
+    python tools/benchmark.py memory --requests 200
+    python tools/benchmark.py collectors --baseline tools/baselines/collectors.json
+    python tools/benchmark.py compare results.json baseline.json
 """
 
+import argparse
 import asyncio
+import functools
+import json
+import os
+import platform
+import socket
+import subprocess
 import sys
 import time
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add the app directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.polaris_manager import PolarisManager, get_polaris_manager
+from app.utils.stats_utils import summarize_latencies
+
+DEFAULT_HTTP_ENDPOINTS = [
+    "/health",
+    "/",
+    "/polaris/cpu",
+    "/polaris/memory",
+    "/polaris/disk",
+    "/polaris/gpu",
+    "/polaris/network",
+    "/polaris/realtime",
+    "/polaris/detect",
+]
 
-from app.core.polaris_manager import PolarisManager
+# Latency percentiles grow and throughput shrinks when things regress
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+THROUGHPUT_METRICS = ("rps",)
+# Allocation metrics grow when things regress; changes below the floor are noise
+ALLOCATION_METRICS = {"allocations": 16, "peak_kib": 4.0}
+# Latency changes below this are timer noise
+LATENCY_FLOOR_MS = 0.005
+# Suites that gate on fewer metrics than they report
+SUITE_GATED_METRICS = {"collectors": ("p50_ms", "allocations", "peak_kib")}
+# Run settings a comparison is refused over when they differ from the baseline's
+MATCHED_META_KEYS = ("repeat", "rounds", "alloc_calls")
+
+# Routes the collectors harness leaves out: endless streams
+HARNESS_SKIPPED_ROUTES = {
+    "/polaris/realtime/stream": "streams until the client disconnects",
+}
+# Query strings for routes that would otherwise wait
+HARNESS_ROUTE_QUERIES = {"/polaris/changes": "?wait=0"}
+# (samples, points) of typical /polaris/history/series requests checked by
+# the lttb suite besides the requested size: narrow buckets and wide ones
+LTTB_HISTORY_CASES = ((3600, 800), (100000, 10000), (100000, 800))
 
 
 async def benchmark_endpoint(name: str, func, *args, **kwargs):
@@ -54,6 +116,1657 @@ async def benchmark_endpoint(name: str, func, *args, **kwargs):
     print(f"   📊 {iterations} iterations")
 
 
+async def benchmark_concurrent(polaris: PolarisManager, name: str, func, concurrency: int):
+    """Fire concurrent identical requests and count collector executions"""
+    print(f"\n🔀 {name} x{concurrency} concurrent...")
+    
+    # Start cold so the burst has to collect
+    polaris.cache.invalidate()
+    executions_before = dict(polaris.executor.executions)
+    cache_before = dict(polaris.cache.stats)
+    
+    start_time = time.perf_counter()
+    results = await asyncio.gather(*[func() for _ in range(concurrency)], return_exceptions=True)
+    elapsed = time.perf_counter() - start_time
+    
+    failures = [r for r in results if isinstance(r, Exception)]
+    executions = {
+        collector: count - executions_before.get(collector, 0)
+        for collector, count in polaris.executor.executions.items()
+        if count != executions_before.get(collector, 0)
+    }
+    cache_delta = {
+        key: polaris.cache.stats[key] - cache_before.get(key, 0)
+        for key in ("hits", "misses", "coalesced")
+    }
+    
+    print(f"   ⏱️  Wall time: {elapsed*1000:.2f}ms ({len(failures)} failed)")
+    print(f"   🔧 Collector executions: {sum(executions.values())} {executions}")
+    print(f"   🗃️  Cache: {cache_delta['misses']} misses, {cache_delta['coalesced']} coalesced, {cache_delta['hits']} hits")
+
+
+async def benchmark_compression(endpoints, iterations: int = 10):
+    """Measure bytes on the wire and per-request time for each content encoding"""
+    import httpx
+
+    from app.api.compression import compressed_response_cache, get_supported_encodings
+    from app.main import app
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://polaris", timeout=None) as client:
+        for endpoint in endpoints:
+            print(f"\n🗜️  Compression for {endpoint}...")
+            for encoding in ("identity",) + get_supported_encodings():
+                times = []
+                wire_bytes = 0
+                for _ in range(iterations):
+                    start_time = time.perf_counter()
+                    response = await client.get(endpoint, headers={"Accept-Encoding": encoding})
+                    times.append(time.perf_counter() - start_time)
+                    wire_bytes = len(response.content) if encoding == "identity" else int(
+                        response.headers.get("content-length", 0)
+                    )
+                uncompressed = int(response.headers.get("x-polaris-uncompressed-length", 0))
+                ratio = wire_bytes / uncompressed if uncompressed else 1.0
+                print(
+                    f"   {encoding:>8}: {wire_bytes} bytes on wire ({ratio:.0%} of {uncompressed}), "
+                    f"avg {sum(times) / len(times) * 1000:.2f}ms"
+                )
+    
+    for section, stats in compressed_response_cache.get_stats()["sections"].items():
+        requests = stats["requests"] or 1
+        cpu_per_request = (stats["serialize_cpu_seconds"] + stats["compress_cpu_seconds"]) / requests
+        print(
+            f"   📊 {section}: {stats['compressions']} compressions for {stats['requests']} requests, "
+            f"{cpu_per_request * 1e6:.1f}µs encode CPU per request"
+        )
+
+
+def benchmark_instrumentation(polaris: PolarisManager, budget_ns: float = 1000.0):
+    """Measure instrumentation overhead and show where collection time goes"""
+    from app.core.instrumentation import instrumentation, measure_record_overhead
+    
+    overhead_ns = measure_record_overhead()
+    status = "✅" if overhead_ns < budget_ns else "⚠️"
+    print(f"\n{status} Instrumentation overhead: {overhead_ns:.0f}ns per record (budget {budget_ns:.0f}ns)")
+    
+    metrics = instrumentation.get_stats()["metrics"]
+    slowest = sorted(metrics.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:10]
+    print("📊 Time by instrumented call (total / calls / p95):")
+    for name, stats in slowest:
+        print(f"   {stats['total_ms']:>10.2f}ms {stats['count']:>6} calls  p95 {stats['p95_ms']:.3f}ms  {name}")
+
+
+def find_free_port() -> int:
+    """Find a free TCP port on loopback"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_loopback_server(
+    startup_timeout: float = 60.0,
+    poll_interval: float = 0.1,
+    workers: int = 1,
+    uds_path: Optional[str] = None,
+):
+    """Start Polaris with uvicorn in a child process on a loopback port"""
+    import httpx
+
+    port = find_free_port()
+    if workers > 1 or uds_path:
+        # main.py starts the shared host sampler and the Unix socket listener
+        command = [sys.executable, "main.py"]
+    else:
+        command = [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ]
+    env = {
+        **os.environ,
+        "POLARIS_HOST": "127.0.0.1",
+        "POLARIS_PORT": str(port),
+        "POLARIS_WORKERS": str(workers),
+        "POLARIS_RELOAD": "false",
+        "POLARIS_LOG_LEVEL": "warning",
+    }
+    if uds_path:
+        env["POLARIS_UDS_PATH"] = uds_path
+    process = subprocess.Popen(command, cwd=str(PROJECT_ROOT), env=env, stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    
+    deadline = time.perf_counter() + startup_timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Polaris server exited with code {process.returncode}")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return process, base_url
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(poll_interval)
+    
+    process.terminate()
+    raise RuntimeError(f"Polaris server did not start within {startup_timeout:.0f}s")
+
+
+async def run_http_load(client, endpoint: str, requests: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    """Drive one endpoint with a closed-loop load at fixed concurrency"""
+    for _ in range(warmup):
+        await client.get(endpoint)
+    
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+    
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start_time = time.perf_counter()
+            try:
+                response = await client.get(endpoint)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start_time)
+    
+    start_time = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start_time
+    
+    return {
+        **summarize_latencies(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "elapsed_s": elapsed,
+    }
+
+
+async def run_http_benchmarks(args) -> Dict[str, Any]:
+    """Benchmark the HTTP API in-process (ASGI) or over loopback TCP"""
+    import httpx
+    
+    process = None
+    if args.mode == "loopback":
+        process, base_url = await start_loopback_server(workers=args.workers)
+        transport = None
+    else:
+        from app.main import app
+        base_url = "http://polaris"
+        transport = httpx.ASGITransport(app=app)
+    
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results: Dict[str, Any] = {}
+    
+    try:
+        async with httpx.AsyncClient(
+            base_url=base_url, transport=transport, limits=limits, timeout=None
+        ) as client:
+            for endpoint in args.endpoints:
+                url = endpoint
+                if args.max_age_ms is not None and endpoint.startswith("/polaris/"):
+                    url = f"{endpoint}?max_age_ms={args.max_age_ms}"
+                
+                result = await run_http_load(client, url, args.requests, args.concurrency, args.warmup)
+                results[endpoint] = result
+                print(
+                    f"   {endpoint:<22} {result['rps']:>9.1f} req/s  "
+                    f"p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+                    f"p99 {result['p99_ms']:>8.2f}ms  errors {result['errors']}"
+                )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+    
+    return {
+        "meta": {
+            "suite": "http",
+            "mode": args.mode,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "requests": args.requests,
+            "max_age_ms": args.max_age_ms,
+            "timestamp": time.time(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare benchmark results against a baseline
+    
+    Returns:
+        list: Human readable regressions (empty when within threshold)
+    """
+    regressions = []
+    gated = SUITE_GATED_METRICS.get(current.get("meta", {}).get("suite"))
+    latency_metrics = [metric for metric in LATENCY_METRICS if gated is None or metric in gated]
+    allocation_metrics = {
+        metric: floor for metric, floor in ALLOCATION_METRICS.items() if gated is None or metric in gated
+    }
+    
+    for name, result in current.get("results", {}).items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        
+        # Results that timed the same reference loop are compared at equal machine speed
+        speed = 1.0
+        if result.get("calibration_ms") and base.get("calibration_ms"):
+            speed = base["calibration_ms"] / result["calibration_ms"]
+        
+        for metric in latency_metrics:
+            if metric in result and base.get(metric):
+                value = result[metric] * speed
+                change = value / base[metric] - 1
+                # Slower by less than the spread between repeated runs (of
+                # either side) is noise; results without repeats fall back
+                # to the baseline's interquartile range
+                if "repeat_spread_ms" in base:
+                    spread = max(base["repeat_spread_ms"], result.get("repeat_spread_ms", 0.0))
+                else:
+                    spread = base.get("iqr_ms", 0.0)
+                noise = max(spread, LATENCY_FLOOR_MS)
+                if change > threshold and value - base[metric] > noise:
+                    regressions.append(
+                        f"{name} {metric}: {base[metric]:.2f} -> {value:.2f} (+{change:.0%})"
+                    )
+        
+        for metric in THROUGHPUT_METRICS:
+            if metric in result and base.get(metric):
+                change = 1 - result[metric] / base[metric]
+                if change > threshold:
+                    regressions.append(
+                        f"{name} {metric}: {base[metric]:.1f} -> {result[metric]:.1f} (-{change:.0%})"
+                    )
+        
+        for metric, floor in allocation_metrics.items():
+            if metric in result and metric in base:
+                growth = result[metric] - base[metric]
+                if growth > floor and growth > threshold * base[metric]:
+                    regressions.append(
+                        f"{name} {metric}: {base[metric]:g} -> {result[metric]:g} (+{growth:g})"
+                    )
+    
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Load benchmark results from a JSON file"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(results: Dict[str, Any], path: str):
+    """Save benchmark results as JSON"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"💾 Results saved to {path}")
+
+
+def report_comparison(current: Dict[str, Any], baseline_path: str, threshold: float) -> bool:
+    """Compare against a baseline file and print regressions"""
+    baseline = load_results(baseline_path)
+    for key in ("suite", "mode", "concurrency", "workers", "gpus"):
+        current_value = current.get("meta", {}).get(key)
+        baseline_value = baseline.get("meta", {}).get(key)
+        if current_value != baseline_value:
+            print(f"⚠️ Baseline {key} differs: {baseline_value!r} vs current {current_value!r}")
+    
+    # Fewer repeats or rounds give noisier medians than the baseline's, so
+    # such runs are not held against it
+    mismatched = [
+        f"{key} {baseline['meta'].get(key)!r} vs current {current['meta'].get(key)!r}"
+        for key in MATCHED_META_KEYS
+        if current.get("meta", {}).get(key) != baseline.get("meta", {}).get(key)
+    ]
+    if mismatched:
+        print(f"\n❌ Not comparable with {baseline_path}: {', '.join(mismatched)}")
+        return False
+    
+    regressions = compare_results(current, baseline, threshold)
+    
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {threshold:.0%} against {baseline_path}:")
+        for regression in regressions:
+            print(f"   • {regression}")
+        return False
+    
+    print(f"\n✅ No regressions beyond {threshold:.0%} against {baseline_path}")
+    return True
+
+
+async def http_main(args) -> bool:
+    """Run the HTTP benchmark suite"""
+    print("🌟 ================================")
+    print("🌟  POLARIS HTTP BENCHMARK")
+    print("🌟 ================================")
+    print(f"🎯 Mode: {args.mode}, concurrency {args.concurrency}, {args.requests} requests per endpoint\n")
+    
+    results = await run_http_benchmarks(args)
+    
+    if args.output:
+        save_results(results, args.output)
+    if args.save_baseline:
+        save_results(results, args.save_baseline)
+    if args.baseline:
+        return report_comparison(results, args.baseline, args.threshold)
+    return True
+
+
+async def gpu_scaling_main(args) -> bool:
+    """Measure how per-request cost scales with the number of (simulated) GPUs"""
+    import httpx
+
+    from app.core.gpu_backends import SimulatedGPUBackend
+    from app.core.gpu_detector import GPUDetector
+    from app.main import app
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS GPU SCALING BENCHMARK")
+    print("🌟 ================================")
+    print(f"🧪 Simulated GPUs: {args.gpu_counts}, {args.latency * 1e6:.0f}µs per vendor call\n")
+    
+    manager = get_polaris_manager()
+    original_detector = manager.gpu_detector
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://polaris", timeout=None) as client:
+            for count in args.gpu_counts:
+                backend = SimulatedGPUBackend(device_count=count, latency=args.latency, seed=args.seed)
+                manager.gpu_detector = GPUDetector(backend=backend)
+                
+                for endpoint in args.endpoints:
+                    # max_age_ms=0 makes every request collect from the backend
+                    calls_before = backend.calls
+                    result = await run_http_load(
+                        client, f"{endpoint}?max_age_ms=0", args.requests, args.concurrency, args.warmup
+                    )
+                    result["gpu_count"] = count
+                    result["backend_calls_per_request"] = (
+                        (backend.calls - calls_before) / (args.requests + args.warmup)
+                    )
+                    results[f"{endpoint}@{count}gpu"] = result
+                    print(
+                        f"   {endpoint:<20} {count:>3} GPUs  p50 {result['p50_ms']:>8.2f}ms  "
+                        f"p99 {result['p99_ms']:>8.2f}ms  {result['rps']:>8.1f} req/s  "
+                        f"{result['backend_calls_per_request']:.0f} calls/req"
+                    )
+    finally:
+        manager.gpu_detector = original_detector
+    
+    # Marginal cost per GPU from a least-squares fit of p50 over GPU count
+    print()
+    for endpoint in args.endpoints:
+        points = [(r["gpu_count"], r["p50_ms"]) for key, r in results.items() if key.startswith(f"{endpoint}@")]
+        if len(points) < 2:
+            continue
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        variance = sum((x - mean_x) ** 2 for x, _ in points)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance if variance else 0.0
+        print(f"📈 {endpoint}: {slope * 1000:.1f}µs p50 per additional GPU")
+    
+    output = {
+        "meta": {
+            "suite": "gpu-scaling",
+            "mode": "inprocess",
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "latency_s": args.latency,
+            "timestamp": time.time(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    
+    if args.output:
+        save_results(output, args.output)
+    if args.baseline:
+        return report_comparison(output, args.baseline, args.threshold)
+    return True
+
+
+async def startup_main(args) -> bool:
+    """Measure time-to-first-request of a freshly started server"""
+    import httpx
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS STARTUP BENCHMARK")
+    print("🌟 ================================")
+    print(f"🔁 {args.runs} cold starts of uvicorn app.main:app\n")
+    
+    first_health: List[float] = []
+    first_detect: List[float] = []
+    
+    for run in range(args.runs):
+        start_time = time.perf_counter()
+        process, base_url = await start_loopback_server(poll_interval=0.01)
+        health_time = time.perf_counter() - start_time
+        try:
+            async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+                response = await client.get("/polaris/detect")
+                response.raise_for_status()
+            detect_time = time.perf_counter() - start_time
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+        
+        first_health.append(health_time)
+        first_detect.append(detect_time)
+        print(f"   Run {run + 1}: /health after {health_time * 1000:.0f}ms, /polaris/detect after {detect_time * 1000:.0f}ms")
+    
+    results = {
+        "time_to_first_health": summarize_latencies(first_health),
+        "time_to_first_detect": summarize_latencies(first_detect),
+    }
+    print()
+    for name, summary in results.items():
+        print(f"📊 {name}: p50 {summary['p50_ms']:.0f}ms, max {summary['max_ms']:.0f}ms")
+    
+    output = {
+        "meta": {
+            "suite": "startup",
+            "mode": "loopback",
+            "concurrency": 1,
+            "runs": args.runs,
+            "timestamp": time.time(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    
+    if args.output:
+        save_results(output, args.output)
+    if args.baseline:
+        return report_comparison(output, args.baseline, args.threshold)
+    return True
+
+
+def measure_round_trips(client, endpoint: str, requests: int, warmup: int) -> Dict[str, Any]:
+    """Measure sequential round-trip latency of one endpoint"""
+    for _ in range(warmup):
+        client.get(endpoint)
+    
+    latencies = []
+    for _ in range(requests):
+        start_time = time.perf_counter()
+        client.get(endpoint).raise_for_status()
+        latencies.append(time.perf_counter() - start_time)
+    return summarize_latencies(latencies)
+
+
+async def uds_main(args) -> bool:
+    """Compare round-trip latency over a Unix socket and loopback TCP"""
+    import tempfile
+
+    import httpx
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS UDS vs TCP BENCHMARK")
+    print("🌟 ================================")
+    
+    socket_dir = tempfile.mkdtemp(prefix="polaris-")
+    uds_path = os.path.join(socket_dir, "polaris.sock")
+    process, base_url = await start_loopback_server(uds_path=uds_path)
+    
+    clients = {
+        # What a consumer opening a connection per call pays
+        "tcp_new_connection": httpx.Client(base_url=base_url, headers={"Connection": "close"}),
+        "tcp_keepalive": httpx.Client(base_url=base_url),
+        "uds_keepalive": httpx.Client(base_url="http://polaris", transport=httpx.HTTPTransport(uds=uds_path)),
+    }
+    results: Dict[str, Any] = {}
+    
+    try:
+        for endpoint in args.endpoints:
+            print(f"\n📡 {endpoint} ({args.requests} sequential requests)")
+            for transport_name, client in clients.items():
+                result = measure_round_trips(client, endpoint, args.requests, args.warmup)
+                results[f"{transport_name} {endpoint}"] = result
+                print(
+                    f"   {transport_name:<20} p50 {result['p50_ms']:>7.3f}ms  "
+                    f"p95 {result['p95_ms']:>7.3f}ms  p99 {result['p99_ms']:>7.3f}ms"
+                )
+    finally:
+        for client in clients.values():
+            client.close()
+        process.terminate()
+        process.wait(timeout=10)
+        if os.path.exists(uds_path):
+            os.remove(uds_path)
+        os.rmdir(socket_dir)
+    
+    output = {
+        "meta": {
+            "suite": "uds",
+            "mode": "loopback",
+            "concurrency": 1,
+            "requests": args.requests,
+            "timestamp": time.time(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    
+    if args.output:
+        save_results(output, args.output)
+    if args.baseline:
+        return report_comparison(output, args.baseline, args.threshold)
+    return True
+
+
+async def gpu_faults_main(args) -> bool:
+    """Inject GPU hangs through the simulated backend and time the API's answers (checked in tests/test_gpu_worker.py)"""
+    import functools
+
+    import httpx
+
+    from app.core.gpu_backends import SimulatedGPUBackend
+    from app.core.gpu_detector import GPUDetector
+    from app.core.gpu_worker import IsolatedGPUBackend
+    from app.main import app
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS GPU FAULT INJECTION")
+    print("🌟 ================================")
+    print(f"🧪 {args.gpu_count} simulated GPUs, {args.hang_rate:.1%} of vendor calls hang for {args.hang_seconds:.0f}s, "
+          f"{args.call_timeout:.2f}s call deadline\n")
+    
+    backend = IsolatedGPUBackend(
+        functools.partial(
+            SimulatedGPUBackend,
+            device_count=args.gpu_count,
+            hang_rate=args.hang_rate,
+            hang_seconds=args.hang_seconds,
+            seed=args.seed,
+        ),
+        call_timeout=args.call_timeout,
+        restart_backoff=args.restart_backoff,
+    )
+    if not backend.start():
+        print("❌ GPU worker did not start")
+        return False
+    
+    manager = get_polaris_manager()
+    original_detector = manager.gpu_detector
+    manager.gpu_detector = GPUDetector(backend=backend)
+    transport = httpx.ASGITransport(app=app)
+    latencies: List[float] = []
+    outcomes = {"fresh": 0, "stale": 0, "fallback": 0, "failed": 0}
+    
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://polaris", timeout=None) as client:
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                response = await client.get("/polaris/gpu", params={"max_age_ms": 0})
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    outcomes["failed"] += 1
+                    continue
+                gpus = response.json()["polaris_gpu_detection"]
+                if any(gpu.get("stale") for gpu in gpus):
+                    outcomes["stale"] += 1
+                elif gpus and gpus[0]["name"] == "cpu":
+                    outcomes["fallback"] += 1
+                else:
+                    outcomes["fresh"] += 1
+                await asyncio.sleep(args.pause)
+    finally:
+        manager.gpu_detector = original_detector
+        stats = backend.get_stats()
+        backend.close()
+    
+    summary = summarize_latencies(latencies)
+    print(f"   Responses: {outcomes['fresh']} fresh, {outcomes['stale']} stale, "
+          f"{outcomes['fallback']} fallback, {outcomes['failed']} failed")
+    print(f"   Latency: p50 {summary['p50_ms']:.2f}ms  p99 {summary['p99_ms']:.2f}ms  max {summary['max_ms']:.2f}ms")
+    print(f"   Worker: {stats['timeouts']} timeouts, {stats['crashes']} crashes, {stats['restarts']} restarts")
+    
+    if args.output:
+        save_results({
+            "meta": {
+                "suite": "gpu-faults",
+                "mode": "inprocess",
+                "hang_rate": args.hang_rate,
+                "call_timeout": args.call_timeout,
+                "timestamp": time.time(),
+                "python_version": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": {"/polaris/gpu": {**summary, **outcomes, **stats}},
+        }, args.output)
+    return True
+
+
+def create_fake_amd_sysfs(root: str, devices: int) -> None:
+    """Create a fake /sys/class/drm tree with AMD cards (plus connectors and a non-AMD card)"""
+    for index in range(devices + 1):
+        device = Path(root) / f"card{index}" / "device"
+        device.mkdir(parents=True)
+        # The last card is an integrated non-AMD GPU that must be skipped
+        (device / "vendor").write_text("0x8086\n" if index == devices else "0x1002\n")
+        (device / "device").write_text("0x73bf\n")
+        (device / "mem_info_vram_total").write_text(f"{(16 + index) * 1024 ** 3}\n")
+        (device / "mem_info_vram_used").write_text(f"{index * 1024 ** 3}\n")
+        (device / "gpu_busy_percent").write_text(f"{index * 10 % 101}\n")
+        (Path(root) / f"card{index}-DP-1").mkdir()
+
+
+def read_sysfs_uncached(cards: List[str]) -> List[Tuple[int, int, int]]:
+    """Sample cards by opening every attribute on every read, like a per-call library"""
+    devices = []
+    for device in cards:
+        readings = []
+        for attribute in ("mem_info_vram_total", "mem_info_vram_used", "gpu_busy_percent"):
+            with open(os.path.join(device, attribute)) as f:
+                readings.append(int(f.read()))
+        devices.append(tuple(readings))
+    return devices
+
+
+def amd_sysfs_main(args) -> bool:
+    """Time a sample of the sysfs AMD backend on a fake tree (checked in tests/test_amd_sysfs.py)"""
+    import tempfile
+    import timeit
+
+    from app.core.gpu_backends import SysfsAMDBackend
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS AMD SYSFS BENCHMARK")
+    print("🌟 ================================")
+    
+    with tempfile.TemporaryDirectory(prefix="polaris-drm-") as temp_dir:
+        root = args.root
+        if root is None:
+            root = temp_dir
+            create_fake_amd_sysfs(root, args.devices)
+        print(f"📂 {root}\n")
+        
+        backend = SysfsAMDBackend(root=root)
+        backend.initialize()
+        try:
+            devices = backend.collect_devices()
+            for name, total, used, free, utilization in devices:
+                print(f"   {name:<24} {used / 1024 ** 3:6.1f}/{total / 1024 ** 3:.1f} GiB  {utilization:>3}% busy")
+            
+            cached_s = min(timeit.repeat(backend.collect_devices, number=args.samples, repeat=3)) / args.samples
+            uncached_s = min(
+                timeit.repeat(lambda: read_sysfs_uncached(backend.cards), number=args.samples, repeat=3)
+            ) / args.samples
+        finally:
+            backend.close()
+    
+    print(f"\n⏱️  Cached handles: {cached_s * 1e6:8.1f}µs per sample ({cached_s * 1e6 / len(devices):.1f}µs per GPU)")
+    print(f"⏱️  Open per read:  {uncached_s * 1e6:8.1f}µs per sample ({uncached_s / cached_s:.1f}x slower)")
+    
+    if args.output:
+        save_results({
+            "meta": {
+                "suite": "amd-sysfs",
+                "mode": "inprocess",
+                "devices": len(devices),
+                "timestamp": time.time(),
+                "python_version": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": {
+                "cached": {"p50_ms": cached_s * 1000},
+                "uncached": {"p50_ms": uncached_s * 1000},
+            },
+        }, args.output)
+    return True
+
+
+def write_fake_cgroup_counters(cgroup: Path, proc: Path, step: int) -> None:
+    """Write cgroup v2 and PSI counter files as they would read after ``step`` seconds"""
+    (cgroup / "cpu.stat").write_text(
+        f"usage_usec {step * 1500000}\nuser_usec {step * 1000000}\nsystem_usec {step * 500000}\n"
+        f"nr_periods {step * 10}\nnr_throttled {step * 2}\nthrottled_usec {step * 40000}\n"
+    )
+    (cgroup / "io.stat").write_text(
+        f"8:0 rbytes={step * 4096000} wbytes={step * 1024000} rios={step * 100} wios={step * 25} dbytes=0 dios=0\n"
+        f"259:0 rbytes={step * 1000} wbytes=0 rios={step} wios=0 dbytes=0 dios=0\n"
+    )
+    (cgroup / "memory.current").write_text(f"{(512 + step) * 1024 ** 2}\n")
+    for resource, some in (("cpu", 100000), ("memory", 50000), ("io", 250000)):
+        (proc / "pressure" / resource).write_text(
+            f"some avg10=0.00 avg60=0.00 avg300=0.00 total={step * some}\n"
+            f"full avg10=0.00 avg60=0.00 avg300=0.00 total={step * some // 2}\n"
+        )
+
+
+def create_fake_cgroupfs(root: str) -> Tuple[str, str]:
+    """Create a fake cgroup v2 mount and /proc for a container limited to 1.5 CPUs and 1 GiB"""
+    cgroup_root, proc_root = Path(root) / "cgroup", Path(root) / "proc"
+    cgroup = cgroup_root / "kubepods.slice" / "pod1" / "polaris"
+    cgroup.mkdir(parents=True)
+    (proc_root / "self").mkdir(parents=True)
+    (proc_root / "pressure").mkdir()
+    (cgroup_root / "cgroup.controllers").write_text("cpuset cpu io memory pids\n")
+    (proc_root / "self" / "cgroup").write_text("0::/kubepods.slice/pod1/polaris\n")
+    (cgroup / "cpu.max").write_text("150000 100000\n")
+    (cgroup / "cpuset.cpus.effective").write_text("0-3\n")
+    (cgroup / "memory.max").write_text(f"{1024 ** 3}\n")
+    write_fake_cgroup_counters(cgroup, proc_root, 0)
+    return str(cgroup_root), str(proc_root)
+
+
+def cgroup_main(args) -> bool:
+    """Time a sample of the cgroup v2 and PSI detector on a fake tree and this host (checked in tests/test_cgroup_detector.py)"""
+    import tempfile
+    import timeit
+
+    from app.core.cgroup_detector import CgroupDetector
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS CGROUP / PSI BENCHMARK")
+    print("🌟 ================================")
+    
+    with tempfile.TemporaryDirectory(prefix="polaris-cgroup-") as temp_dir:
+        cgroup_root, proc_root = create_fake_cgroupfs(temp_dir)
+        detector = CgroupDetector(cgroup_root=cgroup_root, proc_root=proc_root)
+        print(f"📂 Fake tree: {detector.get_limits()}")
+        fake_s = min(timeit.repeat(detector.get_container_metrics, number=args.samples, repeat=3)) / args.samples
+    
+    host = CgroupDetector()
+    host_s = min(timeit.repeat(host.get_container_metrics, number=args.samples, repeat=3)) / args.samples
+    print(f"\n🖥️  This host ({'cgroup v2' if host.is_v2 else 'no cgroup v2'}): {host.get_container_metrics()}")
+    print(f"⏱️  Sample cost: {fake_s * 1e6:.1f}µs (fake tree), {host_s * 1e6:.1f}µs (this host)")
+    return True
+
+
+def create_fake_cgroup_tree(root: str, slices: int, per_slice: int) -> List[Path]:
+    """Create a fake cgroup v2 mount with ``slices`` slices of ``per_slice`` containers each"""
+    cgroup_root = Path(root)
+    (cgroup_root / "cgroup.controllers").write_text("cpuset cpu io memory pids\n")
+    leaves = []
+    for slice_index in range(slices):
+        for container in range(per_slice):
+            cgroup = cgroup_root / f"slice{slice_index}.slice" / f"container{container}.scope"
+            cgroup.mkdir(parents=True)
+            leaves.append(cgroup)
+    for cgroup in [cgroup_root, *cgroup_root.glob("*.slice"), *leaves]:
+        (cgroup / "cpu.stat").write_text("usage_usec 1000\nuser_usec 600\nsystem_usec 400\n")
+        (cgroup / "memory.current").write_text(f"{64 * 1024 ** 2}\n")
+        (cgroup / "io.stat").write_text("8:0 rbytes=4096 wbytes=0 rios=1 wios=0 dbytes=0 dios=0\n")
+    return leaves
+
+
+def cgroup_tree_main(args) -> bool:
+    """Check incremental cgroup tree walks against a fake tree and time them"""
+    import tempfile
+    import timeit
+
+    from app.core.cgroup_walker import CgroupTreeWalker
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS CGROUP TREE WALK")
+    print("🌟 ================================")
+    
+    with tempfile.TemporaryDirectory(prefix="polaris-cgroup-tree-") as root:
+        leaves = create_fake_cgroup_tree(root, args.slices, args.per_slice)
+        expected = 1 + args.slices + len(leaves)
+        print(f"📂 {expected} cgroups under {root}\n")
+        
+        walker = CgroupTreeWalker(root=root, full_scan_interval=3600.0)
+        first_s = timeit.timeit(walker.walk, number=1)
+        listed = walker.stats["listed"]
+        
+        # Unchanged directories are not listed again
+        busy = leaves[0]
+        (busy / "cpu.stat").write_text("usage_usec 1001000\n")
+        results = walker.walk()
+        checks = {
+            "first walk finds every cgroup": len(results) == expected and listed == expected,
+            "second walk lists no directory": walker.stats["listed"] == listed,
+            "busy cgroup has the highest CPU usage": max(results, key=lambda r: r["cpu_usage"] or 0.0)["path"]
+            == "/" + str(busy.relative_to(root)),
+        }
+        
+        # Only the parent of a new or removed cgroup is listed again
+        (busy.parent / "new.scope").mkdir()
+        walker.walk()
+        checks["new cgroup found by listing only its parent and itself"] = (
+            walker.stats["cgroups"] == expected + 1 and walker.stats["listed"] == listed + 2
+        )
+        (busy.parent / "new.scope").rmdir()
+        walker.walk()
+        checks["removed cgroup dropped"] = walker.stats["cgroups"] == expected
+        
+        incremental_s = min(timeit.repeat(walker.walk, number=args.walks, repeat=3)) / args.walks
+        full = CgroupTreeWalker(root=root, full_scan_interval=1e-9)
+        full.walk()
+        full_s = min(timeit.repeat(full.walk, number=args.walks, repeat=3)) / args.walks
+    
+    for check, passed in checks.items():
+        print(f"   {'✅' if passed else '❌'} {check}")
+    print(f"\n⏱️  First walk:       {first_s * 1000:8.1f}ms")
+    print(f"⏱️  Incremental walk: {incremental_s * 1000:8.1f}ms ({incremental_s * 1e6 / expected:.1f}µs per cgroup)")
+    print(f"⏱️  Full re-listing:  {full_s * 1000:8.1f}ms ({full_s / incremental_s:.2f}x; listings are all a walk skips)")
+    print(f"   {100.0 * incremental_s:.1f}% of one CPU at one walk per second")
+    
+    success = all(checks.values())
+    print(f"\n{'✅' if success else '❌'} Incremental walks {'match' if success else 'do not match'} the tree")
+    return success
+
+
+def capability_main(args) -> bool:
+    """Run the capability microbenchmarks and compare them with (or record) the CPU model's baseline"""
+    from app.core.capability_probe import CapabilityProbe
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS CAPABILITY BENCHMARK")
+    print("🌟 ================================")
+    
+    probe = CapabilityProbe(baseline_path=args.baseline_file)
+    print(f"🖥️  {probe.sku}\n")
+    result = probe.measure()
+    baseline = probe.load_baseline()
+    comparison = probe.compare(result["metrics"], baseline)
+    for metric, value in result["metrics"].items():
+        expected = (baseline or {}).get(metric)
+        ratio = comparison["ratios"].get(metric)
+        flag = "🐢" if metric in comparison["slow_metrics"] else "  "
+        against = f"  baseline {expected:>10.2f}  ({ratio:.2f}x)" if ratio is not None else ""
+        print(f"   {flag} {metric:<22} {value:>10.2f}{against}")
+    print(f"\n⏱️  Suite took {result['duration']:.1f}s")
+    
+    if args.record:
+        probe.record_baseline(result["metrics"])
+        print(f"💾 Recorded as the baseline for this CPU model in {probe.baseline_path}")
+        return True
+    if baseline is None:
+        print(f"ℹ️  No baseline for this CPU model in {probe.baseline_path} (use --record)")
+        return True
+    success = not comparison["slow_metrics"]
+    print(f"\n{'✅' if success else '❌'} {'Within' if success else 'Below'} {probe.tolerance:.0%} of the baseline")
+    return success
+
+
+def history_main(args) -> bool:
+    """Time recording and batched writes of the metric history, and check rollups and the size bound"""
+    import tempfile
+    
+    from app.core.gpu_backends import SimulatedGPUBackend
+    from app.core.gpu_detector import GPUDetector
+    from app.core.metric_history import MetricHistory
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS METRIC HISTORY")
+    print("🌟 ================================")
+    
+    gpu_detector = GPUDetector(backend=SimulatedGPUBackend(device_count=args.gpus))
+    start = (time.time() - args.samples) // 3600 * 3600
+    
+    with tempfile.TemporaryDirectory(prefix="polaris-history-") as temp_dir:
+        history = MetricHistory(path=os.path.join(temp_dir, "history.db"), max_bytes=args.max_bytes)
+        samples = [
+            (start + second, {
+                "cpu": {"cpu_percent": float(second % 100)},
+                "memory": {"virtual_memory": {"percent": 50.0, "used": 8 * 1024 ** 3}},
+                "gpu": gpu_detector.get_gpu_records(),
+            })
+            for second in range(args.samples)
+        ]
+        
+        record_started = time.perf_counter()
+        for timestamp, sample in samples:
+            history.record(timestamp, sample)
+        record_s = (time.perf_counter() - record_started) / args.samples
+        history._pending.clear()
+        
+        connection = history._connect()
+        flush_started = time.perf_counter()
+        rows = 0
+        for batch_start in range(0, args.samples, args.batch):
+            for timestamp, sample in samples[batch_start:batch_start + args.batch]:
+                history.record(timestamp, sample)
+            rows += history.flush(connection)
+        flush_s = (time.perf_counter() - flush_started) / args.samples
+        
+        # The cpu.percent minute buckets must hold the min/max/avg of their 60 samples
+        minute = history.query(["cpu.percent"], start, start + 59, tier="1m")["series"]["cpu.percent"]
+        hour = history.query(["cpu.percent"], start, start + args.samples, tier="1h")["series"]["cpu.percent"]
+        checks = {
+            "minute rollup": minute[:1] == [[start, 0.0, 59.0, 29.5]],
+            "hour rollup count": len(hour) == (args.samples - 1) // 3600 + 1 and hour[0][3] == 49.5,
+        }
+        history.enforce_retention(connection)
+        checks["size bound"] = history._database_bytes(connection) <= args.max_bytes
+        connection.close()
+    
+    metrics = len(samples[0][1]["gpu"]) * 2 + 3
+    print(f"📈 {args.samples} samples of {metrics} metrics, flushed every {args.batch} samples\n")
+    for check, passed in checks.items():
+        print(f"   {'✅' if passed else '❌'} {check}")
+    print(f"\n⏱️  record(): {record_s * 1e6:8.1f}µs per sample (the sampling path)")
+    print(f"⏱️  flush():  {flush_s * 1e6:8.1f}µs per sample (writer thread, {rows} bucket rows)")
+    print(f"🧹 Trimmed {history.stats['rows_trimmed']} rows to stay under {args.max_bytes / 1024 ** 2:.0f} MiB")
+    
+    success = all(checks.values())
+    print(f"\n{'✅' if success else '❌'} History rollups and size bound {'hold' if success else 'do not hold'}")
+    return success
+
+
+def lttb_reference(x: List[float], y: List[float], threshold: int) -> List[int]:
+    """Plain-Python LTTB, point by point, used to check the numpy version"""
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = int(bucket * every) + 1, int((bucket + 1) * every) + 1
+        next_start, next_end = end, min(int((bucket + 2) * every) + 1, n - 1)
+        if bucket == threshold - 3:
+            average_x, average_y = x[-1], y[-1]
+        else:
+            count = next_end - next_start
+            average_x = sum(x[next_start:next_end]) / count
+            average_y = sum(y[next_start:next_end]) / count
+        best, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs((x[previous] - average_x) * (y[index] - y[previous])
+                       - (x[previous] - x[index]) * (average_y - y[previous]))
+            if area > best_area:
+                best, best_area = index, area
+        selected.append(best)
+        previous = best
+    selected.append(n - 1)
+    return selected
+
+
+def lttb_main(args) -> bool:
+    """Check the numpy LTTB against a plain-Python one and time both"""
+    import timeit
+    
+    import numpy as np
+    
+    from app.utils.lttb import TABLE_MAX_WIDTH, lttb
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS LTTB DOWNSAMPLING")
+    print("🌟 ================================")
+    
+    rng = np.random.default_rng(0)
+    success = True
+    # The requested size, then history-sized series on both sides of TABLE_MAX_WIDTH
+    for samples, points in ((args.samples, args.points), *LTTB_HISTORY_CASES):
+        x = np.arange(samples, dtype=np.float64)
+        # Noisy utilization with a few short spikes
+        y = np.clip(40 + 20 * np.sin(x / 3600) + rng.normal(0, 5, samples), 0, 100)
+        y[rng.integers(0, samples, 20)] = 100.0
+        width = int(np.diff(np.linspace(1, samples - 1, points - 1).astype(np.intp)).max())
+        method = "table" if width <= TABLE_MAX_WIDTH else "walk"
+        print(f"📉 {samples} points -> {points} ({width}-point buckets, {method})")
+        
+        fast_s = min(timeit.repeat(lambda: lttb(x, y, points), number=1, repeat=3))
+        reference_s = min(timeit.repeat(lambda: lttb_reference(x.tolist(), y.tolist(), points), number=1, repeat=3))
+        fast_x, fast_y = lttb(x, y, points)
+        matches = fast_x.astype(np.intp).tolist() == lttb_reference(x.tolist(), y.tolist(), points)
+        success = success and matches
+        print(f"   ⏱️  numpy:        {fast_s * 1000:8.1f}ms")
+        print(f"   ⏱️  plain Python: {reference_s * 1000:8.1f}ms ({reference_s / fast_s:.1f}x slower)")
+        print(f"   📈 Spikes kept: {int(np.sum(fast_y == 100.0))} of {int(np.sum(y == 100.0))}")
+        print(f"   {'✅' if matches else '❌'} {'Matches' if matches else 'Does not match'} the reference\n")
+    
+    print(f"{'✅' if success else '❌'} numpy LTTB {'matches' if success else 'does not match'} the reference")
+    return success
+
+
+def check_bad_otlp_response(samples: List[Tuple[float, Dict[str, Any]]]) -> bool:
+    """Check that an endpoint answering garbage is counted as an error and the exporter thread keeps running"""
+    import threading
+    
+    from app.core.metric_exporters import MetricExporter, OTLPSink
+    
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    
+    def answer_garbage():
+        while True:
+            try:
+                connection, _ = listener.accept()
+            except OSError:
+                return
+            with connection:
+                connection.recv(65536)
+                connection.sendall(b"garbage\r\n\r\n")
+    
+    threading.Thread(target=answer_garbage, daemon=True).start()
+    otlp = OTLPSink(f"http://127.0.0.1:{listener.getsockname()[1]}/v1/metrics", timeout=2.0)
+    exporter = MetricExporter([otlp], flush_interval=0.05).start()
+    for _ in range(3):
+        for timestamp, sample in samples:
+            exporter.submit(timestamp, sample)
+        time.sleep(0.2)
+    alive = exporter._thread.is_alive()
+    flushes = exporter.stats["flushes"]
+    exporter.close()
+    listener.close()
+    return alive and flushes >= 3 and otlp.stats["errors"] >= 3
+
+
+def exporters_main(args) -> bool:
+    """Push samples to local StatsD (UDP) and OTLP (HTTP) stand-ins and check what arrives"""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    from app.core.gpu_backends import SimulatedGPUBackend
+    from app.core.gpu_detector import GPUDetector
+    from app.core.metric_exporters import MetricExporter, OTLPSink, StatsDSink
+    from app.core.metric_history import flatten_sample
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS METRIC EXPORTERS")
+    print("🌟 ================================")
+    
+    # StatsD stand-in: a UDP socket drained by a thread
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 ** 2)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(0.5)
+    datagrams: List[bytes] = []
+    
+    def receive():
+        while True:
+            try:
+                datagrams.append(receiver.recv(65535))
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+    
+    # OTLP stand-in: an HTTP server keeping the posted bodies
+    bodies: List[bytes] = []
+    
+    class CollectorHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def do_POST(self):
+            bodies.append(self.rfile.read(int(self.headers["Content-Length"])))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        
+        def log_message(self, *_):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CollectorHandler)
+    threading.Thread(target=receive, daemon=True).start()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    gpu_detector = GPUDetector(backend=SimulatedGPUBackend(device_count=args.gpus))
+    gpu_records = gpu_detector.get_gpu_records()
+    start = time.time() - args.samples
+    samples = [
+        (start + index, {
+            "cpu": {"cpu_percent": float(index % 100)},
+            "memory": {"virtual_memory": {"percent": 50.0, "used": 8 * 1024 ** 3}},
+            "gpu": gpu_records,
+        })
+        for index in range(args.samples)
+    ]
+    
+    statsd = StatsDSink(f"127.0.0.1:{receiver.getsockname()[1]}", prefix="polaris", mtu=args.mtu)
+    otlp = OTLPSink(f"http://127.0.0.1:{server.server_address[1]}/v1/metrics")
+    exporter = MetricExporter([statsd, otlp], queue_size=args.queue_size, flush_interval=3600)
+    
+    # Submitting is on the sampling path; the queue overflows once past its size
+    submit_started = time.perf_counter()
+    for timestamp, sample in samples:
+        exporter.submit(timestamp, sample)
+    submit_s = (time.perf_counter() - submit_started) / args.samples
+    overflow_drops = exporter.stats["dropped"]
+    kept = min(args.samples, args.queue_size)
+    
+    flush_started = time.perf_counter()
+    sent = 0
+    for _ in range(args.rounds):
+        for timestamp, sample in samples[-args.batch:]:
+            exporter.submit(timestamp, sample)
+        sent += exporter.flush()
+    flush_s = time.perf_counter() - flush_started
+    # The first flush also carries what survived the overflow
+    sent_points = kept + (args.rounds - 1) * args.batch
+    
+    time.sleep(0.5)
+    exporter.close()
+    receiver.close()
+    server.shutdown()
+    
+    survives_bad_response = check_bad_otlp_response(samples[:args.batch])
+    
+    lines = [line for datagram in datagrams for line in datagram.split(b"\n")]
+    parsed = {}
+    for line in lines:
+        name, _, rest = line.decode().partition(":")
+        value, _, kind = rest.partition("|")
+        if kind == "g":
+            parsed[name] = float(value)
+    data_points = sum(
+        len(metric["gauge"]["dataPoints"])
+        for body in bodies
+        for metric in json.loads(body)["resourceMetrics"][0]["scopeMetrics"][0]["metrics"]
+    )
+    metrics = len(flatten_sample(samples[0][1]))
+    last_cpu = samples[-1][1]["cpu"]["cpu_percent"]
+    checks = {
+        "oldest samples dropped": overflow_drops == max(args.samples - args.queue_size, 0),
+        "datagrams within MTU": bool(datagrams) and max(len(datagram) for datagram in datagrams) <= args.mtu,
+        "StatsD lines parse": len(parsed) == len(set(lines)) == metrics,
+        "StatsD latest value": parsed.get("polaris.cpu.percent") == last_cpu,
+        "OTLP data points": data_points == sent_points * metrics,
+        "no sink errors": not statsd.stats["errors"] and not otlp.stats["errors"],
+        "bad OTLP response counted, thread kept": survives_bad_response,
+        "bracketed IPv6 StatsD address": StatsDSink("[::1]:8125").address == ("::1", 8125),
+    }
+    
+    print(f"📈 {args.samples} samples of {metrics} metrics, {args.rounds} flushes of {args.batch} samples\n")
+    for check, passed in checks.items():
+        print(f"   {'✅' if passed else '❌'} {check}")
+    print(f"\n⏱️  submit(): {submit_s * 1e6:8.1f}µs per sample (the sampling path)")
+    print(f"⏱️  flush():  {flush_s / args.rounds * 1000:8.2f}ms per flush ({sent / flush_s:,.0f} samples/s)")
+    print(f"📦 StatsD: {statsd.stats['packets']} datagrams, "
+          f"{statsd.stats['bytes'] / max(statsd.stats['packets'], 1):.0f} bytes each on average "
+          f"({statsd.stats['packets'] / flush_s:,.0f} datagrams/s)")
+    print(f"📦 OTLP:   {otlp.stats['packets']} requests, {otlp.stats['bytes'] / 1024:.0f} KiB")
+    print(f"🗑️  Dropped {exporter.stats['dropped']} of {exporter.stats['submitted']} submitted samples")
+    
+    success = all(checks.values())
+    print(f"\n{'✅' if success else '❌'} Exported metrics {'arrive intact' if success else 'do not arrive intact'}")
+    return success
+
+
+def inventory_main(args) -> bool:
+    """Time cached vs uncached mount and interface listing, and check change-signal invalidation"""
+    import tempfile
+    
+    import psutil
+    
+    from app.core.inventory_watcher import INTERFACES, MOUNTS
+    from app.core.system_detector import SystemDetector
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS STATIC INVENTORY")
+    print("🌟 ================================")
+    
+    detector = SystemDetector()
+    inventory = detector.inventory
+    
+    def per_call(fn) -> float:
+        fn()
+        started = time.perf_counter()
+        for _ in range(args.calls):
+            fn()
+        return (time.perf_counter() - started) / args.calls
+    
+    uncached = {
+        "disk": per_call(lambda: (psutil.disk_usage("/"), [p._asdict() for p in psutil.disk_partitions()])),
+        "network": per_call(lambda: (psutil.net_io_counters(), detector._list_interfaces())),
+    }
+    cached = {
+        "disk": per_call(detector.collect_disk_info),
+        "network": per_call(detector.get_network_info),
+    }
+    checks = {
+        "mount list matches psutil": detector.collect_disk_info()["disk_partitions"] == detector._list_partitions(),
+        "interface list matches psutil": (
+            detector.get_network_info()["network_stats"] == detector._list_interfaces()["network_stats"]
+        ),
+    }
+    
+    print(f"👀 Change signals: {', '.join(inventory.get_stats()['watched']) or 'none (periodic refresh only)'}\n")
+    for section in uncached:
+        print(f"⏱️  {section:8s} uncached {uncached[section] * 1e6:8.1f}µs   cached {cached[section] * 1e6:8.1f}µs "
+              f"({uncached[section] / cached[section]:.1f}x)")
+    
+    if args.trigger:
+        # Needs root: mount a tmpfs and add a loopback address, then undo both
+        with tempfile.TemporaryDirectory(prefix="polaris-inventory-") as mount_point:
+            loads = inventory.stats["loads"]
+            mounted = subprocess.run(["mount", "-t", "tmpfs", "none", mount_point], capture_output=True).returncode == 0
+            if mounted:
+                # tmpfs is not a disk partition, so check that the list was re-read
+                detector.collect_disk_info()
+                checks["mount re-listed"] = inventory.stats["loads"] == loads + 1
+                subprocess.run(["umount", mount_point])
+                detector.collect_disk_info()
+                checks["unmount re-listed"] = inventory.stats["loads"] == loads + 2
+            address = ["127.0.0.77/32", "dev", "lo"]
+            added = subprocess.run(["ip", "addr", "add", *address], capture_output=True).returncode == 0
+            if added:
+                time.sleep(0.1)
+                addresses = [a["address"] for a in detector.get_network_info()["network_interfaces"]["lo"]]
+                checks["new address seen"] = "127.0.0.77" in addresses
+                subprocess.run(["ip", "addr", "del", *address])
+            if not (mounted or added):
+                print("⚠️ Could not mount or add an address (not root?); signals not exercised")
+            print(f"🔁 Re-listed {inventory.stats['loads'] - loads} times for the triggered changes")
+    
+    print()
+    for check, passed in checks.items():
+        print(f"   {'✅' if passed else '❌'} {check}")
+    stats = inventory.get_stats()
+    print(f"\n📊 {stats['hits']} hits, {stats['loads']} loads, {stats['invalidations']} signal invalidations")
+    
+    success = all(checks.values())
+    print(f"\n{'✅' if success else '❌'} Cached inventory {'is current' if success else 'is stale'}")
+    return success
+
+
+def records_main(args) -> bool:
+    """Compare memory and allocations of GPU readings held as dicts and as slotted records"""
+    import tracemalloc
+    
+    from app.core.gpu_backends import SimulatedGPUBackend
+    from app.core.records import GPURecord, gpu_records_to_dicts
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS SNAPSHOT RECORDS")
+    print("🌟 ================================")
+    
+    backend = SimulatedGPUBackend(device_count=args.gpus)
+    readings = [backend.collect_devices() for _ in range(args.snapshots)]
+    
+    def as_dicts(devices):
+        return [
+            {"name": name, "total_memory": total, "free_memory": free, "used_memory": used, "utilization": utilization}
+            for name, total, used, free, utilization in devices
+        ]
+    
+    def as_records(devices):
+        return [
+            GPURecord(name, total, free, used, utilization)
+            for name, total, used, free, utilization in devices
+        ]
+    
+    def measure(build) -> Tuple[float, float, float]:
+        """Retained bytes and allocated blocks per snapshot, and build time per snapshot"""
+        tracemalloc.start()
+        before_bytes = tracemalloc.get_traced_memory()[0]
+        before = tracemalloc.take_snapshot()
+        held = [build(devices) for devices in readings]
+        after = tracemalloc.take_snapshot()
+        retained = tracemalloc.get_traced_memory()[0] - before_bytes
+        blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+        tracemalloc.stop()
+        del held
+        started = time.perf_counter()
+        for devices in readings:
+            build(devices)
+        return retained / args.snapshots, blocks / args.snapshots, (time.perf_counter() - started) / args.snapshots
+    
+    results = {"dicts": measure(as_dicts), "records": measure(as_records)}
+    
+    # Converting at the response edge must give exactly the dict form
+    records = as_records(readings[-1])
+    started = time.perf_counter()
+    for _ in range(args.snapshots):
+        gpu_records_to_dicts(records)
+    edge_s = (time.perf_counter() - started) / args.snapshots
+    
+    print(f"📈 {args.snapshots} snapshots of {args.gpus} GPUs\n")
+    for form, (retained, blocks, build_s) in results.items():
+        print(f"   {form:8s} {retained:9.0f} bytes  {blocks:6.1f} allocations  {build_s * 1e6:7.1f}µs per snapshot")
+    print(f"\n⏱️  to_dict at the response edge: {edge_s * 1e6:.1f}µs per snapshot")
+    
+    dict_bytes, record_bytes = results["dicts"][0], results["records"][0]
+    checks = {
+        "records convert to the dict form": gpu_records_to_dicts(records) == as_dicts(readings[-1]),
+        "records use less memory": record_bytes < dict_bytes,
+    }
+    print(f"💾 Records take {record_bytes / dict_bytes:.0%} of the memory of dicts\n")
+    for check, passed in checks.items():
+        print(f"   {'✅' if passed else '❌'} {check}")
+    
+    success = all(checks.values())
+    print(f"\n{'✅' if success else '❌'} Snapshot records {'are' if success else 'are not'} smaller and equivalent")
+    return success
+
+
+def memory_main(args) -> bool:
+    """Check the growth monitor on synthetic series and hunt allocation growth across requests with tracemalloc"""
+    import gc
+    
+    from fastapi.testclient import TestClient
+    
+    from app.config.settings import settings
+    from app.core.memory_profiler import AGENT_METRICS, MemoryGrowthMonitor, MemoryProfiler, MemoryProfilingError
+    from app.core.metric_history import flatten_sample
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS AGENT MEMORY")
+    print("🌟 ================================")
+    
+    # Synthetic readings: one every 10 s for an hour and a half, with an hour-long window
+    def feed(rss_per_hour: float, objects_per_hour: float, ramp: float = 0.0) -> MemoryGrowthMonitor:
+        monitor = MemoryGrowthMonitor(interval=10.0, window=3600.0, max_rss_slope=16 * 1024 ** 2, max_objects_slope=20000)
+        for step in range(540):
+            hours = step * 10.0 / 3600
+            # A start-up ramp that levels off after ten minutes
+            warm_up = ramp * min(hours, 1 / 6)
+            rss = 300 * 1024 ** 2 + rss_per_hour * hours + warm_up + (step % 7) * 64 * 1024
+            objects = 200000 + objects_per_hour * hours + (step % 5) * 300
+            monitor.add(1e9 + step * 10.0, {"rss": rss, "blocks": objects * 3, "objects": objects})
+        return monitor
+    
+    flat = feed(0, 0, ramp=200 * 1024 ** 2)
+    leaking = feed(64 * 1024 ** 2, 0)
+    churning = feed(0, 100000)
+    for name, monitor in (("flat after warm-up", flat), ("RSS leak", leaking), ("object leak", churning)):
+        slopes = monitor.get_stats()["slopes_per_hour"]
+        print(
+            f"   {name:<20} RSS {slopes['rss'] / 1024 ** 2:>8.2f} MiB/h  objects {slopes['objects']:>9.0f}/h  "
+            f"growing {monitor.growing}  warnings {monitor.stats['warnings']}"
+        )
+    
+    # Requests against the real app, with tracemalloc on from manager creation
+    settings.gpu_backend = "simulated"
+    settings.gpu_worker_enabled = False
+    settings.memory_profiling_enabled = True
+    settings.history_enabled = False
+    settings.changes_enabled = False
+    
+    from app.main import create_app
+    
+    app = create_app()
+    leaked = []
+    with TestClient(app) as client:
+        baseline = client.get("/polaris/_internal/memory").json()
+        for _ in range(args.requests):
+            for endpoint in args.endpoints:
+                client.get(endpoint)
+        # A deliberate leak the diff must point at
+        leaked.extend({"index": index} for index in range(args.leak))
+        gc.collect()
+        profile = client.get("/polaris/_internal/memory", params={"since": baseline["snapshot"], "limit": 10}).json()
+        stats = client.get("/polaris/_internal/stats").json()["memory"]
+    
+    print(
+        f"\n📈 {args.requests} rounds of {', '.join(args.endpoints)}: "
+        f"{profile['size_diff'] / 1024:+.1f} KiB in {profile['count_diff']:+d} blocks since snapshot {profile['since']}"
+    )
+    for site in profile["top"]:
+        print(f"   {site['size_diff'] / 1024:>+9.1f} KiB {site['count_diff']:>+7d} blocks  {site['site']}")
+    
+    leak_site = profile["top"][0]["site"] if profile["top"] else ""
+    try:
+        MemoryProfiler(enabled=False).diff()
+        refused = False
+    except MemoryProfilingError:
+        refused = True
+    agent = flatten_sample({"agent": stats["growth"]["latest"] or MemoryGrowthMonitor().read()})
+    checks = {
+        "flat memory after warm-up is not flagged": not flat.growing and flat.stats["warnings"] == 0,
+        "steady RSS growth is flagged once per window": leaking.growing == ["rss"] and leaking.stats["warnings"] == 1,
+        "steady object growth is flagged": churning.growing == ["objects"],
+        "the largest growth is the deliberate leak": leak_site.startswith(__file__),
+        "snapshots are refused while profiling is disabled": refused,
+        "agent metrics are recorded in the history": set(agent) == {f"agent.{metric}" for metric in AGENT_METRICS},
+    }
+    print()
+    for check, passed in checks.items():
+        print(f"   {'✅' if passed else '❌'} {check}")
+    
+    success = all(checks.values())
+    print(f"\n{'✅' if success else '❌'} Agent memory {'is' if success else 'is not'} tracked and profiled correctly")
+    return success
+
+
+def calibrate(rounds: int = 3) -> float:
+    """Fastest of several timings of a fixed pure-Python loop, in ms; a measure of machine speed"""
+    timings = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        values = {}
+        for i in range(20000):
+            values[str(i)] = sum((i, i * 2, i * 3)) / 3
+        sorted(values.items(), key=lambda item: item[1])
+        timings.append(time.perf_counter() - start_time)
+    return min(timings) * 1000
+
+
+def harness_targets(manager: PolarisManager) -> List[Tuple[str, Any]]:
+    """Every public SystemDetector and GPUDetector method, as (name, zero-argument callable)"""
+    import inspect
+    
+    from app.core.gpu_detector import GPUDetector
+    from app.core.system_detector import SystemDetector
+    
+    records = manager.gpu_detector.get_gpu_records()
+    arguments = {"summarize_gpu_info": (records,)}
+    targets = []
+    for prefix, cls, detector in (
+        ("system_detector", SystemDetector, manager.system_detector),
+        ("gpu_detector", GPUDetector, manager.gpu_detector),
+    ):
+        for name, _ in inspect.getmembers(cls, inspect.isfunction):
+            if name.startswith("_"):
+                continue
+            method = getattr(detector, name)
+            targets.append((f"{prefix}.{name}", functools.partial(method, *arguments.get(name, ()))))
+    return targets
+
+
+def harness_routes() -> List[str]:
+    """
+    Every GET route of the app, minus HARNESS_SKIPPED_ROUTES
+    
+    Repeated calls of a route are mostly served from the result cache, so
+    routes taking ``max_age_ms`` are also listed with ``?max_age_ms=0`` to
+    time a full collection.
+    """
+    from app.api import main_routes, polaris_routes, transformer_lab_routes
+    from app.config.settings import settings
+    
+    routers = [main_routes.router, polaris_routes.router]
+    if settings.legacy_compatible:
+        routers.append(transformer_lab_routes.router)
+    paths = []
+    for router in routers:
+        for route in router.routes:
+            if "GET" in route.methods and "{" not in route.path and route.path not in HARNESS_SKIPPED_ROUTES:
+                paths.append(route.path)
+                if any(param.name == "max_age_ms" for param in route.dependant.query_params):
+                    paths.append(f"{route.path}?max_age_ms=0")
+    return paths
+
+
+async def measure_target(call, args) -> Dict[str, Any]:
+    """
+    Time a call in rounds, then measure what it allocates with tracemalloc
+    
+    Timing runs ``args.rounds`` rounds of at least ``args.round_seconds``
+    each (at most ``args.max_calls`` calls overall) with tracemalloc off.
+    ``p50_ms`` is the median of the fastest round, the one least disturbed
+    by other load on the machine; ``iqr_ms`` spans all rounds. Machine
+    speed drifts on shared hosts, so a reference loop is timed around the
+    rounds (``calibration_ms``) and comparisons scale by it.
+    
+    Allocations are measured separately over ``args.alloc_calls`` calls:
+    ``allocations`` is the median number of memory blocks still live after
+    a call (its result plus anything it retained), ``peak_kib`` the median
+    peak of memory in use during a call.
+    """
+    import statistics
+    import tracemalloc
+    
+    async def invoke():
+        result = call()
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+    
+    await invoke()
+    calibration = calibrate()
+    samples: List[float] = []
+    round_medians = []
+    budget = max(args.max_calls // args.rounds, 1)
+    for _ in range(args.rounds):
+        round_samples = []
+        round_start = time.perf_counter()
+        while len(round_samples) < budget and (
+            not round_samples or time.perf_counter() - round_start < args.round_seconds
+        ):
+            start_time = time.perf_counter()
+            await invoke()
+            round_samples.append(time.perf_counter() - start_time)
+        round_medians.append(statistics.median(round_samples))
+        samples.extend(round_samples)
+    calibration = min(calibration, calibrate())
+    
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    blocks, peaks = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(args.alloc_calls):
+            before = tracemalloc.take_snapshot().filter_traces(ignore)
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            result = await invoke()
+            peaks.append((tracemalloc.get_traced_memory()[1] - current) / 1024)
+            after = tracemalloc.take_snapshot().filter_traces(ignore)
+            blocks.append(sum(stat.count_diff for stat in after.compare_to(before, "filename")))
+            del result, before, after
+    finally:
+        tracemalloc.stop()
+    
+    summary = summarize_latencies(samples)
+    quartiles = statistics.quantiles(samples, n=4) if len(samples) > 1 else [samples[0]] * 3
+    return {
+        "count": summary["count"],
+        "mean_ms": summary["mean_ms"],
+        "p50_ms": min(round_medians) * 1000,
+        "p95_ms": summary["p95_ms"],
+        "iqr_ms": (quartiles[2] - quartiles[0]) * 1000,
+        "round_p50_spread_ms": (max(round_medians) - min(round_medians)) * 1000,
+        "calibration_ms": calibration,
+        "allocations": int(statistics.median(blocks)),
+        "peak_kib": round(statistics.median(peaks), 1),
+    }
+
+
+def merge_repeats(measurements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine repeated measurements of a target
+    
+    Call counts add up, everything else is the median. ``repeat_spread_ms``
+    is the range of the repeats' p50s, the noise floor comparisons use.
+    """
+    import statistics
+    
+    merged = {}
+    for key in measurements[0]:
+        values = [measurement[key] for measurement in measurements]
+        merged[key] = sum(values) if key == "count" else statistics.median(values)
+    if len(measurements) > 1:
+        p50s = [measurement["p50_ms"] for measurement in measurements]
+        merged["repeat_spread_ms"] = max(p50s) - min(p50s)
+    return merged
+
+
+async def collectors_main(args) -> bool:
+    """Benchmark every detector method and route on simulated GPUs, with results comparable to a baseline"""
+    import tempfile
+    
+    import httpx
+    
+    from app.config.settings import settings
+    
+    print("🌟 ================================")
+    print("🌟  POLARIS COLLECTOR HARNESS")
+    print("🌟 ================================")
+    
+    with tempfile.TemporaryDirectory(prefix="polaris-harness-") as temp_dir:
+        # Deterministic, self-contained setup: simulated GPUs in-process, a
+        # throwaway history and no shared sampler
+        settings.gpu_backend = "simulated"
+        settings.simulated_gpu_count = args.gpus
+        settings.gpu_worker_enabled = False
+        settings.shared_snapshot_name = None
+        settings.history_enabled = True
+        settings.history_path = os.path.join(temp_dir, "history.db")
+        settings.capability_cache_path = os.path.join(temp_dir, "capability.json")
+        settings.capability_baseline_path = os.path.join(temp_dir, "capability_baselines.json")
+        
+        from app.main import create_app
+        
+        manager = get_polaris_manager()
+        app = create_app()
+        runs: Dict[str, List[Dict[str, Any]]] = {}
+        print(
+            f"🧪 {args.gpus} simulated GPUs, {args.repeat} x {args.rounds} rounds, "
+            f"{args.alloc_calls} allocation calls\n"
+        )
+        
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://polaris", timeout=None) as client:
+            targets = harness_targets(manager) + [
+                (f"GET {path}", lambda url=path + HARNESS_ROUTE_QUERIES.get(path, ""): client.get(url))
+                for path in harness_routes()
+            ]
+            # Whole passes are repeated, so each target is sampled at different times
+            for _ in range(args.repeat):
+                for name, call in targets:
+                    runs.setdefault(name, []).append(await measure_target(call, args))
+        
+        results = {name: merge_repeats(measurements) for name, measurements in runs.items()}
+        for name, result in results.items():
+            print(
+                f"   {name:<44} p50 {result['p50_ms']:>9.3f}ms  IQR {result['iqr_ms']:>8.3f}ms  "
+                f"{result['allocations']:>6} blocks  peak {result['peak_kib']:>8.1f}KiB  ({result['count']} calls)"
+            )
+        
+        manager.close_recorders()
+    
+    for path, reason in HARNESS_SKIPPED_ROUTES.items():
+        print(f"   ⏭️  GET {path} skipped: {reason}")
+    
+    output = {
+        "meta": {
+            "suite": "collectors",
+            "mode": "inprocess",
+            "gpus": args.gpus,
+            "repeat": args.repeat,
+            "rounds": args.rounds,
+            "alloc_calls": args.alloc_calls,
+            "timestamp": time.time(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    if args.output:
+        save_results(output, args.output)
+    if args.save_baseline:
+        save_results(output, args.save_baseline)
+    if args.baseline:
+        return report_comparison(output, args.baseline, args.threshold)
+    return True
+
+
+def compare_main(args) -> bool:
+    """Compare two saved result files"""
+    return report_comparison(load_results(args.results), args.baseline, args.threshold)
+
+
 async def main():
     """Run API benchmarks"""
     print("🌟 ================================")
@@ -83,8 +1796,18 @@ async def main():
     
     total_start = time.perf_counter()
     
+    # max_age_ms=0 bypasses the result cache so every iteration collects
     for name, func in benchmarks:
-        await benchmark_endpoint(name, func)
+        await benchmark_endpoint(name, func, max_age_ms=0)
+    
+    # Concurrent bursts show how many collections are shared
+    for name, func in benchmarks[-2:]:
+        await benchmark_concurrent(polaris, name, func, concurrency=50)
+    
+    # Large payloads are served from cached compressed bodies
+    await benchmark_compression(["/polaris/network", "/polaris/environment"])
+    
+    benchmark_instrumentation(polaris)
     
     total_end = time.perf_counter()
     
@@ -94,5 +1817,174 @@ async def main():
     print("🌟 ================================")
 
 
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Polaris benchmark tool")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    subparsers.add_parser("manager", help="In-process PolarisManager benchmarks (default)")
+    
+    http_parser = subparsers.add_parser("http", help="HTTP latency and throughput benchmarks")
+    http_parser.add_argument("--mode", choices=["inprocess", "loopback"], default="inprocess")
+    http_parser.add_argument("--endpoints", nargs="+", default=DEFAULT_HTTP_ENDPOINTS)
+    http_parser.add_argument("--concurrency", type=int, default=8)
+    http_parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (loopback mode)")
+    http_parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    http_parser.add_argument("--warmup", type=int, default=5, help="Warmup requests per endpoint")
+    http_parser.add_argument("--max-age-ms", type=int, help="Freshness passed to /polaris endpoints (0 = no cache)")
+    http_parser.add_argument("--output", help="Write JSON results to this file")
+    http_parser.add_argument("--save-baseline", help="Also store the results as a baseline file")
+    http_parser.add_argument("--baseline", help="Compare against this baseline file")
+    http_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression")
+    
+    scaling_parser = subparsers.add_parser("gpu-scaling", help="Per-request cost vs simulated GPU count")
+    scaling_parser.add_argument("--gpu-counts", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    scaling_parser.add_argument("--endpoints", nargs="+", default=["/polaris/gpu", "/polaris/realtime"])
+    scaling_parser.add_argument("--latency", type=float, default=0.0001, help="Seconds per simulated vendor call")
+    scaling_parser.add_argument("--seed", type=int, default=0)
+    scaling_parser.add_argument("--concurrency", type=int, default=1)
+    scaling_parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint and GPU count")
+    scaling_parser.add_argument("--warmup", type=int, default=3)
+    scaling_parser.add_argument("--output", help="Write JSON results to this file")
+    scaling_parser.add_argument("--baseline", help="Compare against this baseline file")
+    scaling_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression")
+    
+    faults_parser = subparsers.add_parser("gpu-faults", help="GPU hang injection against the GPU worker watchdog")
+    faults_parser.add_argument("--gpu-count", type=int, default=4)
+    faults_parser.add_argument("--hang-rate", type=float, default=0.02, help="Share of vendor calls that hang")
+    faults_parser.add_argument("--hang-seconds", type=float, default=60.0)
+    faults_parser.add_argument("--call-timeout", type=float, default=0.5, help="GPU worker call deadline in seconds")
+    faults_parser.add_argument("--restart-backoff", type=float, default=0.2)
+    faults_parser.add_argument("--seed", type=int, default=0)
+    faults_parser.add_argument("--requests", type=int, default=100)
+    faults_parser.add_argument("--pause", type=float, default=0.05, help="Seconds between requests")
+    faults_parser.add_argument("--output", help="Write JSON results to this file")
+    
+    sysfs_parser = subparsers.add_parser("amd-sysfs", help="sysfs AMD backend check and per-sample cost")
+    sysfs_parser.add_argument("--devices", type=int, default=8, help="AMD cards in the fake sysfs tree")
+    sysfs_parser.add_argument("--root", help="Use a real drm class directory instead of a fake tree")
+    sysfs_parser.add_argument("--samples", type=int, default=2000)
+    sysfs_parser.add_argument("--output", help="Write JSON results to this file")
+    
+    cgroup_parser = subparsers.add_parser("cgroup", help="cgroup v2 and PSI detector check and per-sample cost")
+    cgroup_parser.add_argument("--samples", type=int, default=2000)
+    
+    tree_parser = subparsers.add_parser("cgroup-tree", help="Incremental cgroup tree walk check and cost")
+    tree_parser.add_argument("--slices", type=int, default=50)
+    tree_parser.add_argument("--per-slice", type=int, default=60, help="Containers per slice")
+    tree_parser.add_argument("--walks", type=int, default=5)
+    
+    capability_parser = subparsers.add_parser("capability", help="Hardware capability suite vs the CPU model baseline")
+    capability_parser.add_argument("--baseline-file", help="Per-CPU-model baseline JSON (default: settings)")
+    capability_parser.add_argument("--record", action="store_true", help="Record this run as the baseline")
+    
+    history_parser = subparsers.add_parser("history", help="Metric history record/flush cost, rollups and size bound")
+    history_parser.add_argument("--samples", type=int, default=7200, help="One-second samples to record")
+    history_parser.add_argument("--gpus", type=int, default=8)
+    history_parser.add_argument("--batch", type=int, default=5, help="Samples per flush")
+    history_parser.add_argument("--max-bytes", type=int, default=1024 ** 2)
+    
+    lttb_parser = subparsers.add_parser("lttb", help="numpy LTTB downsampling check and cost")
+    lttb_parser.add_argument("--samples", type=int, default=604800, help="Points in the full series")
+    lttb_parser.add_argument("--points", type=int, default=800)
+    
+    exporters_parser = subparsers.add_parser("exporters", help="StatsD/OTLP export throughput and batching check")
+    exporters_parser.add_argument("--samples", type=int, default=2000, help="Samples submitted at once")
+    exporters_parser.add_argument("--gpus", type=int, default=8)
+    exporters_parser.add_argument("--queue-size", type=int, default=1000)
+    exporters_parser.add_argument("--mtu", type=int, default=1432)
+    exporters_parser.add_argument("--rounds", type=int, default=200, help="Flushes to time")
+    exporters_parser.add_argument("--batch", type=int, default=5, help="Samples per timed flush")
+    
+    inventory_parser = subparsers.add_parser("inventory", help="Cached mount/interface inventory cost and invalidation")
+    inventory_parser.add_argument("--calls", type=int, default=2000)
+    inventory_parser.add_argument("--trigger", action="store_true",
+                                  help="Mount a tmpfs and add a loopback address to check invalidation (root)")
+    
+    records_parser = subparsers.add_parser("records", help="Memory and allocations of GPU dicts vs slotted records")
+    records_parser.add_argument("--snapshots", type=int, default=2000)
+    records_parser.add_argument("--gpus", type=int, default=8)
+    
+    uds_parser = subparsers.add_parser("uds", help="Round-trip latency over a Unix socket vs loopback TCP")
+    uds_parser.add_argument("--endpoints", nargs="+", default=["/health", "/polaris/realtime"])
+    uds_parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and transport")
+    uds_parser.add_argument("--warmup", type=int, default=20)
+    uds_parser.add_argument("--output", help="Write JSON results to this file")
+    uds_parser.add_argument("--baseline", help="Compare against this baseline file")
+    uds_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression")
+    
+    startup_parser = subparsers.add_parser("startup", help="Time-to-first-request of a cold server")
+    startup_parser.add_argument("--runs", type=int, default=5)
+    startup_parser.add_argument("--output", help="Write JSON results to this file")
+    startup_parser.add_argument("--baseline", help="Compare against this baseline file")
+    startup_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression")
+    
+    memory_parser = subparsers.add_parser("memory", help="Agent memory growth checks and a tracemalloc diff across requests")
+    memory_parser.add_argument("--requests", type=int, default=200, help="Rounds of requests between snapshots")
+    memory_parser.add_argument("--endpoints", nargs="+", default=["/polaris/realtime", "/polaris/detect"])
+    memory_parser.add_argument("--leak", type=int, default=20000, help="Dicts deliberately leaked before the diff")
+    
+    collectors_parser = subparsers.add_parser(
+        "collectors", help="Every detector method and route: p50 and allocations vs a baseline"
+    )
+    collectors_parser.add_argument("--gpus", type=int, default=8, help="Simulated GPUs")
+    collectors_parser.add_argument("--repeat", type=int, default=3, help="Passes over all targets (median kept)")
+    collectors_parser.add_argument("--rounds", type=int, default=5)
+    collectors_parser.add_argument("--round-seconds", type=float, default=0.2, help="Shortest timed round")
+    collectors_parser.add_argument("--max-calls", type=int, default=2000, help="Most timed calls per target")
+    collectors_parser.add_argument("--alloc-calls", type=int, default=5, help="Calls measured with tracemalloc")
+    collectors_parser.add_argument("--output", help="Write JSON results to this file")
+    collectors_parser.add_argument("--save-baseline", help="Also write the results as a baseline")
+    collectors_parser.add_argument("--baseline", help="Compare against this baseline file")
+    collectors_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression")
+    
+    compare_parser = subparsers.add_parser("compare", help="Compare saved results with a baseline")
+    compare_parser.add_argument("results", help="Results JSON file")
+    compare_parser.add_argument("baseline", help="Baseline JSON file")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression")
+    
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    args = parse_args()
+    
+    if args.command == "http":
+        success = asyncio.run(http_main(args))
+    elif args.command == "gpu-scaling":
+        success = asyncio.run(gpu_scaling_main(args))
+    elif args.command == "gpu-faults":
+        success = asyncio.run(gpu_faults_main(args))
+    elif args.command == "amd-sysfs":
+        success = amd_sysfs_main(args)
+    elif args.command == "cgroup":
+        success = cgroup_main(args)
+    elif args.command == "cgroup-tree":
+        success = cgroup_tree_main(args)
+    elif args.command == "capability":
+        success = capability_main(args)
+    elif args.command == "history":
+        success = history_main(args)
+    elif args.command == "lttb":
+        success = lttb_main(args)
+    elif args.command == "exporters":
+        success = exporters_main(args)
+    elif args.command == "inventory":
+        success = inventory_main(args)
+    elif args.command == "records":
+        success = records_main(args)
+    elif args.command == "uds":
+        success = asyncio.run(uds_main(args))
+    elif args.command == "startup":
+        success = asyncio.run(startup_main(args))
+    elif args.command == "memory":
+        success = memory_main(args)
+    elif args.command == "collectors":
+        success = asyncio.run(collectors_main(args))
+    elif args.command == "compare":
+        success = compare_main(args)
+    else:
+        success = asyncio.run(main()) is not False
+    
+    if not success:
+        sys.exit(1) 
\ No newline at end of file
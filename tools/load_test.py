@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+🌟 Polaris System Detection API - Load Test Tool
+Checks that /health latency stays flat while a slow endpoint is hammered
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+# Add the app directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.stats_utils import summarize_latencies
+
+
+def create_client(url: Optional[str] = None) -> httpx.AsyncClient:
+    """Create a client for a running server, or for the app in-process"""
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=None)
+
+    from app.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://polaris", timeout=None)
+
+
+async def probe_health(client: httpx.AsyncClient, duration: float, interval: float) -> List[float]:
+    """Request /health repeatedly for a duration and record latencies"""
+    latencies = []
+    end_time = time.perf_counter() + duration
+
+    while time.perf_counter() < end_time:
+        start_time = time.perf_counter()
+        response = await client.get("/health")
+        latencies.append(time.perf_counter() - start_time)
+        response.raise_for_status()
+        await asyncio.sleep(interval)
+
+    return latencies
+
+
+async def hammer(client: httpx.AsyncClient, endpoint: str, counter: List[int]):
+    """Request an endpoint back to back until cancelled"""
+    while True:
+        response = await client.get(endpoint)
+        counter[0] += 1
+        if response.status_code >= 500:
+            counter[1] += 1
+
+
+async def run_phase(client, duration, interval, health_concurrency, endpoint=None, hammer_concurrency=0):
+    """Run one phase of health probes, optionally under load"""
+    counter = [0, 0]
+    hammers = [
+        asyncio.create_task(hammer(client, endpoint, counter))
+        for _ in range(hammer_concurrency)
+    ]
+
+    try:
+        results = await asyncio.gather(*[
+            probe_health(client, duration, interval)
+            for _ in range(health_concurrency)
+        ])
+    finally:
+        for task in hammers:
+            task.cancel()
+        await asyncio.gather(*hammers, return_exceptions=True)
+
+    latencies = [latency for result in results for latency in result]
+    return summarize_latencies(latencies), counter
+
+
+def print_summary(title: str, summary: dict):
+    """Print a latency summary"""
+    print(f"\n📊 {title}")
+    print(f"   Requests: {summary['count']}")
+    print(f"   p50: {summary['p50_ms']:.2f}ms  p95: {summary['p95_ms']:.2f}ms  p99: {summary['p99_ms']:.2f}ms")
+    print(f"   Max: {summary['max_ms']:.2f}ms")
+
+
+async def main(args) -> bool:
+    """Run the load test"""
+    print("🌟 ================================")
+    print("🌟  POLARIS LOAD TEST TOOL")
+    print("🌟 ================================")
+    print(f"🎯 Target: {args.url or 'in-process ASGI app'}")
+    print(f"🔨 Hammering {args.endpoint} with {args.hammer_concurrency} concurrent clients")
+
+    async with create_client(args.url) as client:
+        # Warm up the app (manager initialization, first collection)
+        await client.get("/health")
+
+        idle, _ = await run_phase(client, args.duration, args.interval, args.health_concurrency)
+        print_summary("/health (idle)", idle)
+
+        loaded, counter = await run_phase(
+            client, args.duration, args.interval, args.health_concurrency,
+            endpoint=args.endpoint, hammer_concurrency=args.hammer_concurrency,
+        )
+        print_summary(f"/health (while hammering {args.endpoint})", loaded)
+        print(f"   {args.endpoint}: {counter[0]} completed, {counter[1]} server errors")
+
+    # Sub-millisecond p99s are mostly noise, so compare against a floor
+    ratio = loaded["p99_ms"] / max(idle["p99_ms"], args.p99_floor_ms)
+    passed = ratio <= args.max_p99_ratio
+
+    print("\n🌟 ================================")
+    print(f"🌟  /health p99 ratio (loaded / idle): {ratio:.2f}x (limit {args.max_p99_ratio:.2f}x)")
+    print(f"🌟  {'✅ /health stayed flat' if passed else '❌ /health degraded under load'}")
+    print("🌟 ================================")
+    return passed
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Polaris /health latency under load")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--endpoint", default="/polaris/environment", help="Endpoint to hammer")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase")
+    parser.add_argument("--interval", type=float, default=0.01, help="Pause between health probes")
+    parser.add_argument("--health-concurrency", type=int, default=2, help="Concurrent health probes")
+    parser.add_argument("--hammer-concurrency", type=int, default=16, help="Concurrent hammering clients")
+    parser.add_argument("--max-p99-ratio", type=float, default=3.0, help="Allowed p99 growth under load")
+    parser.add_argument("--p99-floor-ms", type=float, default=5.0, help="Minimum idle p99 used for the ratio")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    if not asyncio.run(main(parse_args())):
+        sys.exit(1)